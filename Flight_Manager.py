@@ -1,79 +1,659 @@
+import contextlib
+import functools
+import os
+import threading
+
+import numpy as np
 import pandas as pd
 
+from schema import TABLES, BOOKING_STATUSES, append_rows, concat_chunks
+from storage import CSVStorage
+from utils.instrumentation import timed
+from utils.lru_cache import LRUCache
+
+# Table name -> attribute holding its ID hash map index
+ID_INDEXES = {
+    'flights': 'flight_index',
+    'passengers': 'passenger_index',
+    'bookings': 'booking_index',
+    'aircraft': 'aircraft_index',
+}
+
+# Table name -> singular name used in mutation events (e.g. 'flight_added')
+ROW_NAMES = {
+    'flights': 'flight',
+    'passengers': 'passenger',
+    'bookings': 'booking',
+    'aircraft': 'aircraft',
+}
+
+
+def _lazy_property(name, loader):
+    """Property that calls loader(self) on first access and caches the result; assignable like a plain attribute"""
+    attr = '_' + name
+
+    def getter(self):
+        value = self.__dict__.get(attr)
+        if value is None:
+            value = loader(self)
+            self.__dict__[attr] = value
+        return value
+
+    def setter(self, value):
+        self.__dict__[attr] = value
+
+    return property(getter, setter)
+
+
+def _synchronized(method):
+    """Run a mutation method under the AirportData lock so background tasks can share the data"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class AirportData:
     """
     The AirportData class manages airport data efficiently.
-    It loads Flights, Passengers, Bookings, and Aircraft from CSVs into pandas DataFrames
-    and also builds hash map indexes for lookups by ID.
+    It loads Flights, Passengers, Bookings, and Aircraft from CSVs (or an optional SQLite
+    storage backend) into pandas DataFrames and also builds hash map indexes for lookups by ID.
+    Each table and index is loaded on first access, so constructing it does no I/O.
     """
 
-    def __init__(self, flights_path: str, passengers_path: str, bookings_path: str, aircraft_path: str):
+    # Tables, read from CSV on first access
+    flights = _lazy_property('flights', lambda self: self._load_table('flights'))
+    passengers = _lazy_property('passengers', lambda self: self._load_table('passengers'))
+    bookings = _lazy_property('bookings', lambda self: self._load_table('bookings'))
+    aircraft = _lazy_property('aircraft', lambda self: self._load_table('aircraft'))
+
+    # Hash map indexes for fast O(1) lookups, built on first access
+    flight_index = _lazy_property('flight_index', lambda self: self._build_id_index(self.flights, "FlightID"))
+    passenger_index = _lazy_property('passenger_index', lambda self: self._build_id_index(self.passengers, "PassengerID"))
+    booking_index = _lazy_property('booking_index', lambda self: self._build_id_index(self.bookings, "BookingID"))
+    aircraft_index = _lazy_property('aircraft_index', lambda self: self._build_id_index(self.aircraft, "AircraftID"))
+
+    # Flight-to-bookings index for O(b) booking queries per flight
+    # This maps flight_id -> list of DataFrame row indices
+    flight_bookings_index = _lazy_property('flight_bookings_index', lambda self: self._build_flight_bookings_index())
+
+    # Live per-flight booking counters (flight_id -> {status: count})
+    # Kept up to date by the booking mutation methods below
+    flight_counters = _lazy_property('flight_counters', lambda self: self._build_flight_counters())
+
+    # Archived (cold) flights and bookings, loaded by month on demand
+    archive = _lazy_property('archive', lambda self: self._open_archive())
+
+    # Per-flight waitlists for fully booked flights
+    waitlist = _lazy_property('waitlist', lambda self: self._open_waitlist())
+
+    # Short-lived seat holds taken during interactive booking (in memory only)
+    seat_holds = _lazy_property('seat_holds', lambda self: self._open_seat_holds())
+
+    # Current fares, repriced from load factor and days to departure
+    pricing = _lazy_property('pricing', lambda self: self._open_pricing())
+
+    # Cheapest fare and seats remaining per route per day, updated from mutation events
+    fare_calendar = _lazy_property('fare_calendar', lambda self: self._open_fare_calendar())
+
+    # Sequenced record of every mutation for subscribers and downstream consumers
+    change_feed = _lazy_property('change_feed', lambda self: self._open_change_feed())
+
+    # Check-in and boarding desk with an O(1) (flight, passenger) -> booking lookup
+    check_in = _lazy_property('check_in', lambda self: self._open_check_in())
+
+    # Polls the CSV files for changes made by other programs (see file_watcher.py)
+    file_watcher = _lazy_property('file_watcher', lambda self: self._open_file_watcher())
+
+    # LRU cache of FlightSearch results, invalidated by data_version
+    search_cache = _lazy_property('search_cache', lambda self: LRUCache(self.SEARCH_CACHE_SIZE))
+    SEARCH_CACHE_SIZE = 512
+
+    # Rows per chunk when streaming a table in from storage
+    CHUNK_ROWS = 250_000
+
+    def __init__(self, flights_path: str = None, passengers_path: str = None, bookings_path: str = None,
+                 aircraft_path: str = None, storage=None, progress=None, data_dir: str = None,
+                 hold_ttl: float = None):
         self.flights_path = flights_path
         self.passengers_path = passengers_path
         self.bookings_path = bookings_path
         self.aircraft_path = aircraft_path
 
-        # Load CSV files into DataFrames with type hints for efficiency
-        self.flights = pd.read_csv(flights_path, dtype={"FlightID": int, "FlightCapacity": int})
-        self.passengers = pd.read_csv(passengers_path, dtype={"PassengerID": int})
-        self.bookings = pd.read_csv(bookings_path, dtype={"BookingID": int, "FlightID": int, "PassengerID": int})
-        self.aircraft = pd.read_csv(aircraft_path, dtype={"AircraftID": str, "Rows": int, "SeatsInARow": int})
-
-        # Build hash map indexes for fast O(1) lookups
-        self.flight_index = {row["FlightID"]: row for row in self.flights.to_dict("records")}
-        self.passenger_index = {row["PassengerID"]: row for row in self.passengers.to_dict("records")}
-        self.booking_index = {row["BookingID"]: row for row in self.bookings.to_dict("records")}
-        self.aircraft_index = {row["AircraftID"]: row for row in self.aircraft.to_dict("records")}
-        
-        # Build flight-to-bookings index for O(b) booking queries per flight
-        # This maps flight_id -> list of DataFrame row indices
-        self.flight_bookings_index = self._build_flight_bookings_index()
+        # Directory for side files (archives etc.), next to the bookings data by default
+        if data_dir is None:
+            data_dir = os.path.dirname(bookings_path) if bookings_path else "./data"
+        self.data_dir = data_dir or "."
+
+        # Seconds a seat hold lasts (None for the SeatHolds default)
+        self.hold_ttl = hold_ttl
+
+        # Optional callback(table, rows_loaded, fraction_done) called after each chunk is read
+        self.progress = progress
+
+        # Guards mutations made from background tasks (e.g. the flight status scheduler)
+        self.lock = threading.RLock()
+        # Callbacks notified of every mutation as callback(event, payload)
+        self._listeners = []
+        # Bumped on every mutation; cached query results are only valid for the version they were built at
+        self.data_version = 0
+        # Events held back while a transaction is applied (None when they are sent straight away)
+        self._held_events = None
+
+        # CSV files are the default storage; pass storage=SQLiteStorage(...) to use SQLite instead
+        self.storage = storage or CSVStorage({
+            'flights': flights_path,
+            'passengers': passengers_path,
+            'bookings': bookings_path,
+            'aircraft': aircraft_path,
+        })
+
+    @timed("AirportData.load_table")
+    def _load_table(self, name):
+        """
+        Stream a table in from storage chunk by chunk. Each chunk arrives already in the
+        compact schema and its indexes are built straight away, so the raw file is never
+        held in memory all at once.
+        """
+        id_col = TABLES[name][0]
+        id_index = {}
+        flight_bookings = {}
+        counters = {}
+        chunks = []
+        rows_loaded = 0
+
+        for chunk, fraction in self.storage.iter_chunks(name, self.CHUNK_ROWS):
+            id_index.update(self._build_id_index(chunk, id_col))
+            if name == 'bookings':
+                for flight_id, rows in chunk.groupby('FlightID', observed=True).indices.items():
+                    flight_bookings.setdefault(int(flight_id), []).extend((rows + rows_loaded).tolist())
+                self._count_bookings(chunk, counters)
+            chunks.append(chunk)
+            rows_loaded += len(chunk)
+            if self.progress is not None:
+                self.progress(name, rows_loaded, fraction)
+
+        # Keep the indexes built while streaming unless they already exist
+        self.__dict__.setdefault('_' + ID_INDEXES[name], id_index)
+        if name == 'bookings':
+            self.__dict__.setdefault('_flight_bookings_index', flight_bookings)
+            self.__dict__.setdefault('_flight_counters', counters)
+        return concat_chunks(chunks)
+
+    def _lookup(self, name, row_id):
+        """ID lookup that uses the in-memory index, or the storage's own index if the table is not loaded yet"""
+        index_name = ID_INDEXES[name]
+        if not self.is_loaded(index_name) and not self.is_loaded(name) and self.storage.indexed_lookups:
+            return self.storage.fetch_row(name, row_id)
+        return getattr(self, index_name).get(row_id)
+
+    def add_listener(self, callback, first=False):
+        """Register callback(event, payload) to be told about every data mutation"""
+        if first:
+            self._listeners.insert(0, callback)
+        else:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, payload):
+        if self._held_events is not None:
+            self._held_events.append((event, payload))
+            return
+        # Every mutation goes through here, so this is also the data version caches check against
+        self.data_version += 1
+        for callback in list(self._listeners):
+            callback(event, payload)
+
+    @contextlib.contextmanager
+    def holding_events(self):
+        """
+        Hold back mutation events until the block finishes: they are sent in order if it
+        succeeds and dropped if it raises, so listeners never see changes that were undone.
+        """
+        with self.lock:
+            if self._held_events is not None:
+                # Already inside an outer block, which decides
+                yield
+                return
+            self._held_events = []
+            try:
+                yield
+            except BaseException:
+                self._held_events = None
+                raise
+            events, self._held_events = self._held_events, None
+            for event, payload in events:
+                self._notify(event, payload)
+
+    def _open_archive(self):
+        from archive import FlightArchive
+        return FlightArchive(self, os.path.join(self.data_dir, "archive"))
+
+    def _open_waitlist(self):
+        from waitlist import Waitlist
+        return Waitlist(self, os.path.join(self.data_dir, "Waitlist.csv"))
+
+    def _open_seat_holds(self):
+        from seat_holds import SeatHolds
+        return SeatHolds(self, self.hold_ttl)
+
+    def _open_pricing(self):
+        from pricing import PricingEngine
+        engine = PricingEngine(self, os.path.join(self.data_dir, "PriceHistory.csv"))
+        engine.reprice()
+        return engine
+
+    def _open_fare_calendar(self):
+        from fare_calendar import FareCalendar
+        return FareCalendar(self)
+
+    def _open_check_in(self):
+        from checkin import CheckInDesk
+        return CheckInDesk(self)
 
+    def _open_change_feed(self):
+        from changefeed import ChangeFeed
+        return ChangeFeed(self, os.path.join(self.data_dir, "Changes.jsonl"))
+
+    def _open_file_watcher(self):
+        from file_watcher import DataFileWatcher
+        return DataFileWatcher(self)
+
+    def is_loaded(self, name):
+        """Check whether a table (or index) has been loaded yet, without loading it"""
+        return self.__dict__.get('_' + name) is not None
+
+    def load_all(self):
+        """Eagerly load every table and build every index"""
+        for name in TABLES:
+            getattr(self, name)
+            getattr(self, ID_INDEXES[name])
+        self.flight_bookings_index
+        self.flight_counters
+
+    @timed("AirportData.build_id_index")
+    def _build_id_index(self, df, id_col):
+        """Build a hash map from an ID column to its row as a dict"""
+        return {row[id_col]: row for row in df.to_dict("records")}
+
+    @timed("AirportData.build_flight_bookings_index")
     def _build_flight_bookings_index(self):
         """Build an index mapping flight_id to booking row indices for queries"""
-        flight_bookings = {}
-        for idx, booking in self.bookings.iterrows():
-            flight_id = int(booking['FlightID'])
-            if flight_id not in flight_bookings:
-                flight_bookings[flight_id] = []
-            flight_bookings[flight_id].append(idx)
-        return flight_bookings
+        groups = self.bookings.groupby('FlightID', observed=True).indices
+        return {int(flight_id): list(rows) for flight_id, rows in groups.items()}
+
+    @timed("AirportData.build_flight_counters")
+    def _build_flight_counters(self):
+        """Count bookings per flight and status in a single grouped pass"""
+        return self._count_bookings(self.bookings, {})
+
+    def _count_bookings(self, bookings, counters, sign=1):
+        """Add (or with sign=-1, subtract) a frame of bookings to a set of per-flight counters"""
+        counts = bookings.groupby(['FlightID', 'Status'], observed=True).size()
+        for (flight_id, status), count in counts.items():
+            flight_counts = counters.setdefault(int(flight_id), dict.fromkeys(BOOKING_STATUSES, 0))
+            flight_counts[status] = flight_counts.get(status, 0) + sign * int(count)
+        return counters
+
+    def _adjust_counter(self, flight_id, status, delta):
+        """Apply a +/- change to a single flight/status counter"""
+        flight_counts = self.flight_counters.setdefault(int(flight_id), dict.fromkeys(BOOKING_STATUSES, 0))
+        flight_counts[status] = flight_counts.get(status, 0) + delta
+
+    # Generic row methods (flights, passengers and aircraft)
+    def add_row(self, name, row: dict):
+        """Append a row to a table, index it and pass it to the storage backend"""
+        self.add_rows(name, [row])
+
+    @_synchronized
+    def add_rows(self, name, rows: list):
+        """Append many rows to a table with one concat and one storage write"""
+        if not rows:
+            return
+        id_col = TABLES[name][0]
+        new_rows = pd.DataFrame(rows)
+        setattr(self, name, append_rows(name, getattr(self, name), new_rows))
+        # Index the typed rows so lookups see the same values as the table
+        rows = new_rows.to_dict("records")
+        index = getattr(self, ID_INDEXES[name])
+        for row in rows:
+            index[row[id_col]] = row
+        self.storage.insert_rows(name, rows)
+        for row in rows:
+            self._notify(f"{ROW_NAMES[name]}_added", row)
+
+    @_synchronized
+    def delete_row(self, name, row_id):
+        """Remove a row from a table and its index"""
+        id_col = TABLES[name][0]
+        table = getattr(self, name)
+        setattr(self, name, table[table[id_col] != row_id].reset_index(drop=True))
+        row = getattr(self, ID_INDEXES[name]).pop(row_id, None)
+        self.storage.delete_rows(name, [row_id])
+        self._notify(f"{ROW_NAMES[name]}_deleted", row or {id_col: row_id})
+
+    @_synchronized
+    def remove_rows(self, name, mask):
+        """Delete the rows selected by a boolean mask from a table and its index"""
+        id_col = TABLES[name][0]
+        table = getattr(self, name)
+        row_ids = table.loc[mask, id_col].tolist()
+        if not row_ids:
+            return 0
+        setattr(self, name, table[~mask].reset_index(drop=True))
+        index = getattr(self, ID_INDEXES[name])
+        removed_rows = [index.pop(row_id, None) for row_id in row_ids]
+        self.storage.delete_rows(name, row_ids)
+        for row_id, row in zip(row_ids, removed_rows):
+            self._notify(f"{ROW_NAMES[name]}_deleted", row or {id_col: row_id})
+        return len(row_ids)
+
+    @_synchronized
+    def update_column(self, name, column, values: dict):
+        """Set one column for many rows ({row ID: new value}) with one vectorized update"""
+        if not values:
+            return
+        id_col = TABLES[name][0]
+        table = getattr(self, name)
+        new_values = pd.Series(values)
+        if isinstance(table[column].dtype, pd.CategoricalDtype):
+            new_cats = pd.Index(new_values.unique()).difference(table[column].cat.categories)
+            if len(new_cats):
+                table[column] = table[column].cat.add_categories(new_cats)
+        mask = table[id_col].isin(new_values.index)
+        # Bookings moved between flights or statuses are moved between counters in bulk
+        recount = name == 'bookings' and column in ('FlightID', 'Status')
+        if recount:
+            self._count_bookings(table[mask], self.flight_counters, sign=-1)
+        mapped = table.loc[mask, id_col].map(new_values)
+        if not isinstance(table[column].dtype, pd.CategoricalDtype):
+            # Keep the compact dtype (e.g. int32 IDs) rather than the mapped values' own
+            mapped = mapped.astype(table[column].dtype)
+        table.loc[mask, column] = mapped.to_numpy()
+        if recount:
+            self._count_bookings(table[mask], self.flight_counters)
+            if column == 'FlightID':
+                self.flight_bookings_index = self._build_flight_bookings_index()
+        if name == 'flights' and column == 'DateTime':
+            table.loc[mask, 'Date'] = table.loc[mask, 'DateTime'].dt.normalize()
+
+        index = getattr(self, ID_INDEXES[name])
+        changes = []
+        for row_id, value in values.items():
+            row = index.get(row_id)
+            if row is not None:
+                changes.append({**row, column: value, 'Column': column, 'OldValue': row.get(column)})
+                row[column] = value
+                if name == 'flights' and column == 'DateTime':
+                    row['Date'] = pd.Timestamp(value).normalize()
+        self.storage.update_values(name, column, values)
+        for change in changes:
+            self._notify(f"{ROW_NAMES[name]}_updated", change)
+
+    def next_id(self, name):
+        """
+        Next free numeric ID for a table. Flights and bookings also count the IDs already
+        archived, which are no longer in the hot tables but must not be reused.
+        """
+        id_col = TABLES[name][0]
+        table = getattr(self, name)
+        highest = int(table[id_col].max()) if not table.empty else 0
+        if name in ('flights', 'bookings'):
+            highest = max(highest, self.archive.max_id(name))
+        return highest + 1
+
+    def transaction(self):
+        """Start a batch of changes that is applied and saved in one commit, or rolled back"""
+        from transactions import Transaction
+        return Transaction(self)
 
     # Flight methods
     def get_flight_by_id(self, flight_id: int):
-        return self.flight_index.get(flight_id)
+        return self._lookup('flights', flight_id)
+
+    def get_flight_capacity(self, flight_id: int):
+        """Get the number of seats on a flight, based on its aircraft configuration"""
+        flight = self.get_flight_by_id(flight_id)
+        if flight is None:
+            return None
+        aircraft = self.get_aircraft_by_id(flight['AeroplaneNumber'])
+        if aircraft is None:
+            return int(flight['FlightCapacity'])
+        return int(aircraft['Rows']) * int(aircraft['SeatsInARow'])
+
+    def get_flight_capacities(self, flights):
+        """Seats per flight for a flights DataFrame (vectorized get_flight_capacity)"""
+        aircraft = self.aircraft
+        seats = pd.Series((aircraft['Rows'].astype('int32') * aircraft['SeatsInARow']).to_numpy(),
+                          index=aircraft['AircraftID'].to_numpy())
+        capacity = flights['AeroplaneNumber'].astype(object).map(seats)
+        return capacity.fillna(flights['FlightCapacity']).to_numpy(dtype='int64')
+
+    def get_active_booking_counts(self, flight_ids):
+        """Non-cancelled bookings per flight for an array of flight IDs, from one bincount"""
+        flight_ids = np.asarray(flight_ids, dtype='int64')
+        bookings = self.bookings
+        active = bookings.loc[bookings['Status'] != 'Cancelled', 'FlightID'].to_numpy()
+        size = int(max(flight_ids.max(initial=0), active.max(initial=0))) + 1
+        return np.bincount(active, minlength=size)[flight_ids]
+
+    def get_flight_counters(self, flight_id: int):
+        """Get live booking counts for a flight, including remaining seats"""
+        flight_counts = dict(self.flight_counters.get(flight_id, dict.fromkeys(BOOKING_STATUSES, 0)))
+        flight_counts['Remaining'] = self.get_remaining_seats(flight_id)
+        return flight_counts
+
+    def get_remaining_seats(self, flight_id: int):
+        """Get the number of unbooked seats on a flight in O(1)"""
+        capacity = self.get_flight_capacity(flight_id)
+        if capacity is None:
+            return None
+        flight_counts = self.flight_counters.get(flight_id)
+        if flight_counts is None:
+            return capacity
+        active = flight_counts.get('Booked', 0) + flight_counts.get('Checked-in', 0) + flight_counts.get('Boarded', 0)
+        return max(capacity - active, 0)
+
+    def is_flight_full(self, flight_id: int):
+        remaining = self.get_remaining_seats(flight_id)
+        return remaining is not None and remaining == 0
+
+    def is_flight_locked(self, flight_id: int):
+        """Bookings on a completed flight are locked and can no longer change"""
+        flight = self.get_flight_by_id(flight_id)
+        return flight is not None and flight['Status'] == 'Completed'
+
+    def locked_flights(self, flight_ids):
+        """The completed flights among some flight IDs, in ascending order"""
+        return sorted(flight_id for flight_id in set(flight_ids) if self.is_flight_locked(flight_id))
+
+    def set_flight_status(self, flight_id: int, status: str):
+        """Change the status of a flight in the DataFrame, index and storage"""
+        self.set_flights_status([flight_id], status)
+
+    @_synchronized
+    def set_flights_status(self, flight_ids, status: str):
+        """Change the status of many flights with one vectorized update"""
+        flight_ids = [int(flight_id) for flight_id in flight_ids]
+        if not flight_ids:
+            return
+        self.flights.loc[self.flights['FlightID'].isin(flight_ids), 'Status'] = status
+        changes = []
+        for flight_id in flight_ids:
+            flight = self.flight_index[flight_id]
+            changes.append({'FlightID': flight_id, 'Status': status, 'OldStatus': flight['Status']})
+            flight['Status'] = status
+        self.storage.update_rows('flights', flight_ids, {'Status': status})
+        for change in changes:
+            self._notify('flight_status', change)
+
+    def delete_flight(self, flight_id: int):
+        """Remove a flight row along with its index and counter entries"""
+        self.remove_flights(self.flights['FlightID'] == flight_id)
+
+    @_synchronized
+    def drop_waitlists(self, flight_ids=(), passenger_ids=()):
+        """
+        Take flights and passengers about to be deleted off the waitlists, so deleting
+        their bookings promotes no one onto a flight that is going away
+        """
+        if not self.is_loaded('waitlist'):
+            return
+        for flight_id in flight_ids:
+            self.waitlist.drop_flight(flight_id)
+        for passenger_id in passenger_ids:
+            self.waitlist.drop_passenger(passenger_id)
+
+    @_synchronized
+    def remove_flights(self, mask, event='flight_deleted'):
+        """Delete the flights selected by a boolean mask, with their index and counter entries"""
+        flight_ids = self.flights.loc[mask, 'FlightID'].tolist()
+        if not flight_ids:
+            return 0
+
+        self.flights = self.flights[~mask].reset_index(drop=True)
+        removed_rows = [self.flight_index.pop(flight_id, None) for flight_id in flight_ids]
+        for flight_id in flight_ids:
+            self.flight_counters.pop(flight_id, None)
+        self.storage.delete_rows('flights', flight_ids)
+        for flight in removed_rows:
+            if flight is not None:
+                self._notify(event, flight)
+        return len(flight_ids)
 
     # Passenger methods
     def get_passenger_by_id(self, passenger_id: int):
-        return self.passenger_index.get(passenger_id)
+        return self._lookup('passengers', passenger_id)
 
     # Booking methods
     def get_booking_by_id(self, booking_id: int):
-        return self.booking_index.get(booking_id)
+        return self._lookup('bookings', booking_id)
 
     def get_bookings_for_flight(self, flight_id: int):
         """Get all bookings for a specific flight."""
+        if not self.is_loaded('bookings') and self.storage.indexed_lookups:
+            return self.storage.fetch_bookings_for_flight(flight_id)
         booking_indices = self.flight_bookings_index.get(flight_id, [])
         if not booking_indices:
             # Return empty DataFrame with correct structure
             return pd.DataFrame(columns=self.bookings.columns)
         return self.bookings.iloc[booking_indices]
 
+    def add_booking(self, booking: dict):
+        """Append a booking and update the indexes and counters incrementally"""
+        self.add_bookings([booking])
+
+    @timed("AirportData.add_bookings")
+    @_synchronized
+    def add_bookings(self, bookings: list):
+        """Append many bookings with one concat and one storage write"""
+        if not bookings:
+            return
+        position = len(self.bookings)
+        self.bookings = append_rows('bookings', self.bookings, pd.DataFrame(bookings))
+
+        for offset, booking in enumerate(bookings):
+            flight_id = int(booking['FlightID'])
+            self.booking_index[booking['BookingID']] = booking
+            self.flight_bookings_index.setdefault(flight_id, []).append(position + offset)
+            self._adjust_counter(flight_id, booking['Status'], 1)
+        self.storage.insert_rows('bookings', bookings)
+        for booking in bookings:
+            self._notify('booking_added', booking)
+
+    def set_booking_status(self, booking_id: int, status: str):
+        """Change the status of a booking and move it between counters"""
+        self.set_bookings_status([booking_id], status)
+
+    @_synchronized
+    def set_bookings_status(self, booking_ids, status: str):
+        """Change the status of many bookings with one vectorized update"""
+        booking_ids = [int(booking_id) for booking_id in booking_ids]
+        if not booking_ids:
+            return
+        mask = self.bookings['BookingID'].isin(booking_ids)
+        # Move the affected bookings between counters in bulk
+        self._count_bookings(self.bookings[mask], self.flight_counters, sign=-1)
+        self.bookings.loc[mask, 'Status'] = status
+        self._count_bookings(self.bookings[mask], self.flight_counters)
+
+        changes = []
+        for booking_id in booking_ids:
+            booking = self.booking_index[booking_id]
+            changes.append({**booking, 'Status': status, 'OldStatus': booking['Status']})
+            booking['Status'] = status
+        self.storage.update_rows('bookings', booking_ids, {'Status': status})
+        for change in changes:
+            self._notify('booking_status', change)
+
+    @_synchronized
+    def cancel_flight(self, flight_id: int):
+        """
+        Cancel a flight and cascade the cancellation to all of its active bookings.
+        Returns the bookings that were cancelled (as they were before the change).
+        """
+        self.set_flights_status([flight_id], 'Cancelled')
+        flight_bookings = self.get_bookings_for_flight(flight_id)
+        affected = flight_bookings[flight_bookings['Status'] != 'Cancelled'].copy()
+        self.set_bookings_status(affected['BookingID'].tolist(), 'Cancelled')
+        return affected
+
+    @timed("AirportData.remove_bookings")
+    @_synchronized
+    def remove_bookings(self, mask, event='booking_deleted'):
+        """Delete the bookings selected by a boolean mask, keeping indexes and counters in step"""
+        removed = self.bookings[mask]
+        if removed.empty:
+            return 0
+
+        self._count_bookings(removed, self.flight_counters, sign=-1)
+        removed_rows = [self.booking_index.pop(booking_id, None) for booking_id in removed['BookingID']]
+        self.storage.delete_rows('bookings', removed['BookingID'].tolist())
+
+        self.bookings = self.bookings[~mask].reset_index(drop=True)
+        # Row positions shift after a delete, so the positional index is regrouped
+        self.flight_bookings_index = self._build_flight_bookings_index()
+        for booking in removed_rows:
+            if booking is not None:
+                self._notify(event, booking)
+        return len(removed)
+
     # Aircraft methods
     def get_aircraft_by_id(self, aircraft_id: str):
-        return self.aircraft_index.get(aircraft_id)
+        return self._lookup('aircraft', aircraft_id)
 
-    # Save all DataFrames back to CSV
+    # Save all loaded DataFrames back to storage (tables never loaded are unchanged on disk)
+    @timed("AirportData.save_data")
+    @_synchronized
     def save_data(self):
-        self.flights.to_csv(self.flights_path, index=False)
-        self.passengers.to_csv(self.passengers_path, index=False)
-        self.bookings.to_csv(self.bookings_path, index=False)
-        self.aircraft.to_csv(self.aircraft_path, index=False)
-        
+        for name in TABLES:
+            if self.is_loaded(name):
+                self.storage.save_table(name, getattr(self, name))
+        if self.is_loaded('waitlist'):
+            self.waitlist.save()
+        if self.is_loaded('pricing'):
+            self.pricing.save()
+        # Only now are the changes made since the last save stored, so they go into the feed
+        if self.is_loaded('change_feed'):
+            self.change_feed.persist()
+        # The files were rewritten here, so the watcher must not pick them up as outside changes
+        if self.is_loaded('file_watcher'):
+            self.file_watcher.sync()
+
+    @timed("AirportData.rebuild_indexes")
     def rebuild_indexes(self):
         """Rebuild all indexes after data modifications. Call after adding/deleting bookings."""
-        self.flight_index = {row["FlightID"]: row for row in self.flights.to_dict("records")}
-        self.passenger_index = {row["PassengerID"]: row for row in self.passengers.to_dict("records")}
-        self.booking_index = {row["BookingID"]: row for row in self.bookings.to_dict("records")}
-        self.aircraft_index = {row["AircraftID"]: row for row in self.aircraft.to_dict("records")}
-        self.flight_bookings_index = self._build_flight_bookings_index()
\ No newline at end of file
+        if self.is_loaded('flights'):
+            self.flight_index = self._build_id_index(self.flights, "FlightID")
+        if self.is_loaded('passengers'):
+            self.passenger_index = self._build_id_index(self.passengers, "PassengerID")
+        if self.is_loaded('bookings'):
+            self.booking_index = self._build_id_index(self.bookings, "BookingID")
+            self.flight_bookings_index = self._build_flight_bookings_index()
+            self.flight_counters = self._build_flight_counters()
+        if self.is_loaded('aircraft'):
+            self.aircraft_index = self._build_id_index(self.aircraft, "AircraftID")
@@ -4,8 +4,10 @@ Flight Management System - Integrated with AirportData
 Handles adding, cancelling, and deleting flights, bookings, passengers, and aircraft
 """
 
-import pandas as pd
 from Flight_Manager import AirportData
+from bookings import BookingSystem
+from integrity import check_integrity, format_report
+from schedule_import import read_schedule, diff_schedule, apply_schedule, format_diff
 from datetime import datetime
 
 
@@ -14,6 +16,8 @@ class AdminManager:
     
     def __init__(self, airport_data: AirportData):
         self.data_manager = airport_data
+        # Open batch transaction, or None while changes are applied straight away
+        self.batch = None
     
     # ==================== VALIDATION METHODS ====================
     
@@ -63,6 +67,16 @@ class AdminManager:
             return self.data_manager.aircraft
         return None
 
+    def get_table_name(self, category):
+        """Get the AirportData table name for a category"""
+        table_map = {
+            "flight": "flights",
+            "booking": "bookings",
+            "passenger": "passengers",
+            "aircraft": "aircraft"
+        }
+        return table_map.get(category.lower())
+
     def get_id_column(self, category):
         """Get the ID column name for a category"""
         id_col_map = {
@@ -84,21 +98,17 @@ class AdminManager:
         if df is None:
             return False, f" Invalid category: {category}"
         
-        # CRITICAL: Reset any multi-level indexes that might exist from FlightSearch
-        # This ensures the DataFrame has normal columns before we try to add new data
-        if category == 'flight' and isinstance(self.data_manager.flights.index, pd.MultiIndex):
-            self.data_manager.flights.reset_index(inplace=True)
-            # Drop the temporary 'Date' column created by FlightSearch
-            if 'Date' in self.data_manager.flights.columns:
-                self.data_manager.flights.drop(columns=['Date'], inplace=True)
-        
         print(f"\n{'='*50}")
         print(f"ADD NEW {category.upper()}")
         print(f"{'='*50}")
         
         try:
-            # Determine next ID
-            if df.empty:
+            # Determine next ID (counting rows already queued in a batch)
+            if self.batch is not None and category != 'aircraft':
+                new_id = self.batch.next_id(self.get_table_name(category))
+            elif category != 'aircraft':
+                new_id = self.data_manager.next_id(self.get_table_name(category))
+            elif df.empty:
                 new_id = 1
             else:
                 new_id = int(df[id_col].max()) + 1
@@ -131,29 +141,20 @@ class AdminManager:
                 if new_row is None:
                     return False, " Aircraft creation cancelled."
             
-            # Add the new row to the DataFrame
-            new_df_row = pd.DataFrame([new_row])
+            # In batch mode the row is queued until the batch is committed
+            if self.batch is not None:
+                self.batch.add(self.get_table_name(category), new_row)
+                return True, f" Queued new {category} with {id_col} = {new_id} ({len(self.batch)} change(s) in batch)"
             
+            # Add the new row to the DataFrame, its index and storage
             if category == 'flight':
-                self.data_manager.flights = pd.concat(
-                    [self.data_manager.flights, new_df_row], ignore_index=True
-                )
-                self.data_manager.flight_index[new_id] = new_row
+                self.data_manager.add_row('flights', new_row)
             elif category == 'booking':
-                self.data_manager.bookings = pd.concat(
-                    [self.data_manager.bookings, new_df_row], ignore_index=True
-                )
-                self.data_manager.booking_index[new_id] = new_row
+                self.data_manager.add_booking(new_row)
             elif category == 'passenger':
-                self.data_manager.passengers = pd.concat(
-                    [self.data_manager.passengers, new_df_row], ignore_index=True
-                )
-                self.data_manager.passenger_index[new_id] = new_row
+                self.data_manager.add_row('passengers', new_row)
             elif category == 'aircraft':
-                self.data_manager.aircraft = pd.concat(
-                    [self.data_manager.aircraft, new_df_row], ignore_index=True
-                )
-                self.data_manager.aircraft_index[new_row['AircraftID']] = new_row
+                self.data_manager.add_row('aircraft', new_row)
             
             return True, f" Added new {category} with {id_col} = {new_id}"
             
@@ -350,14 +351,6 @@ class AdminManager:
         if df is None:
             return False, f" Invalid category: {category}"
         
-        # CRITICAL: Reset any multi-level indexes that might exist from FlightSearch
-        if category == 'flight' and isinstance(self.data_manager.flights.index, pd.MultiIndex):
-            self.data_manager.flights.reset_index(inplace=True)
-            if 'Date' in self.data_manager.flights.columns:
-                self.data_manager.flights.drop(columns=['Date'], inplace=True)
-        elif category == 'booking' and isinstance(self.data_manager.bookings.index, pd.MultiIndex):
-            self.data_manager.bookings.reset_index(inplace=True)
-        
         print(f"\n{'='*50}")
         print(f"CANCEL {category.upper()}")
         print(f"{'='*50}")
@@ -382,23 +375,33 @@ class AdminManager:
                 entry = self.data_manager.get_flight_by_id(entry_id)
                 if entry is None:
                     return False, f" {id_col} {entry_id} not found."
-                # Update the DataFrame
-                self.data_manager.flights.loc[
-                    self.data_manager.flights[id_col] == entry_id, 'Status'
-                ] = 'Cancelled'
-                # Update index
-                self.data_manager.flight_index[entry_id]['Status'] = 'Cancelled'
+                if self.batch is not None:
+                    self.batch.cancel('flights', entry_id)
+                    return True, f" Queued cancellation of flight {entry_id}; its passengers are rebooked when the batch is committed."
+                # Cancel the flight and its bookings, then move the passengers to alternative flights
+                cancelled = self.data_manager.cancel_flight(entry_id)
+                rebooked, stranded = BookingSystem(self.data_manager).reaccommodate(entry_id, cancelled)
+                
+                message = f" Flight {entry_id} has been cancelled along with {len(cancelled)} booking(s)."
+                if rebooked:
+                    message += f"\n {len(rebooked)} passenger(s) rebooked onto alternative flights:"
+                    for old_id, new_id, passenger_id, flight_id, seat_label in rebooked:
+                        message += f"\n   Booking {old_id} -> {new_id} | Passenger {passenger_id} | Flight {flight_id} seat {seat_label}"
+                if stranded:
+                    message += f"\n {len(stranded)} passenger(s) could not be rebooked: {', '.join(map(str, stranded))}"
+                return True, message
                 
             elif category == 'booking':
                 entry = self.data_manager.get_booking_by_id(entry_id)
                 if entry is None:
                     return False, f" {id_col} {entry_id} not found."
-                # Update the DataFrame
-                self.data_manager.bookings.loc[
-                    self.data_manager.bookings[id_col] == entry_id, 'Status'
-                ] = 'Cancelled'
-                # Update index
-                self.data_manager.booking_index[entry_id]['Status'] = 'Cancelled'
+                if self.data_manager.is_flight_locked(entry['FlightID']):
+                    return False, f" Booking {entry_id} is locked: flight {entry['FlightID']} has completed."
+                if self.batch is not None:
+                    self.batch.cancel('bookings', entry_id)
+                    return True, f" Queued cancellation of booking {entry_id}."
+                # Update the DataFrame, index and per-flight counters
+                self.data_manager.set_booking_status(entry_id, 'Cancelled')
                 
             elif category == 'passenger':
                 return False, " Passengers cannot be cancelled. Use delete instead."
@@ -422,18 +425,6 @@ class AdminManager:
         if df is None:
             return False, f" Invalid category: {category}"
         
-        # CRITICAL: Reset any multi-level indexes that might exist from FlightSearch
-        if category == 'flight' and isinstance(self.data_manager.flights.index, pd.MultiIndex):
-            self.data_manager.flights.reset_index(inplace=True)
-            if 'Date' in self.data_manager.flights.columns:
-                self.data_manager.flights.drop(columns=['Date'], inplace=True)
-        elif category == 'booking' and isinstance(self.data_manager.bookings.index, pd.MultiIndex):
-            self.data_manager.bookings.reset_index(inplace=True)
-        elif category == 'passenger' and isinstance(self.data_manager.passengers.index, pd.MultiIndex):
-            self.data_manager.passengers.reset_index(inplace=True)
-        elif category == 'aircraft' and isinstance(self.data_manager.aircraft.index, pd.MultiIndex):
-            self.data_manager.aircraft.reset_index(inplace=True)
-        
         print(f"\n{'='*50}")
         print(f"DELETE {category.upper()}")
         print(f"{'='*50}")
@@ -459,20 +450,26 @@ class AdminManager:
                 
                 # Check for bookings
                 bookings = self.data_manager.get_bookings_for_flight(entry_id)
+                if not bookings.empty and self.data_manager.is_flight_locked(entry_id):
+                    return False, f" Flight {entry_id} has completed: its {len(bookings)} booking(s) are locked."
                 if not bookings.empty:
                     print(f"  This flight has {len(bookings)} booking(s).")
                     confirm = input("Type 'DELETE' to confirm deletion of flight AND all bookings: ")
                     if confirm != 'DELETE':
                         return False, "Deletion cancelled."
-                    # Delete bookings first
-                    self.data_manager.bookings = self.data_manager.bookings[
-                        self.data_manager.bookings['FlightID'] != entry_id
-                    ].reset_index(drop=True)
+                    # Delete bookings first (a batch deletes them along with the entry on commit)
+                    if self.batch is None:
+                        self.data_manager.drop_waitlists(flight_ids=[entry_id])
+                        self.data_manager.remove_bookings(
+                            self.data_manager.bookings['FlightID'] == entry_id
+                        )
                 
             elif category == 'booking':
                 entry = self.data_manager.get_booking_by_id(entry_id)
                 if entry is None:
                     return False, f" {id_col} {entry_id} not found."
+                if self.data_manager.is_flight_locked(entry['FlightID']):
+                    return False, f" Booking {entry_id} is locked: flight {entry['FlightID']} has completed."
                 print(f"\nBooking: Flight {entry['FlightID']}, Passenger {entry['PassengerID']}, Seat {entry['SeatNumber']}")
                 
             elif category == 'passenger':
@@ -485,15 +482,21 @@ class AdminManager:
                 passenger_bookings = self.data_manager.bookings[
                     self.data_manager.bookings['PassengerID'] == entry_id
                 ]
+                locked = self.data_manager.locked_flights(passenger_bookings['FlightID'])
+                if locked:
+                    return False, (f" Passenger {entry_id} has locked bookings: "
+                                   f"flight(s) {', '.join(map(str, locked))} have completed.")
                 if not passenger_bookings.empty:
                     print(f"  This passenger has {len(passenger_bookings)} booking(s).")
                     confirm = input("Type 'DELETE' to confirm deletion of passenger AND all bookings: ")
                     if confirm != 'DELETE':
                         return False, "Deletion cancelled."
-                    # Delete bookings first
-                    self.data_manager.bookings = self.data_manager.bookings[
-                        self.data_manager.bookings['PassengerID'] != entry_id
-                    ].reset_index(drop=True)
+                    # Delete bookings first (a batch deletes them along with the entry on commit)
+                    if self.batch is None:
+                        self.data_manager.drop_waitlists(passenger_ids=[entry_id])
+                        self.data_manager.remove_bookings(
+                            self.data_manager.bookings['PassengerID'] == entry_id
+                        )
                 
             elif category == 'aircraft':
                 entry = self.data_manager.get_aircraft_by_id(entry_id)
@@ -514,39 +517,130 @@ class AdminManager:
                 if confirm != 'yes':
                     return False, "Deletion cancelled."
             
+            # In batch mode the deletion is queued until the batch is committed
+            if self.batch is not None:
+                self.batch.delete(self.get_table_name(category), entry_id)
+                return True, f" Queued deletion of {category} {entry_id} ({len(self.batch)} change(s) in batch)"
+            
             # Perform deletion
             if category == 'flight':
-                self.data_manager.flights = self.data_manager.flights[
-                    self.data_manager.flights[id_col] != entry_id
-                ].reset_index(drop=True)
-                del self.data_manager.flight_index[entry_id]
+                self.data_manager.delete_flight(entry_id)
                 
             elif category == 'booking':
-                self.data_manager.bookings = self.data_manager.bookings[
-                    self.data_manager.bookings[id_col] != entry_id
-                ].reset_index(drop=True)
-                del self.data_manager.booking_index[entry_id]
+                self.data_manager.remove_bookings(
+                    self.data_manager.bookings[id_col] == entry_id
+                )
                 
             elif category == 'passenger':
-                self.data_manager.passengers = self.data_manager.passengers[
-                    self.data_manager.passengers[id_col] != entry_id
-                ].reset_index(drop=True)
-                del self.data_manager.passenger_index[entry_id]
+                self.data_manager.delete_row('passengers', entry_id)
                 
             elif category == 'aircraft':
-                self.data_manager.aircraft = self.data_manager.aircraft[
-                    self.data_manager.aircraft[id_col] != entry_id
-                ].reset_index(drop=True)
-                del self.data_manager.aircraft_index[entry_id]
-            
-            # Rebuild indexes to ensure consistency
-            self.data_manager.rebuild_indexes()
+                self.data_manager.delete_row('aircraft', entry_id)
             
             return True, f"  Deleted {category} {entry_id} successfully."
             
         except Exception as e:
             return False, f" Error deleting {category}: {e}"
 
+    # ==================== BATCH TRANSACTIONS ====================
+
+    def begin_batch(self):
+        """Queue the following adds, cancellations and deletions instead of applying them one by one"""
+        if self.batch is not None:
+            return False, f" A batch is already open with {len(self.batch)} change(s)."
+        self.batch = self.data_manager.transaction()
+        return True, " Batch started. Changes are queued until you commit or roll back."
+
+    def commit_batch(self):
+        """Apply every queued change at once, rebook passengers of cancelled flights, and save"""
+        if self.batch is None:
+            return False, " No batch is open."
+        try:
+            summary = self.batch.commit(save=False)
+        except Exception as e:
+            return False, f" Batch not applied (nothing was changed): {e}"
+        self.batch = None
+
+        message = " Batch committed:" + self._describe_commit(summary)
+        success, save_message = self.save_data()
+        return success, message + "\n" + save_message
+
+    def _describe_commit(self, summary):
+        """Describe a committed transaction, rebooking passengers of any cancelled flights"""
+        message = ""
+        for action in ('added', 'updated', 'cancelled', 'deleted'):
+            counts = ", ".join(f"{count} {name}" for name, count in summary[action].items() if count)
+            if counts:
+                message += f"\n   {action.capitalize()}: {counts}"
+
+        # Passengers on cancelled flights are moved to alternatives, as for a single cancellation
+        cancelled = summary['cancelled_bookings']
+        if cancelled is not None and not cancelled.empty:
+            rebooked, stranded = BookingSystem(self.data_manager).reaccommodate_all(cancelled)
+            message += f"\n   {rebooked} passenger(s) rebooked, {stranded} could not be rebooked"
+        return message
+
+    def rollback_batch(self):
+        """Discard every queued change"""
+        if self.batch is None:
+            return False, " No batch is open."
+        count = len(self.batch)
+        self.batch.rollback()
+        self.batch = None
+        return True, f" Batch rolled back; {count} queued change(s) discarded."
+
+    # ==================== SCHEDULE IMPORT ====================
+
+    def import_schedule(self, path, cancel_missing=True):
+        """Diff a season schedule file against the flights, confirm, then apply it in one batch and save"""
+        if self.batch is not None:
+            return False, " Commit or roll back the open batch before importing a schedule."
+        try:
+            diff = diff_schedule(self.data_manager, read_schedule(path), cancel_missing)
+        except Exception as e:
+            return False, f" Error reading schedule: {e}"
+
+        print("\nSchedule changes:")
+        print(format_diff(diff))
+        if len(diff['insert']) + len(diff['update']) + len(diff['cancel']) == 0:
+            return True, " Flights already match the schedule."
+        confirm = input("\nApply these changes? (yes/no): ").lower()
+        if confirm != 'yes':
+            return False, "Import cancelled."
+
+        try:
+            summary = apply_schedule(self.data_manager, diff)
+        except Exception as e:
+            return False, f" Schedule not applied (nothing was changed): {e}"
+        message = " Schedule imported:" + self._describe_commit(summary)
+        success, save_message = self.save_data()
+        return success, message + "\n" + save_message
+
+    # ==================== ARCHIVE ====================
+
+    def archive_completed(self, cutoff_str):
+        """Move Completed flights departing before the cutoff date (and their bookings) to the archive"""
+        valid, cutoff = self.validate_date(cutoff_str)
+        if not valid:
+            return False, " Invalid date format. Please use YYYY-MM-DD."
+        try:
+            flights, bookings = self.data_manager.archive.archive_completed(cutoff)
+        except Exception as e:
+            return False, f" Error archiving flights: {e}"
+        if flights == 0:
+            return True, f" No completed flights before {cutoff_str} to archive."
+        return True, f"  Archived {flights} flight(s) and {bookings} booking(s) from before {cutoff_str}."
+
+    # ==================== INTEGRITY CHECK ====================
+
+    def check_integrity(self):
+        """Run the referential-integrity and consistency checks across all tables"""
+        try:
+            report = check_integrity(self.data_manager)
+        except Exception as e:
+            return False, f" Error checking data: {e}"
+        return not report, format_report(report)
+
     # ==================== SAVE DATA ====================
     
     def save_data(self):
@@ -569,16 +663,61 @@ class AdminManager:
             print("  1. Add Entry")
             print("  2. Cancel Entry")
             print("  3. Delete Entry")
-            print("  4. Return to Main Menu")
+            print("  4. Archive Completed Flights")
+            print("  5. Check Data Integrity")
+            print("  6. Import Season Schedule")
+            if self.batch is None:
+                print("  7. Begin Batch")
+            else:
+                print(f"  7. Commit Batch ({len(self.batch)} queued change(s))")
+            print("  8. Roll Back Batch")
+            print("  9. Return to Main Menu")
             
-            action = input("\nEnter choice (1-4): ").strip()
+            action = input("\nEnter choice (1-9): ").strip()
             
-            if action == '4':
+            if action == '9':
+                if self.batch is not None:
+                    confirm = input(f"Discard {len(self.batch)} queued change(s)? (yes/no): ").lower()
+                    if confirm != 'yes':
+                        continue
+                    self.rollback_batch()
                 print("Returning to main menu...")
                 break
             
+            if action in ['7', '8']:
+                if action == '8':
+                    success, message = self.rollback_batch()
+                elif self.batch is None:
+                    success, message = self.begin_batch()
+                else:
+                    success, message = self.commit_batch()
+                print(message)
+                input("\nPress Enter to continue...")
+                continue
+            
+            if action == '6':
+                path = input("Schedule file (CSV): ").strip()
+                keep = input("Cancel scheduled flights missing from the schedule? (yes/no): ").lower() != 'yes'
+                success, message = self.import_schedule(path, cancel_missing=not keep)
+                print(message)
+                input("\nPress Enter to continue...")
+                continue
+            
+            if action == '4':
+                cutoff_str = input("Archive completed flights before (YYYY-MM-DD): ").strip()
+                success, message = self.archive_completed(cutoff_str)
+                print(message)
+                input("\nPress Enter to continue...")
+                continue
+            
+            if action == '5':
+                success, message = self.check_integrity()
+                print(message)
+                input("\nPress Enter to continue...")
+                continue
+            
             if action not in ['1', '2', '3']:
-                print(" Invalid choice. Please select 1-4.")
+                print(" Invalid choice. Please select 1-9.")
                 input("\nPress Enter to continue...")
                 continue
             
@@ -617,8 +756,8 @@ class AdminManager:
             
             print(message)
             
-            # Ask to save if successful
-            if success:
+            # Ask to save if successful (batched changes are saved on commit)
+            if success and self.batch is None:
                 save = input("\nSave changes to file? (yes/no): ").lower()
                 if save == 'yes':
                     success, msg = self.save_data()
@@ -0,0 +1,185 @@
+"""
+Date-partitioned archival of completed flights and their bookings.
+Completed flights older than a cutoff are moved, with their bookings, into one
+CSV pair per month (Flights_YYYY-MM.csv / Bookings_YYYY-MM.csv) so AirportData
+only keeps the hot working set in memory. Partitions are read back on demand.
+"""
+
+import os
+import re
+
+import pandas as pd
+
+from schema import apply_schema, concat_chunks
+
+PARTITION_PATTERN = re.compile(r"^Flights_(\d{4}-\d{2})\.csv$")
+
+# Archived table -> (partition file prefix, ID column)
+ARCHIVED_IDS = {'flights': ("Flights", 'FlightID'), 'bookings': ("Bookings", 'BookingID')}
+
+
+class FlightArchive:
+    """Monthly archive partitions for one AirportData instance"""
+
+    def __init__(self, airport_data, archive_dir):
+        self.data_manager = airport_data
+        self.archive_dir = archive_dir
+        # month -> (flights, bookings) for partitions read so far
+        self._loaded = {}
+        # Table -> highest ID ever archived, read from MaxIDs.csv on first use
+        self._max_ids = None
+
+    def _path(self, table, month):
+        return os.path.join(self.archive_dir, f"{table}_{month}.csv")
+
+    @property
+    def _max_ids_path(self):
+        return os.path.join(self.archive_dir, "MaxIDs.csv")
+
+    def max_id(self, name):
+        """
+        Highest FlightID or BookingID ever archived (0 if none). New rows are numbered
+        above it so an ID is never reused for a row that only exists in the archive.
+        """
+        if self._max_ids is None:
+            self._max_ids = self._read_max_ids()
+        return self._max_ids.get(name, 0)
+
+    def _read_max_ids(self):
+        if os.path.exists(self._max_ids_path):
+            marks = pd.read_csv(self._max_ids_path)
+            return dict(zip(marks['Table'], marks['MaxID'].astype(int)))
+        # Archives written before the marks were recorded: scan the ID column of each partition
+        max_ids = {}
+        for month in self.list_partitions():
+            for name, (table, id_col) in ARCHIVED_IDS.items():
+                path = self._path(table, month)
+                if os.path.exists(path):
+                    ids = pd.read_csv(path, usecols=[id_col])[id_col]
+                    if not ids.empty:
+                        max_ids[name] = max(max_ids.get(name, 0), int(ids.max()))
+        return max_ids
+
+    def _record_max_ids(self, flights, bookings):
+        max_ids = {name: self.max_id(name) for name in ARCHIVED_IDS}
+        for name, rows in (('flights', flights), ('bookings', bookings)):
+            if not rows.empty:
+                max_ids[name] = max(max_ids[name], int(rows[ARCHIVED_IDS[name][1]].max()))
+        pd.DataFrame({'Table': list(max_ids), 'MaxID': list(max_ids.values())}).to_csv(self._max_ids_path, index=False)
+        self._max_ids = max_ids
+
+    def list_partitions(self):
+        """Months that have archived data, oldest first"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        months = [m.group(1) for m in map(PARTITION_PATTERN.match, os.listdir(self.archive_dir)) if m]
+        return sorted(months)
+
+    # ==================== ARCHIVING ====================
+
+    def archive_completed(self, cutoff):
+        """
+        Move Completed flights departing before `cutoff`, and all their bookings, into monthly partitions.
+        The hot tables are saved straight afterwards so no row is ever in both places.
+        Returns (flights archived, bookings archived).
+        """
+        cutoff = pd.Timestamp(cutoff)
+        with self.data_manager.lock:
+            flights = self.data_manager.flights
+            flight_mask = (flights['Status'] == 'Completed') & (flights['DateTime'] < cutoff)
+            if not flight_mask.any():
+                return 0, 0
+
+            old_flights = flights[flight_mask]
+            flight_months = old_flights['DateTime'].dt.strftime("%Y-%m")
+            month_by_flight = pd.Series(flight_months.to_numpy(), index=old_flights['FlightID'].to_numpy())
+
+            bookings = self.data_manager.bookings
+            booking_mask = bookings['FlightID'].isin(old_flights['FlightID'])
+            old_bookings = bookings[booking_mask]
+            booking_months = old_bookings['FlightID'].map(month_by_flight)
+
+            os.makedirs(self.archive_dir, exist_ok=True)
+            for month, group in old_flights.groupby(flight_months):
+                self._append(self._path("Flights", month), group)
+            for month, group in old_bookings.groupby(booking_months):
+                self._append(self._path("Bookings", month), group)
+            self._record_max_ids(old_flights, old_bookings)
+
+            # Cached partitions for these months are now out of date
+            for month in flight_months.unique():
+                self._loaded.pop(month, None)
+
+            archived_bookings = self.data_manager.remove_bookings(booking_mask, event='booking_archived')
+            archived_flights = self.data_manager.remove_flights(flight_mask, event='flight_archived')
+            self.data_manager.save_data()
+        return archived_flights, archived_bookings
+
+    def _append(self, path, rows):
+        rows.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+    # ==================== ON-DEMAND LOADING ====================
+
+    def load_partition(self, month):
+        """Read one month's archived flights and bookings (cached after the first read)"""
+        if month not in self._loaded:
+            flights_path = self._path("Flights", month)
+            bookings_path = self._path("Bookings", month)
+            if not os.path.exists(flights_path):
+                return None, None
+            flights = apply_schema('flights', pd.read_csv(flights_path))
+            if os.path.exists(bookings_path):
+                bookings = apply_schema('bookings', pd.read_csv(bookings_path))
+            else:
+                bookings = apply_schema('bookings', pd.DataFrame(columns=self.data_manager.bookings.columns))
+            self._loaded[month] = (flights, bookings)
+        return self._loaded[month]
+
+    def _months_between(self, start, end):
+        start = pd.Timestamp(start).strftime("%Y-%m") if start is not None else None
+        end = pd.Timestamp(end).strftime("%Y-%m") if end is not None else None
+        return [m for m in self.list_partitions()
+                if (start is None or m >= start) and (end is None or m <= end)]
+
+    def get_flights(self, start=None, end=None):
+        """Archived flights departing between the start and end dates (inclusive), for reports"""
+        frames = [self.load_partition(month)[0] for month in self._months_between(start, end)]
+        if not frames:
+            return self.data_manager.flights.iloc[0:0]
+        flights = concat_chunks(frames)
+        if start is not None:
+            flights = flights[flights['Date'] >= pd.Timestamp(start).normalize()]
+        if end is not None:
+            flights = flights[flights['Date'] <= pd.Timestamp(end).normalize()]
+        return flights.reset_index(drop=True)
+
+    def get_bookings(self, start=None, end=None):
+        """Archived bookings for flights in the months between start and end"""
+        frames = [self.load_partition(month)[1] for month in self._months_between(start, end)]
+        if not frames:
+            return self.data_manager.bookings.iloc[0:0]
+        return concat_chunks(frames)
+
+    def get_passenger_history(self, passenger_id):
+        """
+        Every booking a passenger has made, hot and archived, joined with its flight.
+        Archived booking partitions are scanned on demand (only the PassengerID column
+        is parsed in full) and only matching months are loaded.
+        """
+        hot = self.data_manager.bookings
+        frames = [hot[hot['PassengerID'] == passenger_id].merge(self.data_manager.flights, on='FlightID',
+                                                                 how='left', suffixes=("", "_Flight"))]
+        for month in self.list_partitions():
+            bookings_path = self._path("Bookings", month)
+            if not os.path.exists(bookings_path):
+                continue
+            if month not in self._loaded:
+                ids = pd.read_csv(bookings_path, usecols=['PassengerID'])['PassengerID']
+                if not (ids == passenger_id).any():
+                    continue
+            flights, bookings = self.load_partition(month)
+            matches = bookings[bookings['PassengerID'] == passenger_id]
+            frames.append(matches.merge(flights, on='FlightID', how='left', suffixes=("", "_Flight")))
+
+        history = pd.concat(frames, ignore_index=True)
+        return history.sort_values('DateTime').reset_index(drop=True)
@@ -0,0 +1,146 @@
+"""
+Synthetic data generator for benchmarks.
+Writes Flights/Passengers/Bookings/Aircraft CSVs with the same column schemas
+as the files in ./data, scaled by the number of bookings.
+
+Usage:
+    python -m benchmarks.generate_data --bookings 1000000 --out ./bench_data
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+CITIES = ['Liverpool', 'Birmingham', 'Bristol', 'Glasgow', 'London',
+          'Leeds', 'Manchester', 'Sheffield', 'Cardiff']
+FIRST_NAMES = ['John', 'Elizabeth', 'James', 'Mary', 'Robert', 'Patricia', 'Michael', 'Linda',
+               'William', 'Barbara', 'David', 'Susan', 'Richard', 'Jessica', 'Thomas', 'Sarah']
+SURNAMES = ['Miller', 'Garcia', 'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Davis',
+            'Wilson', 'Taylor', 'Anderson', 'Thomas', 'Moore', 'Jackson', 'Martin', 'Lee']
+STREETS = ['Pine St', 'Cedar St', 'Oak Ave', 'Maple Rd', 'Elm St', 'High St']
+FLIGHT_STATUSES = ['Scheduled', 'Completed', 'Cancelled']
+BOOKING_STATUSES = ['Booked', 'Checked-in', 'Cancelled']
+
+# Ratios taken from the shipped sample data (15k bookings : 2k flights : 17.5k passengers)
+FLIGHTS_PER_BOOKING = 2000 / 15000
+PASSENGERS_PER_BOOKING = 17500 / 15000
+
+CHUNK_SIZE = 1_000_000
+
+
+def generate_aircraft(rng, count=80):
+    return pd.DataFrame({
+        'AircraftID': [f"A{i:03d}" for i in range(1, count + 1)],
+        'Rows': rng.integers(20, 51, count),
+        'SeatsInARow': rng.integers(4, 11, count),
+    })
+
+
+def generate_flights(rng, count, aircraft, start=None):
+    # Departures run over the year from tomorrow, so Scheduled flights can still be booked
+    if start is None:
+        start = pd.Timestamp.now().normalize() + pd.Timedelta(days=1)
+    aircraft_pos = rng.integers(0, len(aircraft), count)
+    departure = rng.integers(0, len(CITIES), count)
+    # Pick a different arrival city by offsetting the departure index
+    arrival = (departure + rng.integers(1, len(CITIES), count)) % len(CITIES)
+    date_time = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, 365 * 24, count), unit='h')
+    capacity = (aircraft['Rows'].to_numpy() * aircraft['SeatsInARow'].to_numpy())[aircraft_pos]
+
+    return pd.DataFrame({
+        'FlightID': np.arange(1, count + 1),
+        'AeroplaneNumber': aircraft['AircraftID'].to_numpy()[aircraft_pos],
+        'DepartureCity': np.array(CITIES)[departure],
+        'ArrivalCity': np.array(CITIES)[arrival],
+        'DateTime': date_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'FlightCapacity': capacity,
+        'SeatNumber': np.nan,
+        'CostPerSeat': np.round(rng.uniform(40, 400, count), 2),
+        'Status': np.array(FLIGHT_STATUSES)[rng.integers(0, 3, count)],
+        'Date': date_time.strftime('%Y-%m-%d'),
+    })
+
+
+def generate_passengers(rng, start_id, count):
+    ids = np.arange(start_id, start_id + count)
+    first = np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), count)]
+    surname = np.array(SURNAMES)[rng.integers(0, len(SURNAMES), count)]
+    dob = pd.Timestamp("1940-01-01") + pd.to_timedelta(rng.integers(0, 65 * 365, count), unit='D')
+    house = rng.integers(1, 999, count).astype(str)
+
+    return pd.DataFrame({
+        'PassengerID': ids,
+        'FirstName': first,
+        'Surname': surname,
+        'DOB': dob.strftime('%Y-%m-%d'),
+        'Address_Line_1': np.char.add(np.char.add(house, ' '), np.array(STREETS)[rng.integers(0, len(STREETS), count)]),
+        'Address_Line_2': np.char.add('Apt ', rng.integers(1, 999, count).astype(str)),
+        'Address_Line_3': np.array(CITIES)[rng.integers(0, len(CITIES), count)],
+        'Postcode': np.char.add(rng.integers(10, 99, count).astype(str), 'AB1 2BB'),
+        'Email': np.char.add(np.char.add(np.char.lower(first), '.'),
+                             np.char.add(np.char.lower(surname), np.char.add(ids.astype(str), '@email.com'))),
+    })
+
+
+def generate_bookings(rng, start_id, count, flight_capacity, passenger_count):
+    flight_pos = rng.integers(0, len(flight_capacity), count)
+    # Seats are drawn within each flight's capacity; occasional clashes mirror the real data
+    seats = (rng.random(count) * flight_capacity[flight_pos]).astype(np.int64) + 1
+
+    return pd.DataFrame({
+        'BookingID': np.arange(start_id, start_id + count),
+        'FlightID': flight_pos + 1,
+        'PassengerID': rng.integers(1, passenger_count + 1, count),
+        'SeatNumber': seats,
+        'Status': np.array(BOOKING_STATUSES)[rng.integers(0, 3, count)],
+    })
+
+
+def generate_dataset(out_dir, bookings, seed=42):
+    """Write a full synthetic dataset to out_dir and return the four CSV paths"""
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {
+        'flights_path': os.path.join(out_dir, "Flights.csv"),
+        'passengers_path': os.path.join(out_dir, "Passengers.csv"),
+        'bookings_path': os.path.join(out_dir, "Bookings.csv"),
+        'aircraft_path': os.path.join(out_dir, "Aircraft.csv"),
+    }
+
+    aircraft = generate_aircraft(rng)
+    aircraft.to_csv(paths['aircraft_path'], index=False)
+
+    flight_count = max(int(bookings * FLIGHTS_PER_BOOKING), 1)
+    flights = generate_flights(rng, flight_count, aircraft)
+    flights.to_csv(paths['flights_path'], index=False)
+
+    # Passengers and bookings are written in chunks so 10M-row datasets fit in memory
+    passenger_count = max(int(bookings * PASSENGERS_PER_BOOKING), 1)
+    for start in range(0, passenger_count, CHUNK_SIZE):
+        chunk = generate_passengers(rng, start + 1, min(CHUNK_SIZE, passenger_count - start))
+        chunk.to_csv(paths['passengers_path'], index=False, mode='w' if start == 0 else 'a', header=start == 0)
+
+    capacity = flights['FlightCapacity'].to_numpy()
+    for start in range(0, bookings, CHUNK_SIZE):
+        chunk = generate_bookings(rng, start + 1, min(CHUNK_SIZE, bookings - start), capacity, passenger_count)
+        chunk.to_csv(paths['bookings_path'], index=False, mode='w' if start == 0 else 'a', header=start == 0)
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic airport CSV data")
+    parser.add_argument("--bookings", type=int, default=10_000, help="Number of bookings to generate")
+    parser.add_argument("--out", default="./bench_data", help="Output directory")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    paths = generate_dataset(args.out, args.bookings, args.seed)
+    for path in paths.values():
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
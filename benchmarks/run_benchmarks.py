@@ -0,0 +1,227 @@
+"""
+Benchmark harness for the booking hot paths.
+Times AirportData loading and indexing, flight search, seat availability,
+booking, deletion and the view_list functions against a synthetic dataset.
+Reports throughput, latency percentiles and peak memory, and saves the
+results as JSON so runs can be compared.
+
+Usage:
+    python -m benchmarks.run_benchmarks --bookings 10000
+    python -m benchmarks.run_benchmarks --bookings 1000000 --compare benchmarks/results/<previous>.json
+"""
+
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generate_data import generate_dataset
+from Flight_Manager import AirportData
+from flight_search import FlightSearch
+from bookings import BookingSystem
+from add_remove import AdminManager
+from view_list import view_flights_by_price, view_reservations_by_date, view_passengers
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+@contextlib.contextmanager
+def quiet():
+    """Send the app's console output to /dev/null while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+@contextlib.contextmanager
+def scripted_input(answers):
+    """Feed canned answers to the interactive input() prompts"""
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def summarise(name, latencies, peak_bytes):
+    latencies = np.array(latencies)
+    total = float(latencies.sum())
+    return {
+        'name': name,
+        'calls': int(len(latencies)),
+        'total_s': round(total, 6),
+        'ops_per_s': round(len(latencies) / total, 2) if total > 0 else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 4),
+        'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 4),
+        'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 4),
+        'max_ms': round(float(latencies.max()) * 1000, 4),
+        'peak_mem_mb': None if peak_bytes is None else round(peak_bytes / 1024 ** 2, 2),
+    }
+
+
+def measure(name, calls, track_memory=True):
+    """
+    Time a list of zero-argument callables, one latency sample per call.
+    Peak memory is taken from one extra traced call so tracemalloc does not skew the timings.
+    """
+    latencies = []
+    with quiet():
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+
+    peak = None
+    if track_memory and calls:
+        tracemalloc.start()
+        with quiet():
+            calls[0]()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    result = summarise(name, latencies, peak)
+    print(f"  {name:<32} {result['calls']:>6} calls  {result['ops_per_s'] or 0:>12.2f} ops/s  "
+          f"p50 {result['p50_ms']:>10.3f} ms  p99 {result['p99_ms']:>10.3f} ms  "
+          f"peak {result['peak_mem_mb'] if result['peak_mem_mb'] is not None else '-':>8} MB")
+    return result
+
+
+def run_suite(paths, repeat, samples, track_memory, only=None):
+    rng = random.Random(0)
+    results = []
+
+    def wanted(name):
+        return only is None or any(key in name for key in only)
+
+    # Tables load lazily, so loading is timed as construction plus load_all()
+    if wanted("AirportData.load_all"):
+        results.append(measure("AirportData.load_all", [lambda: AirportData(**paths).load_all()] * repeat, track_memory))
+
+    airport_data = AirportData(**paths)
+    airport_data.load_all()
+
+    if wanted("rebuild_indexes"):
+        results.append(measure("AirportData.rebuild_indexes", [airport_data.rebuild_indexes] * repeat, track_memory))
+
+    if wanted("FlightSearch"):
+        results.append(measure("FlightSearch.__init__", [lambda: FlightSearch(airport_data)] * repeat, track_memory))
+
+        search = FlightSearch(airport_data)
+        flights = airport_data.flights.sample(min(samples, len(airport_data.flights)), random_state=0)
+        queries = [(f['DepartureCity'], f['ArrivalCity'], pd.Timestamp(f['DateTime']).strftime("%Y-%m-%d"))
+                   for f in flights.to_dict("records")]
+        results.append(measure("FlightSearch.search",
+                               [lambda q=q: search.search(*q) for q in queries], track_memory))
+
+    booking_system = BookingSystem(airport_data)
+    # Only flights that can still be booked, so book_seat times bookings rather than rejections
+    flights = airport_data.flights
+    bookable = (flights['Status'] == 'Scheduled') & (flights['DateTime'] > pd.Timestamp.now())
+    scheduled = flights.loc[bookable, 'FlightID'].tolist()
+    flight_ids = [rng.choice(scheduled) for _ in range(samples)] if scheduled else []
+
+    if wanted("get_available_seats"):
+        results.append(measure("BookingSystem.get_available_seats",
+                               [lambda f=f: booking_system.get_available_seats(f) for f in flight_ids], track_memory))
+
+    if wanted("book_seat"):
+        passenger_ids = airport_data.passengers['PassengerID'].tolist()
+        calls = []
+        for flight_id in flight_ids:
+            available, seats_per_row, _ = booking_system.get_available_seats(flight_id)
+            if not available:
+                continue
+            label = booking_system.seat_number_to_label(rng.choice(available), seats_per_row)
+            calls.append(lambda f=flight_id, p=rng.choice(passenger_ids), s=label: booking_system.book_seat(f, p, s))
+        # The traced memory call would re-book the first seat, so memory is skipped here
+        results.append(measure("BookingSystem.book_seat", calls, track_memory=False))
+
+    if wanted("delete_entry"):
+        admin = AdminManager(airport_data)
+        booking_ids = rng.sample(airport_data.bookings['BookingID'].tolist(), min(samples, len(airport_data.bookings)))
+        calls = []
+        for booking_id in booking_ids:
+            def delete(booking_id=booking_id):
+                with scripted_input([str(booking_id), "yes"]):
+                    admin.delete_entry("booking")
+            calls.append(delete)
+        results.append(measure("AdminManager.delete_entry", calls, track_memory=False))
+
+    for name, view in (("view_flights_by_price", view_flights_by_price),
+                       ("view_reservations_by_date", view_reservations_by_date),
+                       ("view_passengers", view_passengers)):
+        if wanted(name):
+            results.append(measure(name, [lambda v=view: v(airport_data)] * repeat, track_memory))
+
+    return results
+
+
+def compare(results, previous_path):
+    """Print the speed-up of each benchmark against a previous results file"""
+    with open(previous_path) as f:
+        previous = {r['name']: r for r in json.load(f)['results']}
+
+    print(f"\nComparison with {previous_path} (p50, >1.00x = faster now):")
+    for result in results:
+        before = previous.get(result['name'])
+        if before is None or not result['p50_ms']:
+            continue
+        print(f"  {result['name']:<32} {before['p50_ms']:>10.3f} ms -> {result['p50_ms']:>10.3f} ms  "
+              f"({before['p50_ms'] / result['p50_ms']:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the airport booking hot paths")
+    parser.add_argument("--bookings", type=int, default=10_000, help="Synthetic dataset size in bookings")
+    parser.add_argument("--data-dir", default=None, help="Reuse or write the dataset here (default ./bench_data/<bookings>)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats for whole-table operations")
+    parser.add_argument("--samples", type=int, default=200, help="Calls for per-query operations")
+    parser.add_argument("--only", nargs="*", help="Only run benchmarks whose name contains one of these")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak memory capture")
+    parser.add_argument("--label", default="run", help="Label used in the results file name")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or os.path.join("bench_data", str(args.bookings))
+    if not os.path.exists(os.path.join(data_dir, "Bookings.csv")):
+        print(f"Generating {args.bookings} bookings in {data_dir}...")
+        generate_dataset(data_dir, args.bookings)
+    paths = {
+        'flights_path': os.path.join(data_dir, "Flights.csv"),
+        'passengers_path': os.path.join(data_dir, "Passengers.csv"),
+        'bookings_path': os.path.join(data_dir, "Bookings.csv"),
+        'aircraft_path': os.path.join(data_dir, "Aircraft.csv"),
+    }
+
+    print(f"\nRunning benchmarks on {data_dir}:")
+    results = run_suite(paths, args.repeat, args.samples, not args.no_memory, args.only)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"{args.label}-{args.bookings}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(out_path, "w") as f:
+        json.dump({
+            'label': args.label,
+            'bookings': args.bookings,
+            'timestamp': datetime.now().isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResults saved to {out_path}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import pandas as pd
 
 from Flight_Manager import AirportData
+from seat_assignment import SeatAssigner
+from seat_maps import occupancy_grid, render_seat_map
+from utils.instrumentation import timed
 
 class BookingSystem:
     """Main booking system to handle flight seat reservations"""
@@ -11,12 +14,11 @@ class BookingSystem:
         self.next_booking_id = self.get_next_booking_id()
 
     def get_next_booking_id(self):
-        """Get the next available booking ID"""
-        if self.data_manager.bookings.empty:
-            return 1
-        return int(self.data_manager.bookings['BookingID'].max()) + 1
+        """Get the next available booking ID (above any archived booking)"""
+        return self.data_manager.next_id('bookings')
 
-    def seat_number_to_label(self, seat_number, seats_per_row):
+    @staticmethod
+    def seat_number_to_label(seat_number, seats_per_row):
         """Convert seat number to row + letter format (e.g., 1A, 12F)"""
         # Calculate row (1-indexed)
         row = ((seat_number - 1) // seats_per_row) + 1
@@ -65,6 +67,10 @@ class BookingSystem:
         elif flight['Status'] == 'Completed':
             return False, f"Flight {flight_id} is not available for booking"
         
+        # The status scheduler only runs periodically, so also check the departure time itself
+        if pd.Timestamp(flight['DateTime']) <= pd.Timestamp.now():
+            return False, f"Flight {flight_id} has already departed."
+        
         return True, f"Flight validated: {flight['DepartureCity']} to {flight['ArrivalCity']} on {flight['DateTime']}"
 
     def get_booked_seats(self, flight_id):
@@ -78,8 +84,9 @@ class BookingSystem:
         # Return set of booked seat numbers
         return set(active_bookings['SeatNumber'].tolist())
 
-    def get_available_seats(self, flight_id):
-        """Get all available seats for a flight"""
+    @timed("BookingSystem.get_available_seats")
+    def get_available_seats(self, flight_id, holder=None):
+        """Get all available seats for a flight (seats held by anyone except `holder` are unavailable)"""
         flight = self.data_manager.get_flight_by_id(flight_id)
         
         if flight is None:
@@ -99,11 +106,12 @@ class BookingSystem:
         total_seats = rows * seats_per_row
         all_seats = set(range(1, total_seats + 1))
         
-        # Get booked seats using pandas
+        # Get booked seats using pandas, plus seats other passengers are holding
         booked_seats = self.get_booked_seats(flight_id)
+        held_seats = self.data_manager.seat_holds.held_seats(flight_id, exclude_holder=holder)
         
         # Calculate available seats
-        available_seats = sorted(all_seats - booked_seats)
+        available_seats = sorted(all_seats - booked_seats - held_seats)
         
         # Check if flight is full
         if len(available_seats) == 0:
@@ -139,7 +147,7 @@ class BookingSystem:
         return available_seats, seats_per_row
 
     def display_seat_map(self, flight_id):
-        """Display a visual seat map showing available and booked seats"""
+        """Display a visual seat map showing available, held and booked seats"""
         available_seats, seats_per_row, message = self.get_available_seats(flight_id)
         
         if seats_per_row is None:
@@ -148,33 +156,19 @@ class BookingSystem:
         
         flight = self.data_manager.get_flight_by_id(flight_id)
         aircraft = self.data_manager.get_aircraft_by_id(flight['AeroplaneNumber'])
-        rows = int(aircraft['Rows'])
-        total_seats = rows * seats_per_row
         
-        print(f"\n{'='*50}")
-        print(f"SEAT MAP - Flight {flight_id}")
-        print(f"{flight['DepartureCity']} → {flight['ArrivalCity']}")
-        print(f"{'='*50}")
-        
-        # Create header with column letters
-        header = "Row  " + "  ".join([chr(ord('A') + i) for i in range(seats_per_row)])
-        print(f"\n{header}")
-        print("-" * len(header))
-        
-        # Display each row
-        for row in range(1, rows + 1):
-            row_display = f"{row:3}  "
-            for seat_pos in range(seats_per_row):
-                seat_number = (row - 1) * seats_per_row + seat_pos + 1
-                if seat_number in available_seats:
-                    row_display += "◯  "  # Available seat
-                else:
-                    row_display += "●  "  # Booked seat
-            print(row_display)
-        
-        print(f"\n◯ = Available  ● = Booked")
-        print(f"{'='*50}\n")
+        # One occupancy array for the whole flight, rendered a row at a time
+        grid = occupancy_grid(
+            int(aircraft['Rows']),
+            seats_per_row,
+            self.get_booked_seats(flight_id),
+            self.data_manager.seat_holds.held_seats(flight_id)
+        )
+        print()
+        print(render_seat_map(flight, grid))
+        print()
 
+    @timed("BookingSystem.book_seat")
     def book_seat(self, flight_id, passenger_id, seat_label):
         """Book a specific seat for a passenger on a flight using seat label (e.g., 1A, 12F)"""
         
@@ -190,8 +184,8 @@ class BookingSystem:
             return False, message
         print(message)
         
-        # Get available seats
-        available_seats, seats_per_row, message = self.get_available_seats(flight_id)
+        # Get available seats (including any seat this passenger is holding)
+        available_seats, seats_per_row, message = self.get_available_seats(flight_id, holder=passenger_id)
         if available_seats is None:
             return False, message
         
@@ -214,14 +208,9 @@ class BookingSystem:
             'Status': 'Booked'
         }])
         
-        # Append to bookings DataFrame using pandas concat
-        self.data_manager.bookings = pd.concat(
-            [self.data_manager.bookings, new_booking],
-            ignore_index=True
-        )
-        
-        # Update the booking index for fast lookups
-        self.data_manager.booking_index[self.next_booking_id] = new_booking.to_dict('records')[0]
+        # Append to bookings and update the indexes and per-flight counters
+        self.data_manager.add_booking(new_booking.to_dict('records')[0])
+        self.data_manager.seat_holds.release(flight_id, seat_number, passenger_id)
         
         self.next_booking_id += 1
         
@@ -240,6 +229,196 @@ Status: Booked
         
         return True, success_message
 
+    def hold_seat(self, flight_id, passenger_id, seat_label):
+        """Hold a seat for a passenger while they confirm the booking"""
+        available_seats, seats_per_row, message = self.get_available_seats(flight_id, holder=passenger_id)
+        if available_seats is None:
+            return False, message
+        
+        seat_number = self.seat_label_to_number(seat_label, seats_per_row)
+        if seat_number is None:
+            return False, f"Error: Invalid seat label '{seat_label}'. Please use format like 1A, 12F, etc."
+        if seat_number not in available_seats:
+            return False, f"Error: Seat {seat_label} is not available. Please choose from available seats."
+        
+        holds = self.data_manager.seat_holds
+        if holds.hold(flight_id, seat_number, passenger_id) is None:
+            return False, f"Error: Seat {seat_label} has just been taken by another booking."
+        return True, f"Seat {seat_label} is held for you for {holds.ttl:.0f} seconds."
+
+    def release_seat(self, flight_id, passenger_id, seat_label):
+        """Release a seat this passenger was holding"""
+        _, seats_per_row, _ = self.get_available_seats(flight_id, holder=passenger_id)
+        seat_number = self.seat_label_to_number(seat_label, seats_per_row) if seats_per_row else None
+        if seat_number is not None:
+            self.data_manager.seat_holds.release(flight_id, seat_number, passenger_id)
+
+    def get_seat_assigner(self, flight_id):
+        """Build a seat assigner for a flight from its aircraft layout and booked or held seats"""
+        flight = self.data_manager.get_flight_by_id(flight_id)
+        if flight is None:
+            return None, f"Error: Flight {flight_id} not found."
+        
+        aircraft = self.data_manager.get_aircraft_by_id(flight['AeroplaneNumber'])
+        if aircraft is None:
+            return None, f"Error: Aircraft {flight['AeroplaneNumber']} configuration not found."
+        
+        assigner = SeatAssigner(
+            int(aircraft['Rows']),
+            int(aircraft['SeatsInARow']),
+            self.get_booked_seats(flight_id) | self.data_manager.seat_holds.held_seats(flight_id)
+        )
+        return assigner, None
+
+    @timed("BookingSystem.book_group")
+    def book_group(self, flight_id, passenger_ids, preference=None, keep_together=True):
+        """
+        Automatically assign and book seats for one or more passengers on a flight.
+        Seats are filled front to back; groups sit in adjacent seats where possible.
+        Returns (success, list of (booking_id, passenger_id, seat_label) or error message).
+        """
+        valid, message = self.validate_flight(flight_id)
+        if not valid:
+            return False, message
+        
+        for passenger_id in passenger_ids:
+            valid, message = self.validate_passenger(passenger_id)
+            if not valid:
+                return False, message
+        
+        assigner, message = self.get_seat_assigner(flight_id)
+        if assigner is None:
+            return False, message
+        
+        try:
+            seats = assigner.assign(len(passenger_ids), preference, keep_together)
+        except ValueError as e:
+            return False, f"Error: {e}"
+        if seats is None:
+            return False, f"Error: Flight {flight_id} does not have {len(passenger_ids)} free seats."
+        
+        seats_per_row = assigner.seat_map.seats_per_row
+        new_bookings = self._new_bookings(flight_id, passenger_ids, seats)
+        self.data_manager.add_bookings(new_bookings)
+        
+        booked = [
+            (b['BookingID'], b['PassengerID'], self.seat_number_to_label(b['SeatNumber'], seats_per_row))
+            for b in new_bookings
+        ]
+        return True, booked
+
+    def _new_bookings(self, flight_id, passenger_ids, seats):
+        """Build booking rows with consecutive booking IDs"""
+        # Other components (e.g. the waitlist) may have added bookings since this instance was created
+        self.next_booking_id = max(self.next_booking_id, self.get_next_booking_id())
+        new_bookings = []
+        for passenger_id, seat_number in zip(passenger_ids, seats):
+            new_bookings.append({
+                'BookingID': self.next_booking_id,
+                'FlightID': int(flight_id),
+                'PassengerID': int(passenger_id),
+                'SeatNumber': int(seat_number),
+                'Status': 'Booked'
+            })
+            self.next_booking_id += 1
+        return new_bookings
+
+    def book_seat_number(self, flight_id, passenger_id, seat_number=None):
+        """
+        Book a given seat number (or, if it is not free, the front-most free seat) without prompting.
+        Returns (True, booking dict) or (False, error message).
+        """
+        assigner, message = self.get_seat_assigner(flight_id)
+        if assigner is None:
+            return False, message
+        
+        if seat_number is not None and assigner.seat_map.is_free(int(seat_number)):
+            seats = [int(seat_number)]
+        else:
+            seats = assigner.assign(1)
+            if seats is None:
+                return False, f"Error: Flight {flight_id} is fully booked."
+        
+        booking = self._new_bookings(flight_id, [passenger_id], seats)[0]
+        self.data_manager.add_booking(booking)
+        return True, booking
+
+    def find_alternative_flights(self, flight):
+        """Scheduled flights on the same route that have not departed yet, earliest first"""
+        flights = self.data_manager.flights
+        mask = (
+            (flights['DepartureCity'] == flight['DepartureCity'])
+            & (flights['ArrivalCity'] == flight['ArrivalCity'])
+            & (flights['Status'] == 'Scheduled')
+            & (flights['DateTime'] > pd.Timestamp.now())
+            & (flights['FlightID'] != flight['FlightID'])
+        )
+        return flights[mask].sort_values('DateTime', kind='stable')['FlightID'].tolist()
+
+    @timed("BookingSystem.reaccommodate")
+    def reaccommodate(self, flight_id, cancelled_bookings):
+        """
+        Rebook passengers from a cancelled flight onto the earliest alternative flights on the same route.
+        Each alternative is filled from its free-seat map before moving on to the next, and every
+        flight's new bookings are added in one batch.
+        Returns (list of (old booking_id, new booking_id, passenger_id, flight_id, seat_label),
+                 list of passenger IDs that could not be placed).
+        """
+        flight = self.data_manager.get_flight_by_id(flight_id)
+        # Keep passengers in their original seating order so neighbours stay close together
+        pending = cancelled_bookings.sort_values('SeatNumber')[['BookingID', 'PassengerID']].values.tolist()
+        rebooked = []
+        
+        if flight is None or not pending:
+            return rebooked, [passenger_id for _, passenger_id in pending]
+        
+        for alternative_id in self.find_alternative_flights(flight):
+            if not pending:
+                break
+            assigner, _ = self.get_seat_assigner(alternative_id)
+            if assigner is None:
+                continue
+            free = assigner.seat_map.free_count()
+            if free == 0:
+                continue
+            
+            moving, pending = pending[:free], pending[free:]
+            seats = assigner.assign(len(moving), keep_together=False)
+            new_bookings = self._new_bookings(alternative_id, [pid for _, pid in moving], seats)
+            self.data_manager.add_bookings(new_bookings)
+            
+            seats_per_row = assigner.seat_map.seats_per_row
+            for (old_booking_id, _), booking in zip(moving, new_bookings):
+                rebooked.append((
+                    int(old_booking_id), booking['BookingID'], booking['PassengerID'], alternative_id,
+                    self.seat_number_to_label(booking['SeatNumber'], seats_per_row)
+                ))
+        
+        return rebooked, [int(passenger_id) for _, passenger_id in pending]
+
+    def reaccommodate_all(self, cancelled_bookings):
+        """
+        Reaccommodate bookings cancelled across many flights (e.g. by a batch or a schedule import).
+        Returns (number rebooked, number that could not be placed).
+        """
+        rebooked, stranded = 0, 0
+        if cancelled_bookings is None or cancelled_bookings.empty:
+            return rebooked, stranded
+        for flight_id, flight_bookings in cancelled_bookings.groupby('FlightID', observed=True):
+            moved, left = self.reaccommodate(int(flight_id), flight_bookings)
+            rebooked += len(moved)
+            stranded += len(left)
+        return rebooked, stranded
+
+    def auto_book_seat(self, flight_id, passenger_id, preference=None):
+        """Book the best available seat for a single passenger (window/aisle/middle preference)"""
+        success, result = self.book_group(flight_id, [passenger_id], preference)
+        if not success:
+            return False, result
+        
+        booking_id, _, seat_label = result[0]
+        return True, f"\nBooking successful!\nBooking ID: {booking_id}\nSeat: {seat_label}\nStatus: Booked"
+
     def save_bookings(self):
         """Save all bookings back to CSV file using pandas"""
         self.data_manager.save_data()
@@ -272,6 +451,19 @@ Status: Booked
             # Get passenger ID
             passenger_id = int(input("\nEnter Your Passenger ID: "))
             
+            # Fully booked flights can only be waitlisted
+            if self.data_manager.is_flight_full(flight_id):
+                print(f"\nFlight {flight_id} is fully booked.")
+                join = input("Join the waitlist for this flight? (yes/no): ").lower()
+                if join == 'yes':
+                    valid, message = self.validate_passenger(passenger_id)
+                    if valid:
+                        success, message = self.data_manager.waitlist.join(flight_id, passenger_id)
+                        if success:
+                            self.data_manager.waitlist.save()
+                    print(message)
+                return
+            
             # Ask if user wants to see seat map
             show_map = input("\nShow seat map? (yes/no): ").lower()
             if show_map == 'yes':
@@ -282,11 +474,25 @@ Status: Booked
                 if available_seats is None:
                     return
             
-            # Get seat selection
-            seat_label = input("\nEnter desired seat (e.g., 1A, 12F): ").upper()
+            # Get seat selection (blank for automatic assignment)
+            seat_label = input("\nEnter desired seat (e.g., 1A, 12F) or press Enter to auto-assign: ").strip().upper()
             
             # Attempt booking
-            success, message = self.book_seat(flight_id, passenger_id, seat_label)
+            if seat_label:
+                # Hold the seat so nobody else can take it while the booking is confirmed
+                success, message = self.hold_seat(flight_id, passenger_id, seat_label)
+                print(message)
+                if not success:
+                    return
+                confirm = input("Confirm booking? (yes/no): ").lower()
+                if confirm != 'yes':
+                    self.release_seat(flight_id, passenger_id, seat_label)
+                    print("Booking cancelled; seat released.")
+                    return
+                success, message = self.book_seat(flight_id, passenger_id, seat_label)
+            else:
+                preference = input("Seat preference (window/aisle/middle, or Enter for none): ").strip().lower()
+                success, message = self.auto_book_seat(flight_id, passenger_id, preference or None)
             print(message)
             
             if success:
@@ -0,0 +1,203 @@
+"""
+Change feed of data mutations.
+Every AirportData mutation event is given the next sequence number and passed to in-process
+subscribers. Once the change is stored it is appended to Changes.jsonl as one JSON object per line:
+    {"Seq": 42, "Time": "2026-10-18 09:15:02", "Event": "booking_status", "Data": {...}}
+With CSV storage that is when save_data writes the tables (changes never saved are never
+recorded); storage that writes each row as it changes (SQLite) has its changes recorded straight away.
+Sequence numbers carry on across runs, so downstream consumers only need to remember the
+last one they handled. The file is ordered by Seq, so reading from a sequence number
+bisects to the right offset instead of scanning from the start.
+
+Tail the feed from the command line with:
+    python changefeed.py --since 1200 --follow
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def _plain(value):
+    """Convert an event payload to JSON-safe values (NaN/NaT become null)"""
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (np.ndarray, pd.Index)):
+        return value.tolist()
+    if isinstance(value, (list, tuple, set)):
+        return [_plain(item) for item in value]
+    # NaN and NaT are the only values not equal to themselves
+    if value != value:
+        return None
+    return value
+
+
+def _json_default(value):
+    """Encode the numpy and pandas scalars json does not know about (Timestamps as 'YYYY-MM-DD HH:MM:SS')"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _first_line_from(f, offset):
+    """Seek to the first line starting at or after offset; returns that line (b'' at EOF)"""
+    if offset == 0:
+        f.seek(0)
+    else:
+        f.seek(offset - 1)
+        f.readline()
+    start = f.tell()
+    line = f.readline()
+    f.seek(start)
+    return line
+
+
+def _seek_since(f, since):
+    """Position a binary file handle at the first change with Seq > since"""
+    f.seek(0, os.SEEK_END)
+    lo, hi = 0, f.tell()
+    while lo < hi:
+        mid = (lo + hi) // 2
+        line = _first_line_from(f, mid)
+        if not line.strip() or json.loads(line)['Seq'] > since:
+            hi = mid
+        else:
+            lo = mid + 1
+    _first_line_from(f, lo)
+
+
+def read_changes(path, since=0, events=None):
+    """Yield the changes recorded in a feed file after sequence number `since`"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        _seek_since(f, since)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # A line still being written
+                break
+            change = json.loads(line)
+            if events is None or change['Event'] in events:
+                yield change
+
+
+class ChangeFeed:
+    """Sequenced record of every mutation, with subscribers and an append-only JSONL file"""
+
+    def __init__(self, airport_data, path):
+        self.data_manager = airport_data
+        self.path = path
+        self.last_seq = self._last_recorded_seq()
+        # callback -> set of event names it wants (None for all)
+        self._subscribers = {}
+        # Changes made but not stored yet, appended to the file by persist()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", newline="\n")
+
+        # Registered first so changes are sequenced in the order they happen, ahead of any
+        # follow-on changes other listeners make in response
+        self.data_manager.add_listener(self._on_change, first=True)
+
+    def _last_recorded_seq(self):
+        """Seq of the last complete line in the file (0 for a new feed)"""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            block = 4096
+            while True:
+                start = max(end - block, 0)
+                f.seek(start)
+                lines = [line for line in f.read(end - start).split(b"\n") if line.strip()]
+                complete = lines[1:] if start > 0 else lines
+                if complete or start == 0:
+                    return json.loads(complete[-1])['Seq'] if complete else 0
+                block *= 2
+
+    def _on_change(self, event, payload):
+        with self._lock:
+            self.last_seq += 1
+            change = {
+                'Seq': self.last_seq,
+                'Time': time.strftime("%Y-%m-%d %H:%M:%S"),
+                'Event': event,
+                'Data': _plain(payload),
+            }
+            self._pending.append(change)
+            if self.data_manager.storage.writes_rows:
+                self._write_pending()
+            subscribers = list(self._subscribers.items())
+        for callback, events in subscribers:
+            if events is None or event in events:
+                callback(change)
+
+    def _write_pending(self):
+        self._file.writelines(json.dumps(change, default=_json_default) + "\n" for change in self._pending)
+        self._file.flush()
+        self._pending.clear()
+
+    def persist(self):
+        """Append the changes made since the last save to the feed file (called by save_data)"""
+        with self._lock:
+            self._write_pending()
+
+    # ==================== CONSUMERS ====================
+
+    def subscribe(self, callback, events=None, since=None):
+        """
+        Call callback(change) for every new change (optionally only the named events).
+        With `since`, changes already recorded after that Seq are replayed to it first.
+        """
+        events = set(events) if events is not None else None
+        with self.data_manager.lock:
+            if since is not None:
+                for change in self.read(since, events):
+                    callback(change)
+            with self._lock:
+                self._subscribers[callback] = events
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers.pop(callback, None)
+
+    def read(self, since=0, events=None):
+        """Changes after Seq `since`: those in the feed file, then any made since the last save"""
+        with self._lock:
+            self._file.flush()
+            pending = [change for change in self._pending
+                       if change['Seq'] > since and (events is None or change['Event'] in events)]
+        yield from read_changes(self.path, since, events)
+        yield from pending
+
+    def close(self):
+        self.data_manager.remove_listener(self._on_change)
+        self._file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the airport data change feed")
+    parser.add_argument("--path", default="./data/Changes.jsonl", help="Change feed file")
+    parser.add_argument("--since", type=int, default=0, help="Only changes after this sequence number")
+    parser.add_argument("--follow", action="store_true", help="Keep waiting for new changes")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls with --follow")
+    args = parser.parse_args()
+
+    since = args.since
+    while True:
+        for change in read_changes(args.path, since):
+            print(json.dumps(change), flush=True)
+            since = change['Seq']
+        if not args.follow:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Check-in and boarding.
+Bookings move Booked -> Checked-in -> Boarded. A booking is found by BookingID through the
+booking index, or by (FlightID, PassengerID) through a hash map of active bookings kept up
+to date from mutation events, so both lookups are O(1). Whole flights are checked in with
+one vectorized status update. Boarding progress is read straight from the per-flight
+status counters, which AirportData already maintains incrementally.
+"""
+
+import pandas as pd
+
+from utils.clear_screen import clear_screen
+
+# Check-in opens this many hours before departure and closes at departure
+CHECK_IN_OPENS_HOURS = 48
+
+
+class CheckInDesk:
+    """Check-in and boarding for bookings, with live per-flight progress"""
+
+    def __init__(self, airport_data):
+        self.data_manager = airport_data
+        # (FlightID, PassengerID) -> BookingID for every booking that is not cancelled
+        bookings = airport_data.bookings
+        active = bookings[bookings['Status'] != 'Cancelled']
+        self._by_passenger = dict(zip(
+            zip(active['FlightID'].tolist(), active['PassengerID'].tolist()),
+            active['BookingID'].tolist()
+        ))
+        self.data_manager.add_listener(self._on_change)
+
+    def _on_change(self, event, payload):
+        if event == 'booking_updated' and payload['Column'] in ('FlightID', 'PassengerID'):
+            # Moved to another flight or passenger: drop the old key, then index the new one
+            old = {**payload, payload['Column']: payload['OldValue']}
+            old_key = (int(old['FlightID']), int(old['PassengerID']))
+            if self._by_passenger.get(old_key) == int(payload['BookingID']):
+                del self._by_passenger[old_key]
+            event = 'booking_added'
+        elif event == 'booking_updated' and payload['Column'] == 'Status':
+            event = 'booking_status'
+        if event not in ('booking_added', 'booking_status', 'booking_deleted', 'booking_archived'):
+            return
+        key = (int(payload['FlightID']), int(payload['PassengerID']))
+        booking_id = int(payload['BookingID'])
+        if event in ('booking_added', 'booking_status') and payload['Status'] != 'Cancelled':
+            self._by_passenger[key] = booking_id
+        elif self._by_passenger.get(key) == booking_id:
+            del self._by_passenger[key]
+
+    # ==================== LOOKUPS ====================
+
+    def find_booking(self, flight_id, passenger_id):
+        """Active booking for a passenger on a flight, or None"""
+        booking_id = self._by_passenger.get((int(flight_id), int(passenger_id)))
+        return self.data_manager.get_booking_by_id(booking_id) if booking_id is not None else None
+
+    def _check_window(self, flight, now):
+        """None if the flight is open for check-in at `now`, else the reason it is not"""
+        if flight['Status'] != 'Scheduled':
+            return f"Flight {flight['FlightID']} is {str(flight['Status']).lower()}."
+        departure = pd.Timestamp(flight['DateTime'])
+        if now >= departure:
+            return f"Check-in for flight {flight['FlightID']} has closed."
+        if now < departure - pd.Timedelta(hours=CHECK_IN_OPENS_HOURS):
+            opens = departure - pd.Timedelta(hours=CHECK_IN_OPENS_HOURS)
+            return f"Check-in for flight {flight['FlightID']} opens at {opens:%Y-%m-%d %H:%M}."
+        return None
+
+    # ==================== CHECK-IN ====================
+
+    def check_in(self, booking_id, now=None):
+        """Check in one booking; returns (success, message)"""
+        booking = self.data_manager.get_booking_by_id(int(booking_id))
+        if booking is None:
+            return False, f"Booking {booking_id} not found."
+        if booking['Status'] != 'Booked':
+            return False, f"Booking {booking_id} cannot be checked in (status: {booking['Status']})."
+        flight = self.data_manager.get_flight_by_id(int(booking['FlightID']))
+        problem = self._check_window(flight, pd.Timestamp.now() if now is None else pd.Timestamp(now))
+        if problem:
+            return False, problem
+        self.data_manager.set_booking_status(int(booking_id), 'Checked-in')
+        return True, f"Booking {booking_id} checked in (flight {booking['FlightID']}, seat {booking['SeatNumber']})."
+
+    def check_in_passenger(self, flight_id, passenger_id, now=None):
+        """Check in a passenger by flight; returns (success, message)"""
+        booking = self.find_booking(flight_id, passenger_id)
+        if booking is None:
+            return False, f"Passenger {passenger_id} has no booking on flight {flight_id}."
+        return self.check_in(booking['BookingID'], now)
+
+    def check_in_flight(self, flight_id, now=None):
+        """Check in every Booked passenger on a flight with one status update; returns (success, message)"""
+        flight_id = int(flight_id)
+        flight = self.data_manager.get_flight_by_id(flight_id)
+        if flight is None:
+            return False, f"Flight {flight_id} not found."
+        problem = self._check_window(flight, pd.Timestamp.now() if now is None else pd.Timestamp(now))
+        if problem:
+            return False, problem
+        with self.data_manager.lock:
+            bookings = self.data_manager.get_bookings_for_flight(flight_id)
+            booking_ids = bookings.loc[bookings['Status'] == 'Booked', 'BookingID'].tolist()
+            self.data_manager.set_bookings_status(booking_ids, 'Checked-in')
+        return True, f"Checked in {len(booking_ids)} passenger(s) on flight {flight_id}."
+
+    # ==================== BOARDING ====================
+
+    def board(self, booking_id):
+        """Board a checked-in booking; returns (success, message)"""
+        booking = self.data_manager.get_booking_by_id(int(booking_id))
+        if booking is None:
+            return False, f"Booking {booking_id} not found."
+        if booking['Status'] != 'Checked-in':
+            return False, f"Booking {booking_id} cannot board (status: {booking['Status']})."
+        flight = self.data_manager.get_flight_by_id(int(booking['FlightID']))
+        if flight is None or flight['Status'] != 'Scheduled':
+            return False, f"Flight {booking['FlightID']} is not boarding."
+        self.data_manager.set_booking_status(int(booking_id), 'Boarded')
+        return True, f"Booking {booking_id} boarded (seat {booking['SeatNumber']})."
+
+    def board_passenger(self, flight_id, passenger_id):
+        """Board a passenger by flight; returns (success, message)"""
+        booking = self.find_booking(flight_id, passenger_id)
+        if booking is None:
+            return False, f"Passenger {passenger_id} has no booking on flight {flight_id}."
+        return self.board(booking['BookingID'])
+
+    def boarding_progress(self, flight_id):
+        """Live counts for a flight in O(1): booked, checked in and boarded passengers"""
+        counts = self.data_manager.flight_counters.get(int(flight_id), {})
+        booked = counts.get('Booked', 0)
+        checked_in = counts.get('Checked-in', 0)
+        boarded = counts.get('Boarded', 0)
+        total = booked + checked_in + boarded
+        return {
+            'Passengers': total,
+            'Booked': booked,
+            'Checked-in': checked_in,
+            'Boarded': boarded,
+            'CheckedInPct': round(100 * (checked_in + boarded) / total, 1) if total else 0.0,
+            'BoardedPct': round(100 * boarded / total, 1) if total else 0.0,
+        }
+
+
+def check_in_menu(airport_data):
+    """Interactive check-in and boarding desk"""
+    desk = airport_data.check_in
+    changed = False
+    while True:
+        clear_screen()
+        print("=" * 50)
+        print("CHECK-IN & BOARDING")
+        print("=" * 50)
+        print("  1. Check In by Booking ID")
+        print("  2. Check In by Flight and Passenger")
+        print("  3. Check In Whole Flight")
+        print("  4. Board by Booking ID")
+        print("  5. Board by Flight and Passenger")
+        print("  6. Boarding Progress")
+        print("  7. Return to Main Menu")
+
+        choice = input("\nEnter choice (1-7): ").strip()
+        if choice == '7':
+            if changed:
+                save = input("\nSave check-in changes to file? (yes/no): ").lower()
+                if save == 'yes':
+                    airport_data.save_data()
+                    print("All changes saved successfully.")
+            break
+
+        success = False
+        try:
+            if choice in ('1', '4'):
+                booking_id = int(input("Enter Booking ID: ").strip())
+                success, message = (desk.check_in if choice == '1' else desk.board)(booking_id)
+            elif choice in ('2', '5'):
+                flight_id = int(input("Enter Flight ID: ").strip())
+                passenger_id = int(input("Enter Passenger ID: ").strip())
+                action = desk.check_in_passenger if choice == '2' else desk.board_passenger
+                success, message = action(flight_id, passenger_id)
+            elif choice == '3':
+                flight_id = int(input("Enter Flight ID: ").strip())
+                success, message = desk.check_in_flight(flight_id)
+            elif choice == '6':
+                flight_id = int(input("Enter Flight ID: ").strip())
+                progress = desk.boarding_progress(flight_id)
+                message = (f"Flight {flight_id}: {progress['Passengers']} passenger(s) | "
+                           f"Booked {progress['Booked']} | Checked-in {progress['Checked-in']} | "
+                           f"Boarded {progress['Boarded']} ({progress['BoardedPct']}% boarded)")
+            else:
+                message = "Invalid choice. Please select 1-7."
+        except ValueError:
+            message = "Invalid input. Please enter numeric IDs."
+
+        changed = changed or (success and choice != '6')
+        print(message)
+        input("\nPress Enter to continue...")
@@ -0,0 +1,183 @@
+"""
+Precomputed fare calendar.
+Holds the cheapest current fare and the seats remaining for every
+(DepartureCity, ArrivalCity, Date), built once with a groupby over the flights table
+and then kept up to date cell by cell from AirportData mutation events.
+Events only mark the cells they touch as stale; a stale cell is recomputed the next time
+it is read, so bulk changes (imports, repricing) cost one refresh per cell rather than
+one per event. A month view for a route is a handful of dictionary lookups.
+"""
+
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+# Booking events that change a flight's seats remaining (and so whether its fare is on sale)
+BOOKING_EVENTS = ('booking_added', 'booking_status', 'booking_deleted', 'booking_archived')
+
+
+class FareCalendar:
+    """Cheapest fare and seats remaining per route per day"""
+
+    @timed("FareCalendar.build")
+    def __init__(self, airport_data):
+        self.data_manager = airport_data
+        # (departure, arrival) -> {date: {'Fare', 'FlightID', 'SeatsRemaining'}}
+        self._routes = {}
+        # (departure, arrival, date) -> set of FlightIDs departing that day
+        self._cell_flights = {}
+        # (departure, arrival) -> dates whose cells are stale
+        self._stale = {}
+        self._build()
+        self.data_manager.add_listener(self._on_change)
+
+    def _build(self):
+        flights = self.data_manager.flights
+        keys = ['DepartureCity', 'ArrivalCity', 'Date']
+        for key, rows in flights.groupby(keys, observed=True).indices.items():
+            self._cell_flights[self._key(*key)] = set(flights['FlightID'].to_numpy()[rows].tolist())
+
+        scheduled = flights[flights['Status'] == 'Scheduled']
+        remaining = (self.data_manager.get_flight_capacities(scheduled)
+                     - self.data_manager.get_active_booking_counts(scheduled['FlightID'].to_numpy()))
+        cells = pd.DataFrame({
+            'DepartureCity': scheduled['DepartureCity'].astype(object).to_numpy(),
+            'ArrivalCity': scheduled['ArrivalCity'].astype(object).to_numpy(),
+            'Date': scheduled['Date'].to_numpy(),
+            'FlightID': scheduled['FlightID'].to_numpy(),
+            'SeatsRemaining': np.maximum(remaining, 0),
+            # Full flights cannot be bought, so they do not count towards the cheapest fare
+            'Fare': np.where(remaining > 0, self.data_manager.pricing.get_prices(scheduled), np.nan),
+        })
+        seats = cells.groupby(keys)['SeatsRemaining'].sum()
+        cheapest = cells.dropna(subset=['Fare']).sort_values('Fare', kind='stable').drop_duplicates(keys).set_index(keys)
+
+        for (departure, arrival, date), seats_remaining in seats.items():
+            key = self._key(departure, arrival, date)
+            summary = {'Fare': None, 'FlightID': None, 'SeatsRemaining': int(seats_remaining)}
+            if key in cheapest.index:
+                best = cheapest.loc[key]
+                summary['Fare'] = float(best['Fare'])
+                summary['FlightID'] = int(best['FlightID'])
+            self._routes.setdefault(key[:2], {})[key[2]] = summary
+
+    @staticmethod
+    def _key(departure, arrival, date):
+        return str(departure), str(arrival), pd.Timestamp(date).normalize()
+
+    def _flight_key(self, flight):
+        return self._key(flight['DepartureCity'], flight['ArrivalCity'], flight['DateTime'])
+
+    # ==================== INCREMENTAL UPDATES ====================
+
+    def _refresh_cell(self, key):
+        """Recompute one (route, day) cell from the few flights departing that day"""
+        departure_days = self._routes.setdefault(key[:2], {})
+        best_fare, best_flight, seats, scheduled = None, None, 0, False
+        for flight_id in self._cell_flights.get(key, ()):
+            flight = self.data_manager.get_flight_by_id(flight_id)
+            if flight is None or flight['Status'] != 'Scheduled':
+                continue
+            scheduled = True
+            remaining = self.data_manager.get_remaining_seats(flight_id) or 0
+            seats += remaining
+            if remaining > 0:
+                fare = self.data_manager.pricing.get_price(flight_id)
+                # Ties go to the lowest FlightID, as in the full build
+                if best_fare is None or fare < best_fare or (fare == best_fare and flight_id < best_flight):
+                    best_fare, best_flight = fare, int(flight_id)
+
+        if scheduled:
+            departure_days[key[2]] = {'Fare': best_fare, 'FlightID': best_flight, 'SeatsRemaining': seats}
+        else:
+            departure_days.pop(key[2], None)
+
+    def _mark_stale(self, key):
+        self._stale.setdefault(key[:2], set()).add(key[2])
+
+    def _mark_flights(self, flight_ids):
+        for flight_id in flight_ids:
+            flight = self.data_manager.get_flight_by_id(flight_id)
+            if flight is not None:
+                self._mark_stale(self._flight_key(flight))
+
+    def _route_days(self, departure, arrival):
+        """A route's day summaries, recomputing any stale cells first"""
+        route = (str(departure), str(arrival))
+        if route in self._stale:
+            with self.data_manager.lock:
+                for date in self._stale.pop(route, ()):
+                    self._refresh_cell(route + (date,))
+        return self._routes.get(route, {})
+
+    def _on_change(self, event, payload):
+        if event == 'flight_added':
+            key = self._flight_key(payload)
+            self._cell_flights.setdefault(key, set()).add(int(payload['FlightID']))
+            self._mark_stale(key)
+        elif event in ('flight_deleted', 'flight_archived'):
+            key = self._flight_key(payload)
+            self._cell_flights.get(key, set()).discard(int(payload['FlightID']))
+            self._mark_stale(key)
+        elif event == 'flight_updated' and payload['Column'] in ('DepartureCity', 'ArrivalCity', 'DateTime'):
+            # A flight moved to another route or day leaves its old cell for the new one
+            old_key = self._flight_key({**payload, payload['Column']: payload['OldValue']})
+            self._cell_flights.get(old_key, set()).discard(int(payload['FlightID']))
+            self._mark_stale(old_key)
+            key = self._flight_key(payload)
+            self._cell_flights.setdefault(key, set()).add(int(payload['FlightID']))
+            self._mark_stale(key)
+        elif event in ('flight_status', 'flight_updated'):
+            self._mark_flights([payload['FlightID']])
+        elif event in BOOKING_EVENTS:
+            self._mark_flights([payload['FlightID']])
+        elif event == 'fares_repriced':
+            self._mark_flights(payload['FlightIDs'])
+
+    # ==================== QUERIES ====================
+
+    def get_day(self, departure, arrival, date):
+        """Cheapest fare summary for one route and day, or None when nothing is scheduled"""
+        key = self._key(departure, arrival, date)
+        return self._route_days(*key[:2]).get(key[2])
+
+    def month_view(self, departure, arrival, year, month):
+        """List of (date, summary or None) for every day of a month on a route"""
+        route_days = self._route_days(departure, arrival)
+        days = calendar.monthrange(year, month)[1]
+        view = []
+        for day in range(1, days + 1):
+            date = pd.Timestamp(year=year, month=month, day=day)
+            view.append((date, route_days.get(date)))
+        return view
+
+    def cheapest_day(self, departure, arrival, year, month):
+        """The day with the lowest fare in a month, as (date, summary), or None"""
+        priced = [(date, summary) for date, summary in self.month_view(departure, arrival, year, month)
+                  if summary is not None and summary['Fare'] is not None]
+        if not priced:
+            return None
+        return min(priced, key=lambda item: item[1]['Fare'])
+
+    def render_month(self, departure, arrival, year, month):
+        """Text calendar of the cheapest fare per day (blank where nothing can be booked)"""
+        lines = [f"{departure} → {arrival}  {calendar.month_name[month]} {year}".center(63),
+                 "  ".join(f"{name:>7}" for name in calendar.day_abbr)]
+        view = dict(self.month_view(departure, arrival, year, month))
+        for week in calendar.monthcalendar(year, month):
+            days, fares = [], []
+            for day in week:
+                summary = view.get(pd.Timestamp(year=year, month=month, day=day)) if day else None
+                days.append(f"{day:>7}" if day else " " * 7)
+                if summary is not None and summary['Fare'] is not None:
+                    fares.append(f"€{summary['Fare']:>6.0f}")
+                elif summary is not None:
+                    fares.append(f"{'full':>7}")
+                else:
+                    fares.append(" " * 7)
+            lines.append("  ".join(days))
+            lines.append("  ".join(fares))
+        return "\n".join(lines)
@@ -0,0 +1,278 @@
+"""
+Hot reload of data files changed outside the process.
+Each loaded table's CSV is polled for a new size or mtime. When a file has only grown
+(the bytes just before the old end are unchanged), only the new complete lines are read
+and ingested. Any other change reads the file again and diffs it by ID against the file as
+last synced, so only the other program's changes are applied and unsaved rows here survive.
+Either way the changes go through the usual AirportData mutation methods, so the indexes,
+counters, caches and change feed are updated incrementally rather than rebuilt.
+Files rewritten by save_data are re-synced straight after the save and never re-ingested.
+"""
+
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+from schema import TABLES, apply_schema, concat_chunks
+from storage import CSVStorage
+from bookings import BookingSystem
+from Flight_Manager import ID_INDEXES
+from utils.instrumentation import timed
+
+# Tables are polled parents first, so rows appended to several files at once resolve in order
+WATCH_ORDER = ['aircraft', 'flights', 'passengers', 'bookings']
+
+# Bytes before the old end of a file that must be unchanged for growth to count as an append
+TAIL_BYTES = 1024
+
+
+class FileState:
+    """What is known about a watched file: its stat, how far it has been read and the bytes before that"""
+
+    def __init__(self, path):
+        stat = os.stat(path)
+        self.mtime = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.offset = stat.st_size
+        with open(path, "rb") as f:
+            self.header = f.readline()
+            self.tail = self._read_tail(f, self.offset)
+
+    @staticmethod
+    def _read_tail(f, offset):
+        start = max(offset - TAIL_BYTES, 0)
+        f.seek(start)
+        return f.read(offset - start)
+
+
+class DataFileWatcher:
+    """Polls the loaded tables' CSV files and ingests changes made by other programs"""
+
+    def __init__(self, airport_data):
+        self.data_manager = airport_data
+        self._states = {}
+        # Table -> the file's rows as last read or saved, the base the next rewrite is diffed against
+        self._snapshots = {}
+        self._stop = threading.Event()
+        self._thread = None
+        # Recent changes as (time, table, 'append' or 'reload', rows changed), newest last
+        self.history = []
+        self.counters = {'polls': 0, 'appended_rows': 0, 'reloads': 0, 'conflicts': 0, 'errors': 0}
+        self.last_error = None
+        with self.data_manager.lock:
+            for name in WATCH_ORDER:
+                path = self.paths.get(name)
+                if path and self.data_manager.is_loaded(name) and os.path.exists(path):
+                    self._watch(name, path)
+
+    @property
+    def paths(self):
+        """Table name -> CSV path (empty for storage that is not file per table)"""
+        storage = self.data_manager.storage
+        return storage.paths if isinstance(storage, CSVStorage) else {}
+
+    def _watch(self, name, path):
+        """Start watching a file from its current contents (read again, as the table may have unsaved changes)"""
+        self._states[name] = FileState(path)
+        self._snapshots[name] = self.data_manager.storage.load_table(name)
+
+    def sync(self):
+        """Record every loaded table as just saved: its file now holds exactly the in-memory rows"""
+        with self.data_manager.lock:
+            for name in WATCH_ORDER:
+                path = self.paths.get(name)
+                if path and self.data_manager.is_loaded(name) and os.path.exists(path):
+                    self._states[name] = FileState(path)
+                    self._snapshots[name] = getattr(self.data_manager, name).copy()
+
+    # ==================== POLLING ====================
+
+    @timed("DataFileWatcher.poll")
+    def poll(self):
+        """Check every watched file once; returns a list of (table, kind, rows changed)"""
+        changes = []
+        with self.data_manager.lock:
+            self.counters['polls'] += 1
+            for name in WATCH_ORDER:
+                path = self.paths.get(name)
+                if not path or not self.data_manager.is_loaded(name) or not os.path.exists(path):
+                    continue
+                state = self._states.get(name)
+                if state is None:
+                    # Loaded since the last poll: what is in the file now is the starting point
+                    self._watch(name, path)
+                    continue
+                stat = os.stat(path)
+                if stat.st_mtime_ns == state.mtime and stat.st_size == state.size:
+                    continue
+                try:
+                    if self._is_append(path, state, stat.st_size):
+                        change = (name, 'append', self._ingest_appended(name, path, state))
+                    else:
+                        change = (name, 'reload', self._reload(name, path))
+                except (ValueError, KeyError, pd.errors.ParserError) as e:
+                    # Skip what could not be read rather than retrying it on every poll
+                    self.counters['errors'] += 1
+                    self.last_error = f"{os.path.basename(path)}: {e}"
+                    self._states[name] = FileState(path)
+                    continue
+                changes.append(change)
+                self.history.append((time.strftime("%Y-%m-%d %H:%M:%S"),) + change)
+        del self.history[:-50]
+        return changes
+
+    def _is_append(self, path, state, size):
+        """True if the file only grew: same header and the same bytes just before the old end"""
+        # A rewrite that kept the size (e.g. one status for another of the same length) is not an append
+        if size <= state.offset:
+            return False
+        with open(path, "rb") as f:
+            return f.readline() == state.header and FileState._read_tail(f, state.offset) == state.tail
+
+    # ==================== APPENDS ====================
+
+    def _ingest_appended(self, name, path, state):
+        """Read the complete lines added since the last poll and add them as new rows"""
+        with open(path, "rb") as f:
+            f.seek(state.offset)
+            added = f.read()
+        # A line still being written is left for the next poll
+        complete = added[:added.rfind(b"\n") + 1]
+        rows = pd.DataFrame()
+        if complete.strip():
+            rows = apply_schema(name, pd.read_csv(io.BytesIO(state.header + complete)))
+
+        state.offset += len(complete)
+        with open(path, "rb") as f:
+            state.tail = FileState._read_tail(f, state.offset)
+        stat = os.stat(path)
+        state.mtime, state.size = stat.st_mtime_ns, stat.st_size
+        if rows.empty:
+            return 0
+
+        self._snapshots[name] = concat_chunks([self._snapshots[name], rows])
+        rows = self._without_conflicts(name, rows.drop_duplicates(TABLES[name][0], keep='last'))
+        self._add(name, rows)
+        self.counters['appended_rows'] += len(rows)
+        return len(rows)
+
+    def _without_conflicts(self, name, rows):
+        """
+        New rows from the file minus those whose ID is already taken in memory (a row added
+        here and not saved yet). Those are kept in Conflicts_<Table>.csv for review, as the
+        next save would otherwise overwrite them, and reported through last_error.
+        """
+        id_col = TABLES[name][0]
+        clash = rows[id_col].isin(list(getattr(self.data_manager, ID_INDEXES[name])))
+        if clash.any():
+            conflicts_path = os.path.join(self.data_manager.data_dir, f"Conflicts_{name.capitalize()}.csv")
+            conflicts = rows[clash].drop(columns=['Date'], errors='ignore')
+            conflicts.to_csv(conflicts_path, mode='a', header=not os.path.exists(conflicts_path), index=False)
+            self.counters['conflicts'] += len(conflicts)
+            self.last_error = (f"{len(conflicts)} {name} row(s) from another program reuse IDs of unsaved rows "
+                               f"({', '.join(map(str, conflicts[id_col].tolist()[:5]))}); "
+                               f"kept in {os.path.basename(conflicts_path)}")
+        return rows[~clash]
+
+    def _add(self, name, rows):
+        records = rows.drop(columns=['Date'], errors='ignore').to_dict('records')
+        if name == 'bookings':
+            self.data_manager.add_bookings(records)
+        else:
+            self.data_manager.add_rows(name, records)
+
+    # ==================== FULL RELOADS ====================
+
+    @timed("DataFileWatcher.reload")
+    def _reload(self, name, path):
+        """
+        Read a rewritten file and diff it by ID against the file as last synced, then apply
+        only what the other program changed: its new rows are added, rows it removed are
+        deleted and values it changed are updated. Rows added or edited here and not saved
+        yet are left alone, apart from values the other program changed as well.
+        """
+        id_col = TABLES[name][0]
+        new = self.data_manager.storage.load_table(name).drop_duplicates(id_col, keep='last')
+        old = self._snapshots[name].drop_duplicates(id_col, keep='last')
+        self._states[name] = FileState(path)
+        self._snapshots[name] = new
+        self.counters['reloads'] += 1
+
+        table = getattr(self.data_manager, name)
+        removed = table[id_col].isin(old.loc[~old[id_col].isin(new[id_col]), id_col])
+        added = self._without_conflicts(name, new[~new[id_col].isin(old[id_col])])
+
+        # Rows in both versions of the file that are still here
+        common = old.loc[old[id_col].isin(new[id_col]) & old[id_col].isin(table[id_col]), id_col]
+        before = old.set_index(id_col).loc[common]
+        after = new.set_index(id_col).loc[common]
+        columns = [col for col in TABLES[name][1] if col != id_col and col in before and col in after]
+        differs = {}
+        for col in columns:
+            old_values = before[col].astype(object)
+            new_values = after[col].astype(object)
+            mask = ~((old_values == new_values) | (old_values.isna() & new_values.isna()))
+            if mask.any():
+                differs[col] = new_values[mask]
+
+        changed = set(table.loc[removed, id_col].tolist())
+        if name == 'bookings':
+            self.data_manager.remove_bookings(removed)
+        elif name == 'flights':
+            self.data_manager.remove_flights(removed)
+        else:
+            self.data_manager.remove_rows(name, removed)
+
+        # Status changes go through the status methods; a flight cancelled by the other program
+        # is cancelled as cancel_entry does it, with its bookings and their passengers rebooked
+        status = differs.pop('Status', None)
+        for col, values in differs.items():
+            self.data_manager.update_column(name, col, dict(zip(values.index.tolist(), values.tolist())))
+        if status is not None:
+            set_status = (self.data_manager.set_bookings_status if name == 'bookings'
+                          else self.data_manager.set_flights_status)
+            for value, ids in status.groupby(status, observed=True).groups.items():
+                if name == 'flights' and value == 'Cancelled':
+                    self._cancel_flights(ids.tolist())
+                else:
+                    set_status(ids.tolist(), value)
+        self._add(name, added)
+
+        changed.update(added[id_col].tolist())
+        for values in list(differs.values()) + ([status] if status is not None else []):
+            changed.update(values.index.tolist())
+        return len(changed)
+
+    def _cancel_flights(self, flight_ids):
+        """Cancel flights with their active bookings and offer those passengers another flight"""
+        cancelled = [self.data_manager.cancel_flight(flight_id) for flight_id in flight_ids]
+        cancelled = [bookings for bookings in cancelled if not bookings.empty]
+        if cancelled:
+            BookingSystem(self.data_manager).reaccommodate_all(concat_chunks(cancelled))
+
+    # ==================== BACKGROUND TASK ====================
+
+    def stats(self):
+        """Counters for the instrumentation report"""
+        return {**self.counters, 'watched_files': len(self._states)}
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.poll()
+
+    def start(self, interval=2.0):
+        """Poll every `interval` seconds on a daemon thread (does nothing for non-CSV storage)"""
+        if not self.paths or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="data-file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,90 @@
+"""
+Time-ordered flight status scheduler.
+Keeps every Scheduled flight in a min-heap keyed on DateTime and marks flights
+Completed once their departure time has passed, which also locks their bookings.
+Runs as a catch-up pass at startup and then as a background task.
+"""
+
+import heapq
+import threading
+
+import pandas as pd
+
+from Flight_Manager import AirportData
+from utils.instrumentation import timed
+
+
+class FlightStatusScheduler:
+    """Moves Scheduled flights to Completed as their DateTime passes"""
+
+    def __init__(self, airport_data: AirportData):
+        self.data_manager = airport_data
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Heap of (departure time, flight_id), built in O(n) from the Scheduled flights
+        flights = self.data_manager.flights
+        scheduled = flights[flights['Status'] == 'Scheduled']
+        self._heap = list(zip(scheduled['DateTime'].tolist(), scheduled['FlightID'].tolist()))
+        heapq.heapify(self._heap)
+
+        # Flights added later are pushed onto the heap as they arrive
+        self.data_manager.add_listener(self._on_change)
+
+    def _on_change(self, event, payload):
+        if event == 'flight_added' and payload.get('Status') == 'Scheduled':
+            self.schedule(payload['FlightID'], payload['DateTime'])
+        elif event == 'flight_updated' and payload['Column'] == 'DateTime' and payload.get('Status') == 'Scheduled':
+            # The old heap entry no longer matches the flight and is skipped when it comes up
+            self.schedule(payload['FlightID'], payload['DateTime'])
+
+    def schedule(self, flight_id, departure):
+        """Track a Scheduled flight; O(log n)"""
+        with self.data_manager.lock:
+            heapq.heappush(self._heap, (pd.Timestamp(departure), int(flight_id)))
+
+    def next_departure(self):
+        """Earliest tracked departure, or None when nothing is scheduled"""
+        return self._heap[0][0] if self._heap else None
+
+    @timed("FlightStatusScheduler.catch_up")
+    def catch_up(self, now=None):
+        """
+        Complete every flight whose departure time has passed.
+        Each transition is a heap pop (O(log n)); the status changes are applied in one batch.
+        Returns the list of flight IDs that were completed.
+        """
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        due = []
+        with self.data_manager.lock:
+            while self._heap and self._heap[0][0] <= now:
+                departure, flight_id = heapq.heappop(self._heap)
+                flight = self.data_manager.get_flight_by_id(flight_id)
+                # Skip stale entries: deleted, cancelled or rescheduled flights
+                if flight is None or flight['Status'] != 'Scheduled' or pd.Timestamp(flight['DateTime']) != departure:
+                    continue
+                due.append(flight_id)
+
+            self.data_manager.set_flights_status(due, 'Completed')
+        return due
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            self.catch_up()
+            # Keep fares current as bookings come in and departures get closer
+            if self.data_manager.is_loaded('pricing'):
+                self.data_manager.pricing.reprice()
+
+    def start(self, interval=60):
+        """Run catch_up every `interval` seconds on a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="flight-status-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
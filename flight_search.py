@@ -4,6 +4,7 @@
 from Flight_Manager import AirportData
 from bookings import BookingSystem
 from utils.clear_screen import clear_screen
+from utils.instrumentation import timed
 
 from datetime import datetime
 import pandas as pd
@@ -11,38 +12,66 @@ import pandas as pd
 class FlightSearch:
     def __init__(self, airport_data: AirportData):
         self.airport_data = airport_data
+        # Shared by every FlightSearch on this AirportData, so repeated searches survive new instances
+        self.cache = airport_data.search_cache
+        self._build_index()
 
-        # Convert DateTime column to datetime objects
-        self.airport_data.flights['DateTime'] = pd.to_datetime(self.airport_data.flights['DateTime'])
-
-        # Create a new column for the date only (ignoring time)
-        self.airport_data.flights['Date'] = self.airport_data.flights['DateTime'].dt.date
+    @timed("FlightSearch.build_index")
+    def _build_index(self):
+        # Data version the index was built from; a later mutation means the copy is out of date
+        self.index_version = self.airport_data.data_version
 
+        # DateTime and the date-only Date column are already typed when the flights table loads
         self.search_df = self.airport_data.flights.copy()
         
         # Sort and index the COPY (not the original)
         self.search_df.sort_values(by=['DepartureCity', 'ArrivalCity', 'Date'], inplace=True)
         self.search_df.set_index(['DepartureCity', 'ArrivalCity', 'Date'], inplace=True)
 
+    @timed("FlightSearch.search")
     def search(self, departure_city, arrival_city, date):
         """
         Search for flights based on departure city, arrival city, and date.
+        Results are served from the LRU cache while the data has not changed.
         """
-        try:
-            # Convert the input date to a datetime.date object
-            date = datetime.strptime(date, "%Y-%m-%d").date()
+        # Normalize the query so equivalent searches share a cache entry
+        departure_city = departure_city.strip()
+        arrival_city = arrival_city.strip()
+        # Convert the input date to a midnight timestamp to match the Date column
+        date = pd.Timestamp(datetime.strptime(date.strip(), "%Y-%m-%d"))
+        key = (departure_city, arrival_city, date)
 
-            results = self.search_df.loc[(departure_city, arrival_city, date)]
+        # Fares come from the pricing engine, which may bump the data version when it first loads
+        pricing = self.airport_data.pricing
+        version = self.airport_data.data_version
+        cached = self.cache.get(key, version)
+        if cached is not None:
+            return [dict(flight) for flight in cached]
+
+        if self.index_version != version:
+            self._build_index()
+
+        try:
+            results = self.search_df.loc[key]
 
             # Ensure the result is always a DataFrame
             if isinstance(results, pd.Series):
                 results = pd.DataFrame([results])
 
-            # Convert the filtered DataFrame to a list of dictionaries
-            return results.reset_index().to_dict('records')
+            # Convert the filtered DataFrame to a list of dictionaries, with the current fares
+            results = results.reset_index()
+            results['CurrentPrice'] = pricing.get_prices(results)
+            results = results.to_dict('records')
         except KeyError:
             # No matching flights found
-            return []
+            results = []
+
+        self.cache.put(key, results, version)
+        return [dict(flight) for flight in results]
+
+    def cache_stats(self):
+        """Hit/miss/eviction counts of the shared search cache"""
+        return self.cache.stats()
 
     def flight_search(self):
         """
@@ -61,6 +90,8 @@ class FlightSearch:
                 print(f"  Date/Time: {flight['DateTime']}")
                 print(f"  Aircraft: {flight['AeroplaneNumber']}")
                 print(f"  Filght ID: {flight['FlightID']}")
+                print(f"  Seats Remaining: {self.airport_data.get_remaining_seats(flight['FlightID'])}")
+                print(f"  Price: €{flight['CurrentPrice']:.2f}")
                 print(f"  -----------------------")
 
 
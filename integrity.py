@@ -0,0 +1,124 @@
+"""
+Referential-integrity and consistency checks across the four tables.
+Every check is a vectorized isin/merge/duplicated/groupby over whole columns, so a full
+pass over millions of bookings takes well under a second.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+# Check name -> description shown in reports
+CHECKS = {
+    'duplicate_flight_ids': "Flights sharing a FlightID",
+    'duplicate_passenger_ids': "Passengers sharing a PassengerID",
+    'duplicate_booking_ids': "Bookings sharing a BookingID",
+    'duplicate_aircraft_ids': "Aircraft sharing an AircraftID",
+    'flights_missing_aircraft': "Flights whose AeroplaneNumber is not a known aircraft",
+    'capacity_mismatch': "Flights whose FlightCapacity disagrees with the aircraft's Rows x SeatsInARow",
+    'bookings_missing_flight': "Bookings that reference a missing flight",
+    'bookings_missing_passenger': "Bookings that reference a missing passenger",
+    'seat_out_of_range': "Bookings whose SeatNumber is outside the aircraft's seats",
+    'duplicate_seats': "Active bookings holding the same seat on a flight",
+    'overbooked_flights': "Flights with more active bookings than seats",
+    'active_bookings_on_cancelled_flights': "Active bookings on cancelled flights",
+}
+
+
+@timed("integrity.check_integrity")
+def check_integrity(airport_data, loaded_only=False):
+    """
+    Run every check and return {check name: DataFrame of offending rows}.
+    Only checks that found something are included, so an empty dict means the data is consistent.
+    With loaded_only, checks needing a table that has not been loaded yet are skipped
+    rather than loading it (used at startup, where tables are loaded lazily).
+    """
+    def available(*names):
+        return not loaded_only or all(airport_data.is_loaded(name) for name in names)
+
+    report = {}
+
+    def add(name, rows):
+        if len(rows):
+            report[name] = rows.reset_index(drop=True)
+
+    for name, id_col, check in (('flights', 'FlightID', 'duplicate_flight_ids'),
+                                ('passengers', 'PassengerID', 'duplicate_passenger_ids'),
+                                ('bookings', 'BookingID', 'duplicate_booking_ids'),
+                                ('aircraft', 'AircraftID', 'duplicate_aircraft_ids')):
+        if available(name):
+            table = getattr(airport_data, name)
+            add(check, table[table[id_col].duplicated(keep=False)])
+
+    if not available('flights'):
+        return report
+    flights = airport_data.flights
+
+    # Flights against aircraft
+    if available('aircraft'):
+        aircraft = airport_data.aircraft
+        aircraft_seats = pd.Series((aircraft['Rows'].astype('int32') * aircraft['SeatsInARow']).to_numpy(),
+                                   index=aircraft['AircraftID'].to_numpy())
+        aircraft_seats = aircraft_seats[~aircraft_seats.index.duplicated()]
+        flight_seats = flights['AeroplaneNumber'].astype(object).map(aircraft_seats)
+        add('flights_missing_aircraft', flights[flight_seats.isna()])
+        mismatch = flight_seats.notna() & (flight_seats != flights['FlightCapacity'])
+        add('capacity_mismatch', flights[mismatch].assign(AircraftSeats=flight_seats[mismatch].astype('int32')))
+    else:
+        flight_seats = pd.Series(np.nan, index=flights.index)
+
+    if not available('bookings'):
+        return report
+    bookings = airport_data.bookings
+
+    # Bookings against flights and passengers
+    add('bookings_missing_flight', bookings[~bookings['FlightID'].isin(flights['FlightID'])])
+    if available('passengers'):
+        passengers = airport_data.passengers
+        add('bookings_missing_passenger', bookings[~bookings['PassengerID'].isin(passengers['PassengerID'])])
+
+    # Seats: capacity per booking via its flight (aircraft layout, else FlightCapacity)
+    capacity_by_flight = pd.Series(flight_seats.fillna(flights['FlightCapacity']).to_numpy(dtype='int64'),
+                                   index=flights['FlightID'].to_numpy())
+    capacity_by_flight = capacity_by_flight[~capacity_by_flight.index.duplicated()]
+    booking_capacity = bookings['FlightID'].map(capacity_by_flight)
+    out_of_range = booking_capacity.notna() & ((bookings['SeatNumber'] < 1) | (bookings['SeatNumber'] > booking_capacity))
+    add('seat_out_of_range', bookings[out_of_range].assign(Capacity=booking_capacity[out_of_range].astype('int32')))
+
+    active = bookings[bookings['Status'] != 'Cancelled']
+    # One int64 key per (flight, seat); clashing rows are listed grouped by that key
+    seat_keys = (active['FlightID'].to_numpy(dtype='int64') << 16) | active['SeatNumber'].to_numpy().astype('uint16')
+    clashes = pd.Series(seat_keys).duplicated(keep=False).to_numpy()
+    add('duplicate_seats', active[clashes].iloc[np.argsort(seat_keys[clashes])])
+
+    active_counts = active['FlightID'].value_counts()
+    counts = active_counts.reindex(capacity_by_flight.index, fill_value=0)
+    over = counts > capacity_by_flight
+    add('overbooked_flights', pd.DataFrame({
+        'FlightID': capacity_by_flight.index[over.to_numpy()],
+        'ActiveBookings': counts[over].to_numpy(),
+        'Capacity': capacity_by_flight[over].to_numpy(),
+    }))
+
+    cancelled_flights = flights.loc[flights['Status'] == 'Cancelled', 'FlightID']
+    add('active_bookings_on_cancelled_flights', active[active['FlightID'].isin(cancelled_flights)])
+    return report
+
+
+def format_report(report, examples=5):
+    """Human-readable summary of a check_integrity() report"""
+    if not report:
+        return " Integrity check passed: no problems found."
+    total = sum(len(rows) for rows in report.values())
+    lines = [f" Integrity check found {total} problem row(s) in {len(report)} check(s):"]
+    for name, rows in report.items():
+        lines.append(f"\n  {CHECKS[name]}: {len(rows)}")
+        if not examples:
+            continue
+        with pd.option_context('display.width', 120, 'display.max_columns', None):
+            sample = rows.head(examples).to_string(index=False)
+        lines.extend("    " + line for line in sample.splitlines())
+        if len(rows) > examples:
+            lines.append(f"    ... and {len(rows) - examples} more")
+    return "\n".join(lines)
@@ -1,22 +1,68 @@
+import os
+import sys
+
+# Opt-in instrumentation: `--profile` or `--profile=cprofile|tracemalloc`.
+# Must be set before the app modules are imported, as they are instrumented at import time.
+# `--sqlite=PATH` (or AIRPORT_DB) uses a SQLite database created by `python storage.py migrate`.
+# AIRPORT_HOLD_TTL sets how many seconds a seat stays held while a booking is confirmed.
+for arg in sys.argv[1:]:
+    if arg == "--profile" or arg.startswith("--profile="):
+        os.environ["AIRPORT_PROFILE"] = arg.partition("=")[2] or "timing"
+    elif arg.startswith("--sqlite="):
+        os.environ["AIRPORT_DB"] = arg.partition("=")[2]
+
+from utils import instrumentation
 from utils.clear_screen import clear_screen
+from utils.progress import print_load_progress
 from Flight_Manager import AirportData
 from flight_search import FlightSearch
 from bookings import BookingSystem
 from view_list import view_list
 from add_remove import AdminManager
+from storage import SQLiteStorage
+from flight_scheduler import FlightStatusScheduler
+from integrity import check_integrity, format_report
+from checkin import check_in_menu
 
-# Display a loading message
-print("Loading Airport System... Please wait.")
+def main():
+    instrumentation.start()
 
-# Initialize the airport data manager as a global instance
-airport_data: AirportData = AirportData(
-    flights_path="./data/Flights.csv",
-    passengers_path="./data/Passengers.csv",
-    bookings_path="./data/Bookings.csv",
-    aircraft_path="./data/Aircraft.csv"
-)
+    # Initialize the airport data manager; tables are loaded lazily on first use
+    db_path = os.environ.get("AIRPORT_DB")
+    airport_data: AirportData = AirportData(
+        flights_path="./data/Flights.csv",
+        passengers_path="./data/Passengers.csv",
+        bookings_path="./data/Bookings.csv",
+        aircraft_path="./data/Aircraft.csv",
+        storage=SQLiteStorage(db_path) if db_path else None,
+        progress=print_load_progress,
+        hold_ttl=float(os.environ.get("AIRPORT_HOLD_TTL", 0)) or None
+    )
+
+    instrumentation.register_counters("Flight search cache", airport_data.search_cache.stats)
+
+    # Record every change from here on (including the catch-up below) in the change feed
+    airport_data.change_feed
+
+    # Complete any flights that departed while the system was down, then keep statuses current
+    scheduler = FlightStatusScheduler(airport_data)
+    scheduler.catch_up()
+    scheduler.start()
+
+    # Load the waitlists so freed seats are offered to waiting passengers straight away
+    airport_data.waitlist
+
+    # Report inconsistent data in the tables loaded so far; the full check, which also loads
+    # the passengers, is available from the admin menu
+    integrity_report = check_integrity(airport_data, loaded_only=True)
+    if integrity_report:
+        print(format_report(integrity_report, examples=0))
+        input("\nPress Enter to continue...")
+
+    # Pick up rows other programs add to (or edits they make in) the CSV files while we run
+    airport_data.file_watcher.start()
+    instrumentation.register_counters("Data file watcher", airport_data.file_watcher.stats)
 
-def main():
     while True:
         clear_screen()
         print("----------------------")
@@ -27,10 +73,11 @@ def main():
         print(" 1. Search a Flight   ")
         print(" 2. Book a Flight     ")
         print(" 3. View Flight Information")
-        print(" 4. Admin Function    ")
-        print(" 5. Exit")
+        print(" 4. Check-in & Boarding")
+        print(" 5. Admin Function    ")
+        print(" 6. Exit")
         
-        user_option = input("\nEnter your choice (1-5): ").strip()
+        user_option = input("\nEnter your choice (1-6): ").strip()
 
         # --- OPTION 1: Search a Flight ---
         if user_option == "1":
@@ -49,20 +96,24 @@ def main():
         elif user_option == "3":
             view_list(airport_data)
 
-        # --- OPTION 4: Placeholder ---
+        # --- OPTION 4: Check-in and boarding ---
         elif user_option == "4":
+            check_in_menu(airport_data)
+
+        # --- OPTION 5: Admin ---
+        elif user_option == "5":
             clear_screen()
             admin = AdminManager(airport_data)
             admin.interactive_menu()
 
-        # --- OPTION 5: Exit ---
-        elif user_option == "5":
+        # --- OPTION 6: Exit ---
+        elif user_option == "6":
             clear_screen()
             print("Thank you for using the EDD Booking System. Goodbye!")
             break
 
         else:
-            print("\nInvalid option. Please select 1-5.")
+            print("\nInvalid option. Please select 1-6.")
             input("\nPress Enter to try again...")
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Passenger manifests for departures.
+Manifest rows are produced by a generator that walks a flight's booking positions and
+joins each booking to its passenger through the ID indexes, one row at a time, and
+the CSV/JSON writers consume that stream directly, so no DataFrame is ever built.
+Whole-day exports can fan out across a process pool, one flight per task. The pool uses
+spawned workers that are sent a snapshot of just the day's rows: forking the interactive
+app while its scheduler and file watcher threads run could leave a child holding a copy
+of AirportData.lock that is never released.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from bookings import BookingSystem
+from Flight_Manager import AirportData
+from utils.instrumentation import timed
+
+MANIFEST_FIELDS = ['FlightID', 'BookingID', 'Seat', 'SeatNumber', 'PassengerID',
+                   'FirstName', 'Surname', 'DOB', 'Email', 'Status']
+
+# Spawned workers take a while to start, so days with fewer flights are exported in-process
+POOL_MIN_FLIGHTS = 50
+
+# Each pool worker's AirportData, built once from the snapshot it is started with
+_worker_data = None
+
+
+def iter_manifest_rows(airport_data, flight_id):
+    """Yield one manifest row per active booking on a flight, in seat order"""
+    flight_id = int(flight_id)
+    flight = airport_data.get_flight_by_id(flight_id)
+    if flight is None:
+        return
+    aircraft = airport_data.get_aircraft_by_id(flight['AeroplaneNumber'])
+    seats_per_row = int(aircraft['SeatsInARow']) if aircraft is not None else None
+
+    booking_ids = airport_data.bookings['BookingID'].to_numpy()
+    positions = airport_data.flight_bookings_index.get(flight_id, [])
+    bookings = (airport_data.booking_index[int(booking_ids[position])] for position in positions)
+    active = sorted((b for b in bookings if b['Status'] != 'Cancelled'), key=lambda b: int(b['SeatNumber']))
+
+    for booking in active:
+        passenger = airport_data.passenger_index.get(booking['PassengerID']) or {}
+        seat_number = int(booking['SeatNumber'])
+        yield {
+            'FlightID': flight_id,
+            'BookingID': int(booking['BookingID']),
+            'Seat': BookingSystem.seat_number_to_label(seat_number, seats_per_row) if seats_per_row else '',
+            'SeatNumber': seat_number,
+            'PassengerID': int(booking['PassengerID']),
+            'FirstName': passenger.get('FirstName', ''),
+            'Surname': passenger.get('Surname', ''),
+            'DOB': passenger.get('DOB', ''),
+            'Email': passenger.get('Email', ''),
+            'Status': booking['Status'],
+        }
+
+
+def write_csv(rows, f):
+    """Stream manifest rows to an open text file as CSV; returns the row count"""
+    writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_json(rows, f):
+    """Stream manifest rows to an open text file as a JSON array; returns the row count"""
+    f.write("[")
+    count = 0
+    for row in rows:
+        f.write(",\n " if count else "\n ")
+        f.write(json.dumps({k: (str(v) if isinstance(v, pd.Timestamp) else v) for k, v in row.items()}))
+        count += 1
+    f.write("\n]\n" if count else "]\n")
+    return count
+
+
+WRITERS = {'csv': write_csv, 'json': write_json}
+
+
+def export_manifest(airport_data, flight_id, out_dir, fmt='csv'):
+    """Write one flight's manifest to out_dir/manifest_<FlightID>.<fmt>; returns (path, rows)"""
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"manifest_{int(flight_id)}.{fmt}")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        count = WRITERS[fmt](iter_manifest_rows(airport_data, flight_id), f)
+    return path, count
+
+
+def _day_snapshot(airport_data, flight_ids):
+    """The rows a day's manifests need (its flights, their bookings, passengers and aircraft)"""
+    with airport_data.lock:
+        flights = airport_data.flights[airport_data.flights['FlightID'].isin(flight_ids)]
+        bookings = airport_data.bookings[airport_data.bookings['FlightID'].isin(flight_ids)]
+        passengers = airport_data.passengers[airport_data.passengers['PassengerID'].isin(bookings['PassengerID'])]
+        aircraft = airport_data.aircraft[
+            airport_data.aircraft['AircraftID'].isin(flights['AeroplaneNumber'].astype(object))]
+        return {name: table.reset_index(drop=True) for name, table in
+                (('flights', flights), ('passengers', passengers), ('bookings', bookings), ('aircraft', aircraft))}
+
+
+def _init_worker(tables, data_dir):
+    global _worker_data
+    _worker_data = AirportData(data_dir=data_dir)
+    for name, table in tables.items():
+        setattr(_worker_data, name, table)
+
+
+def _export_in_worker(args):
+    flight_id, out_dir, fmt = args
+    return export_manifest(_worker_data, flight_id, out_dir, fmt)
+
+
+@timed("manifests.export_day_manifests")
+def export_day_manifests(airport_data, date, out_dir, fmt='csv', processes=None):
+    """
+    Write a manifest for every flight departing on `date`.
+    With processes > 1 the flights are shared out over a pool of spawned workers, each
+    started with a snapshot of the day's rows rather than the whole data set.
+    Returns a list of (path, rows) per flight.
+    """
+    date = pd.Timestamp(date).normalize()
+    flights = airport_data.flights
+    flight_ids = flights.loc[flights['Date'] == date].sort_values('DateTime', kind='stable')['FlightID'].tolist()
+
+    if processes and processes > 1 and len(flight_ids) >= POOL_MIN_FLIGHTS:
+        snapshot = _day_snapshot(airport_data, flight_ids)
+        with ProcessPoolExecutor(min(processes, len(flight_ids)), mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(snapshot, airport_data.data_dir)) as pool:
+            return list(pool.map(_export_in_worker, [(flight_id, out_dir, fmt) for flight_id in flight_ids]))
+    return [export_manifest(airport_data, flight_id, out_dir, fmt) for flight_id in flight_ids]
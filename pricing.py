@@ -0,0 +1,120 @@
+"""
+Dynamic pricing for flights.
+CostPerSeat is the base fare set when a flight is added. reprice() works out the
+current fare for every Scheduled flight in one vectorized pass over the flights
+table joined with active booking counts, scaling the base fare by load factor and
+days to departure.
+Price history keeps only the fares that changed on each run, as compact numpy
+arrays, and is appended to PriceHistory.csv when the data is saved. Each session starts
+from the last recorded fares (or the base fares), so a restart only records real changes.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+# Fare multiplier = (1 + LOAD_WEIGHT * load^2) * (1 + URGENCY_WEIGHT * exp(-days / URGENCY_DAYS))
+LOAD_WEIGHT = 1.0
+URGENCY_WEIGHT = 0.5
+URGENCY_DAYS = 7.0
+# Bounds on the multiplier applied to the base fare
+MIN_MULTIPLIER = 0.8
+MAX_MULTIPLIER = 3.0
+# Fares well out from departure on empty flights are discounted towards MIN_MULTIPLIER
+EARLY_DISCOUNT_DAYS = 60.0
+
+
+class PricingEngine:
+    """Current fares per flight, recomputed in bulk, with a compact change history"""
+
+    def __init__(self, airport_data, history_path):
+        self.data_manager = airport_data
+        self.history_path = history_path
+        # FlightID -> current fare, starting from the last fares recorded by earlier runs
+        self.current = self._last_recorded_fares()
+        # One entry per reprice run: (timestamp, FlightID array, fare array) for the fares that changed
+        self._history = []
+        self._saved_runs = 0
+
+    def _last_recorded_fares(self):
+        """FlightID -> latest fare in PriceHistory.csv (empty if there is no history yet)"""
+        if not os.path.exists(self.history_path):
+            return pd.Series(dtype='float64')
+        saved = pd.read_csv(self.history_path, usecols=['FlightID', 'Price'])
+        latest = saved.drop_duplicates('FlightID', keep='last')
+        return pd.Series(latest['Price'].to_numpy(dtype='float64'), index=latest['FlightID'].to_numpy())
+
+    @timed("PricingEngine.reprice")
+    def reprice(self, now=None):
+        """
+        Recompute the fare of every Scheduled flight that has not departed yet.
+        Other flights keep their base fare. Returns how many fares changed.
+        """
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        with self.data_manager.lock:
+            flights = self.data_manager.flights
+            flight_ids = flights['FlightID'].to_numpy()
+            base = flights['CostPerSeat'].to_numpy(dtype='float64')
+
+            booked = self.data_manager.get_active_booking_counts(flight_ids)
+            capacity = self.data_manager.get_flight_capacities(flights)
+            load = np.clip(booked / np.maximum(capacity, 1), 0.0, 1.0)
+
+            days = (flights['DateTime'] - now).dt.total_seconds().to_numpy() / 86400.0
+            multiplier = (1 + LOAD_WEIGHT * load ** 2) * (1 + URGENCY_WEIGHT * np.exp(-np.maximum(days, 0) / URGENCY_DAYS))
+            # Early and empty: discount towards the floor
+            early = np.clip(days / EARLY_DISCOUNT_DAYS, 0.0, 1.0) * (1 - load)
+            multiplier = np.clip(multiplier - early * (1 - MIN_MULTIPLIER), MIN_MULTIPLIER, MAX_MULTIPLIER)
+
+            live = ((flights['Status'] == 'Scheduled').to_numpy()) & (days > 0)
+            prices = np.round(np.where(live, base * multiplier, base), 2)
+
+            # Flights never priced were selling at their base fare, so only real changes are recorded
+            previous = self.current.reindex(flight_ids).to_numpy()
+            previous = np.where(np.isnan(previous), base, previous)
+            changed = ~np.isclose(prices, previous, equal_nan=False)
+            self.current = pd.Series(prices, index=flight_ids)
+            if changed.any():
+                self._history.append((now, flight_ids[changed].astype('int32'), prices[changed].astype('float32')))
+                self.data_manager._notify('fares_repriced', {'FlightIDs': flight_ids[changed].tolist()})
+        return int(changed.sum())
+
+    def get_price(self, flight_id):
+        """Current fare for a flight (its base fare if it has not been priced yet)"""
+        price = self.current.get(int(flight_id))
+        if price is None:
+            flight = self.data_manager.get_flight_by_id(flight_id)
+            return None if flight is None else float(flight['CostPerSeat'])
+        return float(price)
+
+    def get_prices(self, flights):
+        """Current fares for a flights DataFrame, aligned with its rows"""
+        prices = self.current.reindex(flights['FlightID'].to_numpy()).to_numpy()
+        return np.where(np.isnan(prices), flights['CostPerSeat'].to_numpy(dtype='float64'), prices)
+
+    def get_history(self, flight_id):
+        """Fare changes recorded for one flight this session and in PriceHistory.csv"""
+        frames = []
+        if os.path.exists(self.history_path):
+            saved = pd.read_csv(self.history_path, parse_dates=['PricedAt'])
+            frames.append(saved[saved['FlightID'] == int(flight_id)][['PricedAt', 'Price']])
+        rows = [(priced_at, float(prices[ids == int(flight_id)][0]))
+                for priced_at, ids, prices in self._history[self._saved_runs:] if (ids == int(flight_id)).any()]
+        frames.append(pd.DataFrame(rows, columns=['PricedAt', 'Price']))
+        return pd.concat(frames, ignore_index=True)
+
+    def save(self):
+        """Append runs recorded since the last save to the history file"""
+        runs = self._history[self._saved_runs:]
+        if not runs:
+            return
+        df = pd.DataFrame({
+            'FlightID': np.concatenate([ids for _, ids, _ in runs]),
+            'PricedAt': np.concatenate([np.full(len(ids), priced_at) for priced_at, ids, _ in runs]),
+            'Price': np.concatenate([prices for _, _, prices in runs]),
+        })
+        df.to_csv(self.history_path, mode='a', header=not os.path.exists(self.history_path), index=False)
+        self._saved_runs = len(self._history)
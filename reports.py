@@ -0,0 +1,255 @@
+"""
+Parallel analytics reports over all flights, including those archived by FlightArchive:
+per-route revenue, per-day occupancy and per-aircraft utilisation.
+
+The parent process takes a columnar snapshot of the flights (in departure order) and
+the active bookings and places it in shared memory. Work is cut into partitions, each a
+date range of flights plus an equal slice of bookings; pool workers map the snapshot
+without copying, aggregate their partition with numpy bincounts, and return small
+partial tables that the parent merges.
+
+Run from the command line with:
+    python reports.py --processes 8 --out ./reports
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from schema import concat_chunks
+from utils.instrumentation import timed
+
+# Columns the snapshot is built from
+FLIGHT_COLUMNS = ['FlightID', 'AeroplaneNumber', 'DepartureCity', 'ArrivalCity', 'DateTime', 'Date',
+                  'FlightCapacity', 'CostPerSeat', 'Status']
+BOOKING_COLUMNS = ['FlightID', 'Status']
+
+REPORTS = ('route_revenue', 'daily_occupancy', 'aircraft_utilisation')
+
+# Group key column per report (integer codes in the snapshot)
+REPORT_KEYS = {
+    'route_revenue': 'route',
+    'daily_occupancy': 'day',
+    'aircraft_utilisation': 'aircraft',
+}
+
+
+class SharedSnapshot:
+    """Numpy columns copied once into shared memory blocks that worker processes can map"""
+
+    def __init__(self, columns):
+        self._blocks = []
+        self.spec = {}
+        for name, values in columns.items():
+            values = np.ascontiguousarray(values)
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = values
+            self._blocks.append(block)
+            self.spec[name] = (block.name, values.dtype.str, values.shape)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-worker cache of attached blocks: spec id -> (blocks, arrays)
+_attached = {}
+
+
+def _attach(spec):
+    """Map a snapshot's columns in a worker (once per worker process)"""
+    key = tuple(sorted((name, entry[0]) for name, entry in spec.items()))
+    if key not in _attached:
+        blocks, arrays = [], {}
+        for name, (block_name, dtype, shape) in spec.items():
+            # Workers share the parent's resource tracker, so the parent's unlink releases the block
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        _attached[key] = (blocks, arrays)
+    return _attached[key][1]
+
+
+def _with_archived(hot, archived, columns):
+    """Hot rows (already a copy of just the needed columns) followed by the archived ones"""
+    if archived.empty:
+        return hot
+    return concat_chunks([hot, archived[columns]])
+
+
+def build_columns(airport_data):
+    """
+    Columnar snapshot of the data the reports need, plus the labels for its integer codes.
+    Everything here is a cheap vectorized pass; the per-booking work is left to the workers.
+    Archived flights and bookings are read back from their partitions so the figures do not
+    change when completed flights are archived.
+    """
+    flights = _with_archived(airport_data.flights[FLIGHT_COLUMNS], airport_data.archive.get_flights(), FLIGHT_COLUMNS)
+    flights = flights[flights['Status'] != 'Cancelled'].sort_values('DateTime', kind='stable')
+
+    # Integer codes straight from the categoricals (no string work)
+    departure = flights['DepartureCity'].cat.codes.to_numpy(dtype=np.int64)
+    arrival = flights['ArrivalCity'].cat.codes.to_numpy(dtype=np.int64)
+    n_cities = len(flights['ArrivalCity'].cat.categories)
+    route_codes, route_keys = pd.factorize(departure * n_cities + arrival)
+    routes = [(flights['DepartureCity'].cat.categories[key // n_cities],
+               flights['ArrivalCity'].cat.categories[key % n_cities]) for key in route_keys]
+    day_codes, days = pd.factorize(flights['Date'].to_numpy())
+    aircraft_codes = flights['AeroplaneNumber'].cat.codes.to_numpy()
+
+    # FlightID -> position in the snapshot (-1 for cancelled or unknown flights)
+    flight_ids = flights['FlightID'].to_numpy(dtype=np.int64)
+    bookings = _with_archived(airport_data.bookings[BOOKING_COLUMNS], airport_data.archive.get_bookings(),
+                              BOOKING_COLUMNS)
+    active = bookings.loc[bookings['Status'] != 'Cancelled', 'FlightID'].to_numpy()
+    size = int(max(flight_ids.max(initial=0), active.max(initial=0))) + 1
+    flight_position = np.full(size, -1, dtype=np.int32)
+    flight_position[flight_ids] = np.arange(len(flight_ids), dtype=np.int32)
+
+    columns = {
+        'route': route_codes.astype(np.int32),
+        'day': day_codes.astype(np.int32),
+        'aircraft': aircraft_codes.astype(np.int32),
+        'capacity': airport_data.get_flight_capacities(flights).astype(np.int32),
+        'fare': flights['CostPerSeat'].to_numpy(dtype=np.float64),
+        'flight_position': flight_position,
+        'booking_flight_id': active.astype(np.int32),
+    }
+    labels = {
+        'route': routes,
+        'day': pd.DatetimeIndex(days),
+        'aircraft': flights['AeroplaneNumber'].cat.categories,
+    }
+    return columns, labels
+
+
+def aggregate_partition(columns, flight_range, booking_range):
+    """
+    Aggregate one slice of the date-ordered flights (flight counts and seats) and one slice
+    of the active bookings (booked seats and revenue) into partial report tables.
+    """
+    flight_lo, flight_hi = flight_range
+    booking_lo, booking_hi = booking_range
+    capacity = columns['capacity'][flight_lo:flight_hi]
+
+    # Bookings on cancelled or unknown flights map to -1 and are dropped
+    positions = columns['flight_position'][columns['booking_flight_id'][booking_lo:booking_hi]]
+    positions = positions[positions >= 0]
+    fares = columns['fare'][positions]
+
+    partials = {}
+    for report, key in REPORT_KEYS.items():
+        codes = columns[key]
+        size = int(codes.max()) + 1 if len(codes) else 0
+        flight_codes = codes[flight_lo:flight_hi]
+        booking_codes = codes[positions]
+        table = pd.DataFrame({
+            'Flights': np.bincount(flight_codes, minlength=size),
+            'Seats': np.bincount(flight_codes, weights=capacity, minlength=size),
+            'Booked': np.bincount(booking_codes, minlength=size),
+            'Revenue': np.bincount(booking_codes, weights=fares, minlength=size),
+        })
+        partials[report] = table[(table['Flights'] > 0) | (table['Booked'] > 0)]
+    return partials
+
+
+def _aggregate_in_worker(args):
+    spec, flight_range, booking_range = args
+    return aggregate_partition(_attach(spec), flight_range, booking_range)
+
+
+def _partitions(n_rows, parts):
+    bounds = np.linspace(0, n_rows, parts + 1).astype(int)
+    return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def _finish(partials, labels):
+    """Merge partial tables and turn codes back into readable keys with derived ratios"""
+    reports = {}
+    for report, key in REPORT_KEYS.items():
+        merged = pd.concat([partial[report] for partial in partials]).groupby(level=0).sum()
+        merged[['Seats', 'Booked']] = merged[['Seats', 'Booked']].astype(np.int64)
+        merged['LoadFactor'] = (merged['Booked'] / merged['Seats'].where(merged['Seats'] > 0)).round(4)
+        merged['Revenue'] = merged['Revenue'].round(2)
+
+        names = [labels[key][code] for code in merged.index]
+        if key == 'route':
+            merged.insert(0, 'DepartureCity', [route[0] for route in names])
+            merged.insert(1, 'ArrivalCity', [route[1] for route in names])
+            merged = merged.sort_values('Revenue', ascending=False)
+        elif key == 'day':
+            merged.insert(0, 'Date', names)
+            merged = merged.sort_values('Date')
+        else:
+            merged.insert(0, 'AircraftID', names)
+            merged = merged.sort_values('LoadFactor', ascending=False)
+        reports[report] = merged.reset_index(drop=True)
+    return reports
+
+
+@timed("reports.run_reports")
+def run_reports(airport_data, processes=None, partitions_per_process=4):
+    """
+    Build every report. With more than one process the date-ordered flights are split into
+    partitions aggregated by a process pool over a shared-memory snapshot.
+    Returns {report name: DataFrame}.
+    """
+    processes = processes or os.cpu_count() or 1
+    columns, labels = build_columns(airport_data)
+    n_flights = len(columns['route'])
+    n_bookings = len(columns['booking_flight_id'])
+
+    if processes <= 1:
+        return _finish([aggregate_partition(columns, (0, n_flights), (0, n_bookings))], labels)
+
+    # Task i covers the i-th date range of flights and the i-th slice of bookings
+    parts = processes * partitions_per_process
+    with SharedSnapshot(columns) as snapshot:
+        tasks = [(snapshot.spec, flight_range, booking_range) for flight_range, booking_range
+                 in zip(_partitions(n_flights, parts), _partitions(n_bookings, parts))]
+        with ProcessPoolExecutor(processes) as pool:
+            partials = list(pool.map(_aggregate_in_worker, tasks))
+    return _finish(partials, labels)
+
+
+def save_reports(reports, out_dir):
+    """Write each report to out_dir/<report>.csv and return the paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for report, df in reports.items():
+        path = os.path.join(out_dir, f"{report}.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    from Flight_Manager import AirportData
+    from storage import csv_paths
+
+    parser = argparse.ArgumentParser(description="Airport analytics reports")
+    parser.add_argument("--data-dir", default="./data", help="Directory containing the CSV files")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default="./reports", help="Directory to write the report CSVs to")
+    args = parser.parse_args()
+
+    paths = csv_paths(args.data_dir)
+    airport_data = AirportData(paths['flights'], paths['passengers'], paths['bookings'], paths['aircraft'])
+    for path in save_reports(run_reports(airport_data, args.processes), args.out):
+        print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Season schedule import.
+A schedule file lists flights keyed on (AeroplaneNumber, DepartureCity, ArrivalCity, DateTime)
+with their CostPerSeat. It is validated against the aircraft index, then hash-joined with the
+existing flights on that key to work out the inserts, fare/capacity updates and cancellations
+(Scheduled flights inside the season window that the schedule no longer lists).
+The whole diff is applied as one batch transaction.
+
+Import from the command line with:
+    python schedule_import.py season.csv --dry-run
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+SCHEDULE_KEY = ['AeroplaneNumber', 'DepartureCity', 'ArrivalCity', 'DateTime']
+SCHEDULE_COLUMNS = SCHEDULE_KEY + ['CostPerSeat']
+
+# Reason given to updates whose new capacity would leave a flight overbooked
+CAPACITY_REASON = "Capacity below active bookings"
+
+
+def read_schedule(path):
+    """Read a schedule CSV with the key columns as plain strings"""
+    return pd.read_csv(path, dtype={'AeroplaneNumber': str, 'DepartureCity': str, 'ArrivalCity': str})
+
+
+def _seat_counts(airport_data):
+    """AircraftID -> seats (Rows x SeatsInARow)"""
+    aircraft = airport_data.aircraft
+    return pd.Series((aircraft['Rows'].astype('int32') * aircraft['SeatsInARow']).to_numpy(),
+                     index=aircraft['AircraftID'].astype(str).to_numpy())
+
+
+@timed("schedule_import.validate_schedule")
+def validate_schedule(airport_data, schedule, now=None):
+    """
+    Normalize a schedule and check every row in one vectorized pass.
+    Returns (valid rows with FlightCapacity filled in, rejected rows with a Reason column).
+    """
+    missing = [col for col in SCHEDULE_COLUMNS if col not in schedule.columns]
+    if missing:
+        raise ValueError(f"Schedule is missing column(s): {', '.join(missing)}")
+
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    schedule = schedule[SCHEDULE_COLUMNS].copy()
+    for col in ['AeroplaneNumber', 'DepartureCity', 'ArrivalCity']:
+        schedule[col] = schedule[col].fillna('').astype(str).str.strip()
+    schedule['DateTime'] = pd.to_datetime(schedule['DateTime'], format='ISO8601', errors='coerce')
+    schedule['CostPerSeat'] = pd.to_numeric(schedule['CostPerSeat'], errors='coerce')
+
+    known_aircraft = pd.Index(list(airport_data.aircraft_index), dtype=object).astype(str)
+    checks = [
+        (schedule['DateTime'].isna(), "Invalid DateTime"),
+        (schedule['DateTime'] < now, "DateTime is in the past"),
+        (~schedule['AeroplaneNumber'].isin(known_aircraft), "Unknown aircraft"),
+        ((schedule['DepartureCity'] == '') | (schedule['ArrivalCity'] == ''), "Missing city"),
+        (schedule['DepartureCity'] == schedule['ArrivalCity'], "Departure and arrival are the same"),
+        (~(schedule['CostPerSeat'] > 0), "CostPerSeat must be greater than 0"),
+        (schedule.duplicated(SCHEDULE_KEY), "Duplicate of an earlier row"),
+    ]
+    # The first failing check is the reason given
+    reasons = pd.Series('', index=schedule.index)
+    for mask, reason in checks:
+        reasons = reasons.mask(mask & (reasons == ''), reason)
+
+    bad = reasons != ''
+    valid = schedule[~bad].copy()
+    valid['FlightCapacity'] = valid['AeroplaneNumber'].map(_seat_counts(airport_data)).astype('int64')
+    return valid, schedule[bad].assign(Reason=reasons[bad])
+
+
+@timed("schedule_import.diff_schedule")
+def diff_schedule(airport_data, schedule, cancel_missing=True, now=None):
+    """
+    Keyed diff of a schedule against the existing flights.
+    Returns {'insert': new flights, 'update': FlightID with new CostPerSeat/FlightCapacity,
+             'cancel': Scheduled flights in the season window missing from the schedule,
+             'unchanged': count, 'rejected': invalid rows and capacity cuts below the
+             active bookings, with a Reason}.
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    valid, rejected = validate_schedule(airport_data, schedule, now)
+
+    flights = airport_data.flights
+    existing = pd.DataFrame({
+        'FlightID': flights['FlightID'].to_numpy(),
+        **{col: flights[col].astype(str).to_numpy() for col in SCHEDULE_KEY[:3]},
+        'DateTime': flights['DateTime'].to_numpy(),
+        'Status': flights['Status'].to_numpy(),
+        'OldCost': flights['CostPerSeat'].to_numpy(),
+        'OldCapacity': flights['FlightCapacity'].to_numpy(),
+    }).drop_duplicates(SCHEDULE_KEY)
+
+    merged = valid.merge(existing, on=SCHEDULE_KEY, how='outer', indicator=True)
+    in_schedule = merged['_merge'] != 'right_only'
+    matched = merged[merged['_merge'] == 'both']
+
+    # Only Scheduled flights are changed; completed and cancelled ones are left as they are
+    changed = (matched['Status'] == 'Scheduled') & (
+        (matched['CostPerSeat'].round(2) != matched['OldCost'].round(2))
+        | (matched['FlightCapacity'] != matched['OldCapacity'])
+    )
+    # A capacity below the seats already taken (e.g. a smaller aircraft) is rejected rather than overbooking
+    counters = airport_data.flight_counters
+    taken = matched['FlightID'].map(lambda flight_id: sum(
+        counters.get(flight_id, {}).get(status, 0) for status in ('Booked', 'Checked-in', 'Boarded')))
+    overbooked = changed & (matched['FlightCapacity'] < taken)
+    if overbooked.any():
+        rejected = pd.concat([rejected, matched.loc[overbooked, SCHEDULE_COLUMNS].assign(Reason=CAPACITY_REASON)],
+                             ignore_index=True)
+    update = matched.loc[changed & ~overbooked,
+                         ['FlightID', 'CostPerSeat', 'FlightCapacity', 'OldCost', 'OldCapacity']]
+
+    cancel = merged.iloc[:0]
+    if cancel_missing and not valid.empty:
+        window = merged['DateTime'].between(max(valid['DateTime'].min(), now), valid['DateTime'].max())
+        cancel = merged[~in_schedule & window & (merged['Status'] == 'Scheduled')]
+
+    return {
+        'insert': merged.loc[merged['_merge'] == 'left_only', SCHEDULE_COLUMNS + ['FlightCapacity']],
+        'update': update.reset_index(drop=True),
+        'cancel': cancel[['FlightID'] + SCHEDULE_KEY].reset_index(drop=True),
+        'unchanged': int(len(matched) - changed.sum()),
+        'rejected': rejected,
+    }
+
+
+@timed("schedule_import.apply_schedule")
+def apply_schedule(airport_data, diff):
+    """
+    Apply a schedule diff as one transaction (not saved; the caller saves).
+    Returns the transaction summary, including the bookings cancelled with their flights.
+    """
+    with airport_data.lock:
+        batch = airport_data.transaction()
+        inserts = diff['insert']
+        first_id = batch.next_id('flights')
+        inserts = inserts.assign(
+            FlightID=np.arange(first_id, first_id + len(inserts)),
+            Status='Scheduled',
+        )[['FlightID', 'AeroplaneNumber', 'DepartureCity', 'ArrivalCity', 'DateTime',
+           'FlightCapacity', 'CostPerSeat', 'Status']]
+        for row in inserts.to_dict('records'):
+            batch.add('flights', row)
+
+        update = diff['update']
+        for column, old in (('CostPerSeat', 'OldCost'), ('FlightCapacity', 'OldCapacity')):
+            rows = update[update[column] != update[old]]
+            for flight_id, value in zip(rows['FlightID'].tolist(), rows[column].tolist()):
+                batch.update('flights', int(flight_id), column, value)
+
+        for flight_id in diff['cancel']['FlightID'].tolist():
+            batch.cancel('flights', int(flight_id))
+
+        summary = batch.commit(save=False)
+
+    # Base fares changed, so current fares are worked out again
+    if airport_data.is_loaded('pricing'):
+        airport_data.pricing.reprice()
+    return summary
+
+
+def format_diff(diff, examples=5):
+    """Readable summary of a schedule diff, with a few example rejections"""
+    lines = [
+        f"  New flights:        {len(diff['insert'])}",
+        f"  Updated flights:    {len(diff['update'])}",
+        f"  Cancelled flights:  {len(diff['cancel'])}",
+        f"  Unchanged flights:  {diff['unchanged']}",
+        f"  Rejected rows:      {len(diff['rejected'])}",
+        f"  Capacity too small: {int((diff['rejected']['Reason'] == CAPACITY_REASON).sum())}",
+    ]
+    rejected = diff['rejected']
+    if not rejected.empty:
+        for reason, count in rejected['Reason'].value_counts().items():
+            lines.append(f"    {reason}: {count}")
+        for row in rejected.head(examples).to_dict('records'):
+            lines.append(f"    e.g. {row['AeroplaneNumber']} {row['DepartureCity']} → {row['ArrivalCity']} "
+                         f"{row['DateTime']}: {row['Reason']}")
+    return "\n".join(lines)
+
+
+def main():
+    from Flight_Manager import AirportData
+    from storage import csv_paths
+
+    parser = argparse.ArgumentParser(description="Import a season schedule into Flights.csv")
+    parser.add_argument("schedule", help="Schedule CSV (AeroplaneNumber, DepartureCity, ArrivalCity, DateTime, CostPerSeat)")
+    parser.add_argument("--data-dir", default="./data", help="Directory containing the CSV files")
+    parser.add_argument("--keep-missing", action="store_true", help="Do not cancel flights missing from the schedule")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the diff")
+    args = parser.parse_args()
+
+    paths = csv_paths(args.data_dir)
+    airport_data = AirportData(paths['flights'], paths['passengers'], paths['bookings'], paths['aircraft'])
+    diff = diff_schedule(airport_data, read_schedule(args.schedule), cancel_missing=not args.keep_missing)
+    print(format_diff(diff))
+    if not args.dry_run:
+        from bookings import BookingSystem
+        summary = apply_schedule(airport_data, diff)
+        rebooked, stranded = BookingSystem(airport_data).reaccommodate_all(summary['cancelled_bookings'])
+        airport_data.save_data()
+        print(f"Schedule imported. {rebooked} passenger(s) rebooked, {stranded} could not be rebooked.")
+
+
+if __name__ == "__main__":
+    main()
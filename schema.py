@@ -0,0 +1,96 @@
+"""
+Canonical in-memory schema for the airport tables.
+Applied once when a table is loaded (from any storage backend) and to rows as they
+are appended, so every module sees the same compact types:
+categoricals for low-cardinality strings, datetime64 for flight times with a
+precomputed Date, and narrow integers for IDs, seats and capacities.
+"""
+
+import pandas as pd
+
+FLIGHT_STATUSES = ['Scheduled', 'Completed', 'Cancelled']
+BOOKING_STATUSES = ['Booked', 'Checked-in', 'Boarded', 'Cancelled']
+
+# Table name -> (ID column, {column: dtype})
+# 'category' columns grow their categories as new values arrive;
+# statuses use a fixed set of categories.
+TABLES = {
+    'flights': ('FlightID', {
+        'FlightID': 'int32',
+        'AeroplaneNumber': 'category',
+        'DepartureCity': 'category',
+        'ArrivalCity': 'category',
+        'DateTime': 'datetime64[ns]',
+        'FlightCapacity': 'int16',
+        'SeatNumber': 'float32',
+        'CostPerSeat': 'float64',
+        'Status': pd.CategoricalDtype(FLIGHT_STATUSES),
+    }),
+    'passengers': ('PassengerID', {
+        'PassengerID': 'int32',
+        'FirstName': 'category',
+        'Surname': 'category',
+        'Address_Line_3': 'category',
+    }),
+    'bookings': ('BookingID', {
+        'BookingID': 'int32',
+        'FlightID': 'int32',
+        'PassengerID': 'int32',
+        'SeatNumber': 'int16',
+        'Status': pd.CategoricalDtype(BOOKING_STATUSES),
+    }),
+    'aircraft': ('AircraftID', {
+        'AircraftID': 'str',
+        'Rows': 'int16',
+        'SeatsInARow': 'int8',
+    }),
+}
+
+
+def apply_schema(name, df):
+    """Convert a freshly read (or newly built) table to the canonical dtypes"""
+    dtypes = TABLES[name][1]
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(dtype)
+        elif dtype == 'datetime64[ns]':
+            df[col] = pd.to_datetime(df[col], format='ISO8601', errors='coerce').astype(dtype)
+        elif dtype == 'category':
+            df[col] = df[col].astype('category')
+        else:
+            df[col] = df[col].astype(dtype)
+
+    if name == 'flights' and 'DateTime' in df.columns:
+        # Date is always derived from DateTime, never parsed separately
+        df['Date'] = df['DateTime'].dt.normalize()
+    return df
+
+
+def append_rows(name, table, rows):
+    """
+    Concatenate new rows onto a table while keeping its schema.
+    Open-ended categoricals are widened first so pandas does not fall back to object columns.
+    """
+    rows = apply_schema(name, rows)
+    for col in rows.columns:
+        if col in table.columns and isinstance(table[col].dtype, pd.CategoricalDtype):
+            table_cats = table[col].cat.categories
+            new_cats = rows[col].cat.categories.difference(table_cats)
+            if len(new_cats):
+                table[col] = table[col].cat.add_categories(new_cats)
+            rows[col] = rows[col].cat.set_categories(table[col].cat.categories)
+    return pd.concat([table, rows], ignore_index=True)
+
+
+def concat_chunks(chunks):
+    """Join typed chunks of one table, unifying the categories each chunk discovered"""
+    if len(chunks) == 1:
+        return chunks[0]
+    for col, dtype in chunks[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not dtype.ordered:
+            categories = pd.Index([]).append([chunk[col].cat.categories for chunk in chunks]).unique()
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
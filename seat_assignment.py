@@ -0,0 +1,184 @@
+"""
+Automatic seat assignment for bulk and API bookings.
+Keeps a per-row bitmask of free seats so window/aisle preferences,
+adjacent group seating and front-to-back filling never rescan the whole flight.
+"""
+
+SEAT_PREFERENCES = ('window', 'aisle', 'middle')
+
+
+def seat_blocks(seats_per_row):
+    """Split a row into seat blocks separated by aisles (e.g. 6 -> [3, 3], 9 -> [3, 3, 3])"""
+    if seats_per_row <= 2:
+        return [seats_per_row]
+    if seats_per_row <= 6:
+        return [seats_per_row // 2, seats_per_row - seats_per_row // 2]
+    side = 2 if seats_per_row < 9 else 3
+    return [side, seats_per_row - 2 * side, side]
+
+
+def seat_type_masks(seats_per_row):
+    """Build bitmasks of window, aisle and middle seat positions for a row layout"""
+    window = 1 | (1 << (seats_per_row - 1))
+    aisle = 0
+    start = 0
+    blocks = seat_blocks(seats_per_row)
+    for i, size in enumerate(blocks):
+        end = start + size - 1
+        if i > 0:
+            aisle |= 1 << start
+        if i < len(blocks) - 1:
+            aisle |= 1 << end
+        start += size
+    aisle &= ~window
+    full_row = (1 << seats_per_row) - 1
+    return {
+        'window': window,
+        'aisle': aisle,
+        'middle': full_row & ~(window | aisle),
+    }
+
+
+class FreeSeatMap:
+    """Per-row free-seat bitmasks for one flight (bit i set = seat position i is free)"""
+
+    def __init__(self, rows, seats_per_row, booked_seats):
+        self.rows = rows
+        self.seats_per_row = seats_per_row
+        self.full_row = (1 << seats_per_row) - 1
+        self.type_masks = seat_type_masks(seats_per_row)
+
+        self.free = [self.full_row] * rows
+        for seat_number in booked_seats:
+            row, pos = divmod(int(seat_number) - 1, seats_per_row)
+            if 0 <= row < rows:
+                self.free[row] &= ~(1 << pos)
+
+    def seat_number(self, row, pos):
+        return row * self.seats_per_row + pos + 1
+
+    def free_count(self):
+        return sum(bin(mask).count('1') for mask in self.free)
+
+    def is_free(self, seat_number):
+        row, pos = divmod(seat_number - 1, self.seats_per_row)
+        return 0 <= row < self.rows and bool(self.free[row] >> pos & 1)
+
+    def take(self, seat_number):
+        """Mark a seat as allocated; refuses to hand out the same seat twice"""
+        if not self.is_free(seat_number):
+            raise ValueError(f"Seat {seat_number} is already allocated")
+        row, pos = divmod(seat_number - 1, self.seats_per_row)
+        self.free[row] &= ~(1 << pos)
+
+    def find_seat(self, preference=None):
+        """Find the front-most free seat, honouring a window/aisle/middle preference when possible"""
+        wanted = self.type_masks.get(preference, self.full_row)
+        for mask in (wanted, self.full_row):
+            for row, free in enumerate(self.free):
+                candidates = free & mask
+                if candidates:
+                    pos = (candidates & -candidates).bit_length() - 1
+                    return self.seat_number(row, pos)
+        return None
+
+    def _find_run(self, row, size):
+        """Return the first position in a row with `size` adjacent free seats, or None"""
+        run = (1 << size) - 1
+        free = self.free[row]
+        for pos in range(self.seats_per_row - size + 1):
+            if (free >> pos) & run == run:
+                return pos
+        return None
+
+    def find_block(self, size):
+        """
+        Find seats for a group sitting together, filling front to back.
+        Groups larger than a row take consecutive full rows plus one partial row.
+        Falls back to the largest adjacent runs available if no clean block exists.
+        """
+        if size <= 0 or size > self.free_count():
+            return None
+
+        if size <= self.seats_per_row:
+            for row in range(self.rows):
+                pos = self._find_run(row, size)
+                if pos is not None:
+                    return [self.seat_number(row, pos + i) for i in range(size)]
+        else:
+            full_rows, remainder = divmod(size, self.seats_per_row)
+            for start in range(self.rows - full_rows + 1):
+                if any(self.free[r] != self.full_row for r in range(start, start + full_rows)):
+                    continue
+                seats = [self.seat_number(r, p)
+                         for r in range(start, start + full_rows)
+                         for p in range(self.seats_per_row)]
+                if remainder:
+                    tail = start + full_rows
+                    pos = self._find_run(tail, remainder) if tail < self.rows else None
+                    if pos is None:
+                        continue
+                    seats += [self.seat_number(tail, pos + i) for i in range(remainder)]
+                return seats
+
+        return self._split_block(size)
+
+    def _split_block(self, size):
+        """Place a group in the longest adjacent runs, front to back"""
+        runs = []
+        for row, free in enumerate(self.free):
+            pos = 0
+            while pos < self.seats_per_row:
+                if free >> pos & 1:
+                    start = pos
+                    while pos < self.seats_per_row and free >> pos & 1:
+                        pos += 1
+                    runs.append((-(pos - start), row, start))
+                else:
+                    pos += 1
+        runs.sort()
+
+        seats = []
+        for neg_length, row, start in runs:
+            take = min(-neg_length, size - len(seats))
+            seats += [self.seat_number(row, start + i) for i in range(take)]
+            if len(seats) == size:
+                break
+        return sorted(seats)
+
+
+class SeatAssigner:
+    """Assigns seats on a flight using its aircraft layout and current bookings"""
+
+    def __init__(self, rows, seats_per_row, booked_seats):
+        self.seat_map = FreeSeatMap(rows, seats_per_row, booked_seats)
+
+    def assign(self, count=1, preference=None, keep_together=True):
+        """
+        Pick seats for `count` passengers and mark them as allocated.
+        A single passenger gets their preference where possible; groups are seated together.
+        Returns a list of seat numbers, or None if the flight cannot fit the group.
+        """
+        if preference is not None and preference not in SEAT_PREFERENCES:
+            raise ValueError(f"Unknown seat preference '{preference}'")
+
+        if count == 1:
+            seat = self.seat_map.find_seat(preference)
+            seats = [] if seat is None else [seat]
+        elif keep_together:
+            seats = self.seat_map.find_block(count) or []
+        else:
+            if count > self.seat_map.free_count():
+                return None
+            seats = []
+            for _ in range(count):
+                seat = self.seat_map.find_seat(preference)
+                self.seat_map.take(seat)
+                seats.append(seat)
+            return seats
+
+        if len(seats) != count:
+            return None
+        for seat in seats:
+            self.seat_map.take(seat)
+        return seats
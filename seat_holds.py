@@ -0,0 +1,93 @@
+"""
+Short-lived seat holds for interactive booking.
+A hold reserves a seat for one passenger until its TTL runs out, so the seat cannot be
+taken by someone else between choosing it and confirming the booking.
+Expiry times sit in a min-heap: expiring any number of holds costs O(log n) each and
+checks never scan holds that are still live.
+"""
+
+import heapq
+import time
+
+
+class SeatHolds:
+    """Seat holds per flight with TTL expiry"""
+
+    # Seconds a hold lasts unless a TTL is given
+    DEFAULT_TTL = 300
+
+    def __init__(self, airport_data, ttl=None, clock=time.monotonic):
+        self.data_manager = airport_data
+        self.ttl = self.DEFAULT_TTL if ttl is None else ttl
+        self.clock = clock
+        # flight_id -> {seat_number: (holder, expiry)}
+        self._holds = {}
+        # Heap of (expiry, flight_id, seat_number); entries replaced or released early are skipped when popped
+        self._expiry = []
+
+    def expire(self, now=None):
+        """Drop every hold whose TTL has run out; returns how many were dropped"""
+        now = self.clock() if now is None else now
+        dropped = 0
+        with self.data_manager.lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                expiry, flight_id, seat_number = heapq.heappop(self._expiry)
+                flight_holds = self._holds.get(flight_id)
+                if flight_holds is None or flight_holds.get(seat_number, (None, None))[1] != expiry:
+                    continue
+                del flight_holds[seat_number]
+                if not flight_holds:
+                    del self._holds[flight_id]
+                dropped += 1
+        return dropped
+
+    def hold(self, flight_id, seat_number, holder, ttl=None):
+        """
+        Hold a seat for `holder`. Re-holding your own seat extends it.
+        Returns the expiry time, or None if someone else already holds the seat.
+        """
+        flight_id, seat_number = int(flight_id), int(seat_number)
+        with self.data_manager.lock:
+            self.expire()
+            flight_holds = self._holds.setdefault(flight_id, {})
+            current = flight_holds.get(seat_number)
+            if current is not None and current[0] != holder:
+                return None
+            expiry = self.clock() + (self.ttl if ttl is None else ttl)
+            flight_holds[seat_number] = (holder, expiry)
+            heapq.heappush(self._expiry, (expiry, flight_id, seat_number))
+        return expiry
+
+    def release(self, flight_id, seat_number, holder=None):
+        """Give up a hold early (only the holder's own hold when `holder` is given)"""
+        flight_id, seat_number = int(flight_id), int(seat_number)
+        with self.data_manager.lock:
+            flight_holds = self._holds.get(flight_id, {})
+            current = flight_holds.get(seat_number)
+            if current is None or (holder is not None and current[0] != holder):
+                return False
+            del flight_holds[seat_number]
+            if not flight_holds:
+                self._holds.pop(flight_id, None)
+        return True
+
+    def held_seats(self, flight_id, exclude_holder=None):
+        """Seats currently held on a flight, leaving out those held by `exclude_holder`"""
+        with self.data_manager.lock:
+            self.expire()
+            return {
+                seat_number for seat_number, (holder, _) in self._holds.get(int(flight_id), {}).items()
+                if exclude_holder is None or holder != exclude_holder
+            }
+
+    def holder_of(self, flight_id, seat_number):
+        """Who holds a seat right now, or None"""
+        with self.data_manager.lock:
+            self.expire()
+            current = self._holds.get(int(flight_id), {}).get(int(seat_number))
+        return None if current is None else current[0]
+
+    def count(self):
+        """Number of live holds across all flights"""
+        self.expire()
+        return sum(len(flight_holds) for flight_holds in self._holds.values())
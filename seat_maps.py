@@ -0,0 +1,116 @@
+"""
+Seat map rendering from an occupancy array.
+A flight's seats are a (rows x seats_per_row) numpy array of FREE/BOOKED/HELD codes,
+filled in one vectorized assignment and rendered a whole row at a time.
+Bulk export renders every flight departing on a date from a single pass over the
+bookings table, as text and JSON.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+FREE, BOOKED, HELD = 0, 1, 2
+# Occupancy code -> map symbol
+SYMBOLS = np.array(["◯", "●", "◐"])
+LEGEND = "◯ = Available  ◐ = Held  ● = Booked"
+
+
+def occupancy_grid(rows, seats_per_row, booked_seats, held_seats=()):
+    """Build the occupancy array for a flight from booked (and held) seat numbers"""
+    grid = np.full(rows * seats_per_row, FREE, dtype=np.int8)
+    for code, seats in ((HELD, held_seats), (BOOKED, booked_seats)):
+        seats = np.fromiter(seats, dtype=np.int64) if not isinstance(seats, np.ndarray) else seats.astype(np.int64)
+        # Seat numbers outside the aircraft (bad data) are ignored
+        seats = seats[(seats >= 1) & (seats <= grid.size)]
+        grid[seats - 1] = code
+    return grid.reshape(rows, seats_per_row)
+
+
+def render_rows(grid):
+    """Header plus one text line per seat row, matching the interactive seat map layout"""
+    seats_per_row = grid.shape[1]
+    header = "Row  " + "  ".join(chr(ord('A') + i) for i in range(seats_per_row))
+    symbols = SYMBOLS[grid]
+    lines = [header, "-" * len(header)]
+    lines.extend(f"{row:3}  " + "  ".join(seat_symbols) + "  " for row, seat_symbols in enumerate(symbols, start=1))
+    return lines
+
+
+def render_seat_map(flight, grid):
+    """Full seat map for one flight as a single string"""
+    lines = [
+        "=" * 50,
+        f"SEAT MAP - Flight {flight['FlightID']}",
+        f"{flight['DepartureCity']} → {flight['ArrivalCity']}",
+        "=" * 50,
+        "",
+    ]
+    lines.extend(render_rows(grid))
+    lines.extend(["", LEGEND, "=" * 50])
+    return "\n".join(lines)
+
+
+@timed("seat_maps.export_seat_maps")
+def export_seat_maps(airport_data, date, out_dir, formats=('txt', 'json')):
+    """
+    Write the seat maps of every flight departing on `date` to out_dir as
+    seat_maps_YYYY-MM-DD.txt and/or .json. Bookings are filtered once for all of the
+    day's flights and split per flight with a single groupby.
+    Returns the list of files written.
+    """
+    date = pd.Timestamp(date).normalize()
+    flights = airport_data.flights
+    day_flights = flights[flights['Date'] == date].sort_values('DateTime', kind='stable')
+
+    bookings = airport_data.bookings
+    day_bookings = bookings[bookings['FlightID'].isin(day_flights['FlightID']) & (bookings['Status'] != 'Cancelled')]
+    seats_by_flight = {
+        int(flight_id): day_bookings['SeatNumber'].to_numpy()[rows]
+        for flight_id, rows in day_bookings.groupby('FlightID', observed=True).indices.items()
+    }
+
+    aircraft = airport_data.aircraft.set_index('AircraftID')
+    aircraft = aircraft[~aircraft.index.duplicated()]
+    empty = np.empty(0, dtype=np.int64)
+
+    text_maps = []
+    json_maps = []
+    for flight in day_flights.to_dict("records"):
+        layout = aircraft.loc[flight['AeroplaneNumber']] if flight['AeroplaneNumber'] in aircraft.index else None
+        if layout is None:
+            continue
+        rows, seats_per_row = int(layout['Rows']), int(layout['SeatsInARow'])
+        grid = occupancy_grid(rows, seats_per_row, seats_by_flight.get(int(flight['FlightID']), empty))
+
+        if 'txt' in formats:
+            text_maps.append(render_seat_map(flight, grid))
+        if 'json' in formats:
+            json_maps.append({
+                'FlightID': int(flight['FlightID']),
+                'DepartureCity': str(flight['DepartureCity']),
+                'ArrivalCity': str(flight['ArrivalCity']),
+                'DateTime': str(flight['DateTime']),
+                'AeroplaneNumber': str(flight['AeroplaneNumber']),
+                'Rows': rows,
+                'SeatsInARow': seats_per_row,
+                'BookedSeats': (np.flatnonzero(grid.ravel() == BOOKED) + 1).tolist(),
+                'Map': ["".join(seat_symbols) for seat_symbols in SYMBOLS[grid]],
+            })
+
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.join(out_dir, f"seat_maps_{date.strftime('%Y-%m-%d')}")
+    written = []
+    if 'txt' in formats:
+        with open(stem + ".txt", "w", encoding="utf-8") as f:
+            f.write("\n\n".join(text_maps) + "\n")
+        written.append(stem + ".txt")
+    if 'json' in formats:
+        with open(stem + ".json", "w", encoding="utf-8") as f:
+            json.dump({'Date': date.strftime('%Y-%m-%d'), 'Flights': json_maps}, f, ensure_ascii=False, indent=1)
+        written.append(stem + ".json")
+    return written
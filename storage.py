@@ -0,0 +1,274 @@
+"""
+Storage backends for AirportData.
+CSVStorage (the default) reads and rewrites the four CSV files.
+SQLiteStorage keeps the same tables in an embedded SQLite database with indexes
+on the lookup columns and commits single-row writes as they happen.
+
+Migrate existing CSV data with:
+    python storage.py migrate --data-dir ./data --db ./data/airport.db
+"""
+
+import argparse
+import contextlib
+import os
+import sqlite3
+
+import pandas as pd
+
+from schema import TABLES, apply_schema
+
+# Secondary indexes created in SQLite: (table, index name, columns)
+SQLITE_INDEXES = [
+    ('bookings', 'idx_bookings_flight', ('FlightID',)),
+    ('bookings', 'idx_bookings_passenger', ('PassengerID',)),
+    ('flights', 'idx_flights_route', ('DepartureCity', 'ArrivalCity', 'DateTime')),
+    ('flights', 'idx_flights_datetime', ('DateTime',)),
+]
+
+
+def csv_paths(data_dir):
+    """Standard CSV file locations for a data directory"""
+    return {
+        'flights': os.path.join(data_dir, "Flights.csv"),
+        'passengers': os.path.join(data_dir, "Passengers.csv"),
+        'bookings': os.path.join(data_dir, "Bookings.csv"),
+        'aircraft': os.path.join(data_dir, "Aircraft.csv"),
+    }
+
+
+class CSVStorage:
+    """Default backend: whole-table CSV reads, with changes written out by save_data"""
+
+    # Lookups need the whole table in memory
+    indexed_lookups = False
+    # Row changes only reach the files when save_data writes the tables
+    writes_rows = False
+
+    def __init__(self, paths):
+        self.paths = paths
+
+    def load_table(self, name):
+        return apply_schema(name, pd.read_csv(self.paths[name]))
+
+    def iter_chunks(self, name, chunk_rows):
+        """Yield (typed chunk, fraction of the file read) while streaming a CSV"""
+        path = self.paths[name]
+        size = os.path.getsize(path) or 1
+        with open(path, 'rb') as f:
+            # The parser reads ahead, so each chunk is held back one step and only the last reports 100%
+            pending = None
+            for chunk in pd.read_csv(f, chunksize=chunk_rows):
+                if pending is not None:
+                    yield pending, min(f.tell() / size, 0.99)
+                pending = apply_schema(name, chunk)
+        if pending is None:
+            pending = apply_schema(name, pd.read_csv(path))
+        yield pending, 1.0
+
+    def save_table(self, name, df):
+        df.to_csv(self.paths[name], index=False)
+
+    def transaction(self):
+        # Nothing is written before save_table, so there is nothing to group
+        return contextlib.nullcontext()
+
+    # Row-level writes are held in memory until the next save_table
+    def insert_row(self, name, row):
+        pass
+
+    def insert_rows(self, name, rows):
+        pass
+
+    def update_rows(self, name, row_ids, values):
+        pass
+
+    def update_values(self, name, column, values):
+        pass
+
+    def delete_rows(self, name, row_ids):
+        pass
+
+
+def _to_sql_value(value):
+    """Convert pandas/numpy scalars to plain Python values sqlite3 accepts"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if hasattr(value, 'item'):
+        value = value.item()
+    return value
+
+
+class SQLiteStorage:
+    """Embedded SQLite backend with indexed point lookups and transactional single-row writes"""
+
+    # Primary key and FlightID lookups can be answered before a table is loaded
+    indexed_lookups = True
+    # Each row change is committed as it is made (or with its transaction() block)
+    writes_rows = True
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # The connection may be used from background tasks as well as the main loop
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # Depth of open transaction() blocks; writes inside one are committed together
+        self._batch_depth = 0
+
+    def _writing(self):
+        """Context for a write: its own commit, or none while a transaction() is open"""
+        return contextlib.nullcontext() if self._batch_depth else self.conn
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Group the row-level writes made inside the block into one commit, or one rollback"""
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._batch_depth == 1:
+                self.conn.rollback()
+            raise
+        else:
+            if self._batch_depth == 1:
+                self.conn.commit()
+        finally:
+            self._batch_depth -= 1
+
+    def _columns(self, name):
+        return [row['name'] for row in self.conn.execute(f'PRAGMA table_info("{name}")')]
+
+    def load_table(self, name):
+        df = pd.read_sql_query(f'SELECT * FROM "{name}" ORDER BY rowid', self.conn)
+        return apply_schema(name, df)
+
+    def iter_chunks(self, name, chunk_rows):
+        """Yield (typed chunk, fraction of rows read) while streaming a table"""
+        total = self.conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0] or 1
+        rows_read = 0
+        empty = True
+        for chunk in pd.read_sql_query(f'SELECT * FROM "{name}" ORDER BY rowid', self.conn, chunksize=chunk_rows):
+            empty = False
+            rows_read += len(chunk)
+            yield apply_schema(name, chunk), rows_read / total
+        if empty:
+            yield self.load_table(name), 1.0
+
+    def save_table(self, name, df):
+        # Row-level writes are committed as they happen, so there is nothing left to write
+        pass
+
+    def replace_table(self, name, df):
+        """Recreate a table from a DataFrame (used by the CSV migration)"""
+        id_col = TABLES[name][0]
+        column_defs = []
+        for col, dtype in df.dtypes.items():
+            if pd.api.types.is_integer_dtype(dtype):
+                sql_type = "INTEGER"
+            elif pd.api.types.is_float_dtype(dtype):
+                sql_type = "REAL"
+            else:
+                sql_type = "TEXT"
+            column_defs.append(f'"{col}" {sql_type}' + (" PRIMARY KEY" if col == id_col else ""))
+
+        with self.conn:
+            self.conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+            self.conn.execute(f'CREATE TABLE "{name}" ({", ".join(column_defs)})')
+            placeholders = ", ".join("?" for _ in df.columns)
+            self.conn.executemany(
+                f'INSERT INTO "{name}" VALUES ({placeholders})',
+                ([_to_sql_value(v) for v in row] for row in df.itertuples(index=False, name=None))
+            )
+            for table, index_name, columns in SQLITE_INDEXES:
+                if table == name:
+                    cols = ", ".join(f'"{c}"' for c in columns)
+                    self.conn.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON "{name}" ({cols})')
+
+    def fetch_row(self, name, row_id):
+        """Look up one row by primary key without loading the table"""
+        id_col = TABLES[name][0]
+        row = self.conn.execute(f'SELECT * FROM "{name}" WHERE "{id_col}" = ?', (_to_sql_value(row_id),)).fetchone()
+        if row is None:
+            return None
+        return apply_schema(name, pd.DataFrame([dict(row)])).to_dict("records")[0]
+
+    def fetch_bookings_for_flight(self, flight_id):
+        """Indexed query for one flight's bookings without loading the bookings table"""
+        return apply_schema('bookings', pd.read_sql_query(
+            'SELECT * FROM bookings WHERE FlightID = ? ORDER BY rowid', self.conn, params=(int(flight_id),)
+        ))
+
+    def insert_row(self, name, row):
+        self.insert_rows(name, [row])
+
+    def insert_rows(self, name, rows):
+        """Insert rows (dicts with the same keys) in a single transaction"""
+        existing = self._columns(name)
+        columns = list(rows[0])
+        with self._writing():
+            # Add any columns the rows bring that the table does not have yet
+            for col in columns:
+                if col not in existing:
+                    self.conn.execute(f'ALTER TABLE "{name}" ADD COLUMN "{col}"')
+            cols = ", ".join(f'"{c}"' for c in columns)
+            placeholders = ", ".join("?" for _ in columns)
+            self.conn.executemany(
+                f'INSERT INTO "{name}" ({cols}) VALUES ({placeholders})',
+                ([_to_sql_value(row.get(c)) for c in columns] for row in rows)
+            )
+
+    def update_rows(self, name, row_ids, values):
+        id_col = TABLES[name][0]
+        assignments = ", ".join(f'"{col}" = ?' for col in values)
+        params = [_to_sql_value(v) for v in values.values()]
+        with self._writing():
+            self.conn.executemany(
+                f'UPDATE "{name}" SET {assignments} WHERE "{id_col}" = ?',
+                (params + [_to_sql_value(row_id)] for row_id in row_ids)
+            )
+
+    def update_values(self, name, column, values):
+        """Set one column to a different value per row ({row ID: value})"""
+        id_col = TABLES[name][0]
+        with self._writing():
+            self.conn.executemany(
+                f'UPDATE "{name}" SET "{column}" = ? WHERE "{id_col}" = ?',
+                ((_to_sql_value(value), _to_sql_value(row_id)) for row_id, value in values.items())
+            )
+
+    def delete_rows(self, name, row_ids):
+        id_col = TABLES[name][0]
+        with self._writing():
+            self.conn.executemany(
+                f'DELETE FROM "{name}" WHERE "{id_col}" = ?',
+                ((_to_sql_value(row_id),) for row_id in row_ids)
+            )
+
+
+def migrate_csv_to_sqlite(data_dir, db_path):
+    """One-shot copy of the four CSV tables into a SQLite database"""
+    source = CSVStorage(csv_paths(data_dir))
+    target = SQLiteStorage(db_path)
+    for name in TABLES:
+        df = source.load_table(name)
+        target.replace_table(name, df)
+        print(f"Migrated {len(df)} rows into {name}")
+    target.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Airport data storage tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Copy the CSV data into a SQLite database")
+    migrate.add_argument("--data-dir", default="./data", help="Directory containing the CSV files")
+    migrate.add_argument("--db", default="./data/airport.db", help="SQLite database to create")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        migrate_csv_to_sqlite(args.data_dir, args.db)
+        print(f"SQLite database written to {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Batched admin transactions.
+Changes are queued on a Transaction and nothing touches the tables until commit(), which
+validates the whole batch first and then applies it as one bulk insert, one update per
+changed column, one status update and one delete per table, inside a single storage transaction, followed by one save.
+Mutation events are only sent to listeners once the whole batch has been applied.
+rollback() just drops the queue.
+
+    with airport_data.transaction() as batch:
+        batch.add('flights', {...})
+        batch.cancel('flights', 1042)
+        batch.delete('passengers', 77)
+"""
+
+from Flight_Manager import ID_INDEXES
+from schema import TABLES
+from utils.instrumentation import timed
+
+# Tables whose rows can be cancelled (given a Cancelled status) rather than deleted
+CANCELLABLE = ('flights', 'bookings')
+
+
+class Transaction:
+    """A queue of adds, updates, cancellations and deletions applied to AirportData all at once"""
+
+    def __init__(self, airport_data):
+        self.airport_data = airport_data
+        self.adds = {name: [] for name in TABLES}
+        # name -> {column: {row ID: new value}}
+        self.updates = {name: {} for name in TABLES}
+        self.cancels = {name: [] for name in CANCELLABLE}
+        self.deletes = {name: [] for name in TABLES}
+        self.open = True
+
+    def __len__(self):
+        return (sum(map(len, self.adds.values()))
+                + sum(len(values) for columns in self.updates.values() for values in columns.values())
+                + sum(map(len, self.cancels.values())) + sum(map(len, self.deletes.values())))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.open:
+            return
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def _check_open(self):
+        if not self.open:
+            raise ValueError("Transaction has already been committed or rolled back")
+
+    # ==================== QUEUEING ====================
+
+    def next_id(self, name):
+        """Next free numeric ID for a table, counting rows queued in this transaction"""
+        id_col = TABLES[name][0]
+        queued = [int(row[id_col]) for row in self.adds[name]]
+        return max(queued + [self.airport_data.next_id(name) - 1]) + 1
+
+    def add(self, name, row: dict):
+        self._check_open()
+        self.adds[name].append(dict(row))
+
+    def update(self, name, row_id, column, value):
+        """Queue a new value for one column of an existing row"""
+        self._check_open()
+        self.updates[name].setdefault(column, {})[row_id] = value
+
+    def cancel(self, name, row_id):
+        """Queue a cancellation; cancelling a flight also cancels its active bookings"""
+        self._check_open()
+        if name not in CANCELLABLE:
+            raise ValueError(f"{name} cannot be cancelled")
+        self.cancels[name].append(row_id)
+
+    def delete(self, name, row_id):
+        """Queue a deletion; deleting a flight or passenger also deletes its bookings"""
+        self._check_open()
+        self.deletes[name].append(row_id)
+
+    def rollback(self):
+        """Discard every queued change"""
+        for queue in (*self.adds.values(), *self.updates.values(), *self.cancels.values(), *self.deletes.values()):
+            queue.clear()
+        self.open = False
+
+    # ==================== VALIDATION ====================
+
+    def validate(self):
+        """Check the whole batch against the current data; returns a list of problems (empty if it can commit)"""
+        data = self.airport_data
+        problems = []
+
+        # IDs added by this batch, per table
+        pending = {}
+        for name, rows in self.adds.items():
+            id_col = TABLES[name][0]
+            index = getattr(data, ID_INDEXES[name]) if rows else {}
+            seen = set()
+            for row in rows:
+                row_id = row.get(id_col)
+                if row_id is None:
+                    problems.append(f"New {name} row has no {id_col}")
+                elif row_id in index or row_id in seen:
+                    problems.append(f"{id_col} {row_id} already exists")
+                seen.add(row_id)
+            pending[name] = seen
+
+        def exists(name, row_id):
+            return row_id in pending[name] or row_id in getattr(data, ID_INDEXES[name])
+
+        for row in self.adds['flights']:
+            if not exists('aircraft', row.get('AeroplaneNumber')):
+                problems.append(f"Flight {row.get('FlightID')}: unknown aircraft {row.get('AeroplaneNumber')}")
+        for row in self.adds['bookings']:
+            flight = data.get_flight_by_id(row.get('FlightID'))
+            if flight is None and row.get('FlightID') not in pending['flights']:
+                problems.append(f"Booking {row.get('BookingID')}: unknown flight {row.get('FlightID')}")
+            elif flight is not None and flight['Status'] == 'Cancelled':
+                problems.append(f"Booking {row.get('BookingID')}: flight {row.get('FlightID')} has been cancelled")
+            if not exists('passengers', row.get('PassengerID')):
+                problems.append(f"Booking {row.get('BookingID')}: unknown passenger {row.get('PassengerID')}")
+
+        for name, columns in self.updates.items():
+            id_col = TABLES[name][0]
+            for column, values in columns.items():
+                if column == id_col or column not in getattr(data, name).columns:
+                    problems.append(f"{name} has no updatable column {column}")
+                problems.extend(f"{id_col} {row_id} not found" for row_id in values if not exists(name, row_id))
+
+        for name, queue in (*self.cancels.items(), *self.deletes.items()):
+            id_col = TABLES[name][0]
+            for row_id in queue:
+                if not exists(name, row_id):
+                    problems.append(f"{id_col} {row_id} not found")
+        # Bookings on completed flights are locked, so nothing may cancel or delete them
+        for booking_id in (*self.cancels['bookings'], *self.deletes['bookings']):
+            booking = data.get_booking_by_id(booking_id)
+            if booking is not None and data.is_flight_locked(booking['FlightID']):
+                problems.append(f"Booking {booking_id} is locked: flight {booking['FlightID']} has completed")
+        if self.deletes['passengers'] or self.deletes['flights']:
+            bookings = data.bookings
+            for passenger_id in self.deletes['passengers']:
+                locked = data.locked_flights(bookings.loc[bookings['PassengerID'] == passenger_id, 'FlightID'])
+                if locked:
+                    problems.append(f"Passenger {passenger_id} has locked bookings: "
+                                    f"flight(s) {', '.join(map(str, locked))} have completed")
+            booked_flights = bookings.loc[bookings['FlightID'].isin(self.deletes['flights']), 'FlightID']
+            for flight_id in data.locked_flights(booked_flights):
+                problems.append(f"Flight {flight_id} has completed: its bookings are locked")
+
+        # Aircraft can only go if every flight using it goes too
+        if self.deletes['aircraft']:
+            flights = data.flights
+            in_use = flights.loc[~flights['FlightID'].isin(self.deletes['flights']), 'AeroplaneNumber']
+            used = set(in_use.astype(object)) | {row.get('AeroplaneNumber') for row in self.adds['flights']}
+            for aircraft_id in self.deletes['aircraft']:
+                if aircraft_id in used:
+                    problems.append(f"Aircraft {aircraft_id} is still used by flights")
+        return problems
+
+    # ==================== COMMIT ====================
+
+    def _touched_tables(self):
+        touched = {name for name, rows in self.adds.items() if rows}
+        touched |= {name for name, columns in self.updates.items() if columns}
+        touched |= {name for name, ids in self.cancels.items() if ids}
+        touched |= {name for name, ids in self.deletes.items() if ids}
+        # Cancelling or deleting flights, or deleting passengers, cascades to bookings
+        if self.cancels['flights'] or self.deletes['flights'] or self.deletes['passengers']:
+            touched.add('bookings')
+        return touched
+
+    @timed("Transaction.commit")
+    def commit(self, save=True):
+        """
+        Validate and apply every queued change, then save once.
+        Raises ValueError (with nothing changed) if the batch does not validate.
+        Returns a summary: counts per table plus the bookings cancelled with their flights.
+        """
+        self._check_open()
+        data = self.airport_data
+        with data.lock:
+            problems = self.validate()
+            if problems:
+                raise ValueError("; ".join(problems))
+
+            # Tables as they were, to restore if applying fails part way
+            snapshot = {name: getattr(data, name).copy() for name in self._touched_tables()}
+            try:
+                # Listeners hear about the changes only once they have all been applied and stored
+                with data.holding_events(), data.storage.transaction():
+                    summary = self._apply()
+            except Exception:
+                for name, table in snapshot.items():
+                    setattr(data, name, table)
+                data.rebuild_indexes()
+                raise
+            self.open = False
+        if save:
+            data.save_data()
+        return summary
+
+    def _apply(self):
+        data = self.airport_data
+        summary = {'added': {}, 'updated': {}, 'cancelled': {}, 'deleted': {}, 'cancelled_bookings': None}
+
+        # One bulk insert per table (aircraft and flights before the bookings that refer to them)
+        for name in ('aircraft', 'passengers', 'flights', 'bookings'):
+            rows = self.adds[name]
+            if rows:
+                if name == 'bookings':
+                    data.add_bookings(rows)
+                else:
+                    data.add_rows(name, rows)
+                summary['added'][name] = len(rows)
+
+        # One vectorized update per changed column
+        for name, columns in self.updates.items():
+            for column, values in columns.items():
+                data.update_column(name, column, values)
+            if columns:
+                summary['updated'][name] = len({row_id for values in columns.values() for row_id in values})
+
+        deleted_flights = set(self.deletes['flights'])
+        deleted_passengers = set(self.deletes['passengers'])
+        deleted_bookings = set(self.deletes['bookings'])
+
+        # Flight cancellations cascade to their active bookings
+        if self.cancels['flights'] or self.cancels['bookings']:
+            flights = data.flights
+            cancel_flights = flights['FlightID'].isin(set(self.cancels['flights']) - deleted_flights) \
+                & (flights['Status'] != 'Cancelled')
+            flight_ids = flights.loc[cancel_flights, 'FlightID'].tolist()
+            data.set_flights_status(flight_ids, 'Cancelled')
+            summary['cancelled']['flights'] = len(flight_ids)
+
+            bookings = data.bookings
+            active = bookings['Status'] != 'Cancelled'
+            cascade = active & bookings['FlightID'].isin(flight_ids)
+            cancel_bookings = (cascade | (active & bookings['BookingID'].isin(self.cancels['bookings']))) \
+                & ~bookings['BookingID'].isin(deleted_bookings) & ~bookings['PassengerID'].isin(deleted_passengers)
+            # Only passengers still here after the batch are offered another flight
+            summary['cancelled_bookings'] = bookings[cascade & cancel_bookings].copy()
+            booking_ids = bookings.loc[cancel_bookings, 'BookingID'].tolist()
+            data.set_bookings_status(booking_ids, 'Cancelled')
+            summary['cancelled']['bookings'] = len(booking_ids)
+
+        # One delete per table, bookings first so nothing is left pointing at a removed row
+        data.drop_waitlists(deleted_flights, deleted_passengers)
+        bookings = data.bookings
+        summary['deleted']['bookings'] = data.remove_bookings(
+            bookings['BookingID'].isin(deleted_bookings) | bookings['FlightID'].isin(deleted_flights)
+            | bookings['PassengerID'].isin(deleted_passengers)
+        ) if deleted_bookings or deleted_flights or deleted_passengers else 0
+        summary['deleted']['flights'] = data.remove_flights(data.flights['FlightID'].isin(deleted_flights)) \
+            if deleted_flights else 0
+        for name in ('passengers', 'aircraft'):
+            id_col = TABLES[name][0]
+            summary['deleted'][name] = data.remove_rows(name, getattr(data, name)[id_col].isin(self.deletes[name])) \
+                if self.deletes[name] else 0
+        return summary
@@ -0,0 +1,114 @@
+# ------------------------------------------
+# Opt-in timing / profiling instrumentation
+# ------------------------------------------
+#
+# Enable with the AIRPORT_PROFILE environment variable or `python main.py --profile[=mode]`:
+#   timing       call counts and timings for instrumented functions
+#   cprofile     timings plus a cProfile capture (also written to airport_profile.prof)
+#   tracemalloc  timings plus peak memory and the top allocation sites
+#
+# The mode is read once at import time. When disabled, @timed returns the
+# original function untouched, so instrumented code runs at full speed.
+
+import atexit
+import functools
+import os
+import time
+
+ENV_VAR = "AIRPORT_PROFILE"
+MODES = ("timing", "cprofile", "tracemalloc")
+
+_mode = os.environ.get(ENV_VAR, "").strip().lower()
+if _mode in ("1", "true", "yes", "on"):
+    _mode = "timing"
+ENABLED = _mode in MODES
+
+# name -> [calls, total seconds, max seconds]
+_stats = {}
+_profiler = None
+_started = False
+# title -> callable returning a dict of counters, printed with the report
+_counters = {}
+
+
+def record(name, elapsed):
+    entry = _stats.get(name)
+    if entry is None:
+        _stats[name] = [1, elapsed, elapsed]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+
+def register_counters(title, source):
+    """Include the dict returned by source() (e.g. cache hit/miss stats) in the report"""
+    _counters[title] = source
+
+
+def timed(name):
+    """Decorator recording call count and duration under `name` when instrumentation is enabled"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def start():
+    """Start the capture for the configured mode and print a summary report on exit"""
+    global _profiler, _started
+    if not ENABLED or _started:
+        return
+    _started = True
+
+    if _mode == "cprofile":
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    elif _mode == "tracemalloc":
+        import tracemalloc
+        tracemalloc.start(10)
+
+    atexit.register(report)
+
+
+def report():
+    """Print timings and any cProfile/tracemalloc capture"""
+    print("\n" + "=" * 86)
+    print(f"INSTRUMENTATION REPORT (mode: {_mode})")
+    print("=" * 86)
+    print(f"{'Operation':<44}{'Calls':>8}{'Total (s)':>12}{'Mean (ms)':>11}{'Max (ms)':>11}")
+    print("-" * 86)
+    for name, (calls, total, longest) in sorted(_stats.items(), key=lambda item: -item[1][1]):
+        print(f"{name:<44}{calls:>8}{total:>12.4f}{total / calls * 1000:>11.3f}{longest * 1000:>11.3f}")
+
+    for title, source in _counters.items():
+        counters = source()
+        print(f"\n{title}: " + ", ".join(
+            f"{key} {value:.1%}" if isinstance(value, float) else f"{key} {value}" for key, value in counters.items()))
+
+    if _profiler is not None:
+        import pstats
+        _profiler.disable()
+        _profiler.dump_stats("airport_profile.prof")
+        print("\nTop functions by cumulative time (full profile in airport_profile.prof):")
+        pstats.Stats(_profiler).sort_stats("cumulative").print_stats(25)
+
+    if _mode == "tracemalloc":
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"\nMemory: current {current / 1024 ** 2:.1f} MB, peak {peak / 1024 ** 2:.1f} MB")
+        print("Top allocation sites:")
+        for stat in tracemalloc.take_snapshot().statistics("lineno")[:10]:
+            print(f"  {stat}")
+        tracemalloc.stop()
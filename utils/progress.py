@@ -0,0 +1,8 @@
+# ------------------------------------------
+# Console progress for streaming table loads
+# ------------------------------------------
+
+def print_load_progress(table, rows_loaded, fraction):
+    """Show a single updating line per table; pass as AirportData(progress=...)"""
+    end = "\n" if fraction >= 1 else ""
+    print(f"\rLoading {table}... {fraction:4.0%} ({rows_loaded:,} rows)", end=end, flush=True)
@@ -1,22 +1,23 @@
+import os
+from datetime import datetime
+
+from manifests import export_day_manifests, export_manifest
+from seat_maps import export_seat_maps
 from utils.sort_data import merge_sort
 
 def view_flights_by_price(airport_data):
-    flights = airport_data.flights.to_dict("records")  # Get flights as a list of dictionaries
-
-    # Convert CostPerSeat to float for sorting
-    for f in flights:
-        try:
-            f["CostPerSeat"] = float(f["CostPerSeat"])
-        except ValueError:
-            f["CostPerSeat"] = 0.0  # Handle missing or invalid data
+    flights = airport_data.flights.copy()
+    # Current fares from the pricing engine (the base fare for flights it has not priced)
+    flights["CurrentPrice"] = airport_data.pricing.get_prices(flights)
+    flights = flights.to_dict("records")  # Get flights as a list of dictionaries
 
     print("\nFlights Sorted by Cost (High → Low):")
-    sorted_flights = merge_sort(flights, "CostPerSeat", reverse=True)
+    sorted_flights = merge_sort(flights, "CurrentPrice", reverse=True)
 
     for f in sorted_flights:
         print(
             f"{f['FlightID']} | {f['DepartureCity']} → {f['ArrivalCity']} "
-            f"| €{f['CostPerSeat']} | {f['DateTime']} | {f['Status']}"
+            f"| €{f['CurrentPrice']:.2f} | {f['DateTime']} | {f['Status']}"
         )
 
 
@@ -49,12 +50,105 @@ def view_passengers(airport_data):
         print(f"{p['PassengerID']} | {p['FirstName']} {p['Surname']} | DOB: {p['DOB']} | Email: {p['Email']}")
 
 
+def view_passenger_history(airport_data):
+    try:
+        passenger_id = int(input("Enter Passenger ID: ").strip())
+    except ValueError:
+        print("Invalid Passenger ID.")
+        return
+
+    # Includes bookings on flights that have been moved to the archive
+    history = airport_data.archive.get_passenger_history(passenger_id).to_dict("records")
+
+    if not history:
+        print("No bookings found for this passenger.")
+        return
+
+    print(f"\nBooking History for Passenger {passenger_id}:")
+    for h in history:
+        print(
+            f"{h['BookingID']} | Flight: {h['FlightID']} | {h['DepartureCity']} → {h['ArrivalCity']} "
+            f"| {h['DateTime']} | Seat: {h['SeatNumber']} | Status: {h['Status']}"
+        )
+
+
+def view_fare_calendar(airport_data):
+    departure = input("Enter departure city: ").strip()
+    arrival = input("Enter arrival city: ").strip()
+    month_str = input("Enter month (YYYY-MM): ").strip()
+    try:
+        year, month = map(int, month_str.split("-"))
+        if not 1 <= month <= 12:
+            raise ValueError
+    except ValueError:
+        print("Invalid month. Please use YYYY-MM.")
+        return
+
+    fare_calendar = airport_data.fare_calendar
+    print()
+    print(fare_calendar.render_month(departure, arrival, year, month))
+
+    cheapest = fare_calendar.cheapest_day(departure, arrival, year, month)
+    if cheapest is None:
+        print("\nNo flights with free seats on this route in that month.")
+    else:
+        date, summary = cheapest
+        print(
+            f"\nCheapest day: {date.date()} | €{summary['Fare']:.2f} | Flight: {summary['FlightID']} "
+            f"| Seats Remaining: {summary['SeatsRemaining']}"
+        )
+
+
+def export_seat_maps_for_date(airport_data):
+    date_str = input("Enter date (YYYY-MM-DD): ").strip()
+    try:
+        date = datetime.strptime(date_str, "%Y-%m-%d")
+    except ValueError:
+        print("Invalid date. Please use YYYY-MM-DD.")
+        return
+
+    out_dir = input("Output folder (Enter for ./exports): ").strip() or "./exports"
+    for path in export_seat_maps(airport_data, date, out_dir):
+        print(f"Seat maps written to {path}")
+
+
+def export_manifests(airport_data):
+    target = input("Enter Flight ID, or a date (YYYY-MM-DD) for every flight that day: ").strip()
+    fmt = input("Format (csv/json, Enter for csv): ").strip().lower() or "csv"
+    if fmt not in ("csv", "json"):
+        print("Invalid format. Please choose csv or json.")
+        return
+    out_dir = input("Output folder (Enter for ./exports): ").strip() or "./exports"
+
+    if target.isdigit():
+        if airport_data.get_flight_by_id(int(target)) is None:
+            print("Flight not found.")
+            return
+        results = [export_manifest(airport_data, int(target), out_dir, fmt)]
+    else:
+        try:
+            date = datetime.strptime(target, "%Y-%m-%d")
+        except ValueError:
+            print("Invalid input. Enter a Flight ID or a date as YYYY-MM-DD.")
+            return
+        results = export_day_manifests(airport_data, date, out_dir, fmt, processes=os.cpu_count())
+
+    if not results:
+        print("No flights found.")
+    for path, rows in results:
+        print(f"{rows} passenger(s) written to {path}")
+
+
 def view_list(airport_data):
     while True:
         print("\n--- EDD Airlines Viewing System ---")
         print("1 - View Flights (by Price)")
         print("2 - View Reservations (by Date)")
         print("3 - View Passengers")
+        print("4 - View Passenger History")
+        print("5 - Fare Calendar")
+        print("6 - Export Seat Maps for a Date")
+        print("7 - Export Passenger Manifests")
         print("0 - Exit")
 
         choice = input("Enter choice: ")
@@ -65,6 +159,14 @@ def view_list(airport_data):
             view_reservations_by_date(airport_data)
         elif choice == "3":
             view_passengers(airport_data)
+        elif choice == "4":
+            view_passenger_history(airport_data)
+        elif choice == "5":
+            view_fare_calendar(airport_data)
+        elif choice == "6":
+            export_seat_maps_for_date(airport_data)
+        elif choice == "7":
+            export_manifests(airport_data)
         elif choice == "0":
             print("Exiting Viewer...")
             break
@@ -0,0 +1,161 @@
+"""
+Per-flight waitlists for fully booked flights.
+Each flight has a min-heap keyed on (priority tier, request time), so joining the
+queue and promoting its head when a seat is freed are both O(log n).
+Waitlists are saved to Waitlist.csv next to the other data files.
+"""
+
+import heapq
+import itertools
+import os
+
+import pandas as pd
+
+# Higher tiers are served first; within a tier, the earliest request wins
+PRIORITY_TIERS = {'standard': 0, 'priority': 1}
+
+WAITLIST_COLUMNS = ['FlightID', 'PassengerID', 'Priority', 'RequestTime']
+
+
+class Waitlist:
+    """Priority-queue waitlists per flight, promoted automatically when bookings are cancelled"""
+
+    def __init__(self, airport_data, path):
+        self.data_manager = airport_data
+        self.path = path
+        # flight_id -> heap of (-priority, request time, sequence, passenger_id)
+        self._queues = {}
+        # (flight_id, passenger_id) pairs currently waiting, to refuse duplicates
+        self._waiting = set()
+        self._sequence = itertools.count()
+        self._load()
+
+        # Freed seats go straight to the head of the flight's queue
+        self.data_manager.add_listener(self._on_change)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        df = pd.read_csv(self.path, parse_dates=['RequestTime'])
+        for row in df.itertuples(index=False):
+            self._push(int(row.FlightID), int(row.PassengerID), int(row.Priority), row.RequestTime)
+
+    def save(self):
+        """Write every queue to the waitlist file in service order"""
+        rows = []
+        for flight_id, queue in self._queues.items():
+            for neg_priority, request_time, _, passenger_id in sorted(queue):
+                rows.append({'FlightID': flight_id, 'PassengerID': passenger_id,
+                             'Priority': -neg_priority, 'RequestTime': request_time})
+        pd.DataFrame(rows, columns=WAITLIST_COLUMNS).to_csv(self.path, index=False)
+
+    def _push(self, flight_id, passenger_id, priority, request_time):
+        entry = (-priority, pd.Timestamp(request_time), next(self._sequence), passenger_id)
+        heapq.heappush(self._queues.setdefault(flight_id, []), entry)
+        self._waiting.add((flight_id, passenger_id))
+
+    # ==================== QUEUE OPERATIONS ====================
+
+    def join(self, flight_id, passenger_id, priority='standard'):
+        """Add a passenger to a flight's waitlist; returns (success, message)"""
+        flight_id, passenger_id = int(flight_id), int(passenger_id)
+        if priority not in PRIORITY_TIERS:
+            return False, f"Unknown priority tier '{priority}'."
+        with self.data_manager.lock:
+            if (flight_id, passenger_id) in self._waiting:
+                return False, f"Passenger {passenger_id} is already on the waitlist for flight {flight_id}."
+            self._push(flight_id, passenger_id, PRIORITY_TIERS[priority], pd.Timestamp.now())
+            position = self.position(flight_id, passenger_id)
+        return True, f"Passenger {passenger_id} added to the waitlist for flight {flight_id} (position {position})."
+
+    def leave(self, flight_id, passenger_id):
+        """Take a passenger off a flight's waitlist"""
+        flight_id, passenger_id = int(flight_id), int(passenger_id)
+        with self.data_manager.lock:
+            if (flight_id, passenger_id) not in self._waiting:
+                return False
+            queue = [entry for entry in self._queues[flight_id] if entry[3] != passenger_id]
+            heapq.heapify(queue)
+            self._queues[flight_id] = queue
+            self._waiting.discard((flight_id, passenger_id))
+        return True
+
+    def drop_flight(self, flight_id):
+        """Discard a flight's waitlist (the flight is no longer bookable)"""
+        for entry in self._queues.pop(int(flight_id), []):
+            self._waiting.discard((int(flight_id), entry[3]))
+
+    def drop_passenger(self, passenger_id):
+        """Take a passenger off every waitlist (the passenger is being deleted)"""
+        passenger_id = int(passenger_id)
+        for flight_id in [flight for flight, waiting in self._waiting if waiting == passenger_id]:
+            self.leave(flight_id, passenger_id)
+            if not self._queues[flight_id]:
+                del self._queues[flight_id]
+
+    def position(self, flight_id, passenger_id):
+        """1-based place in the queue, or None when the passenger is not waiting"""
+        queue = sorted(self._queues.get(int(flight_id), []))
+        for place, entry in enumerate(queue, start=1):
+            if entry[3] == int(passenger_id):
+                return place
+        return None
+
+    def get_waitlist(self, flight_id):
+        """Passenger IDs waiting for a flight, in service order"""
+        return [entry[3] for entry in sorted(self._queues.get(int(flight_id), []))]
+
+    def pop_next(self, flight_id):
+        """Remove and return the passenger at the head of a flight's queue, or None"""
+        queue = self._queues.get(int(flight_id))
+        if not queue:
+            return None
+        passenger_id = heapq.heappop(queue)[3]
+        self._waiting.discard((int(flight_id), passenger_id))
+        if not queue:
+            del self._queues[int(flight_id)]
+        return passenger_id
+
+    # ==================== PROMOTION ====================
+
+    def promote(self, flight_id, seat_number=None):
+        """
+        Book a freed seat for the head of a flight's waitlist.
+        Passengers that no longer exist are skipped. Returns the new booking, or None.
+        """
+        from bookings import BookingSystem
+
+        booking_system = BookingSystem(self.data_manager)
+        valid, _ = booking_system.validate_flight(flight_id)
+        if not valid:
+            return None
+
+        queue = self._queues.get(int(flight_id), [])
+        while queue:
+            passenger_id = queue[0][3]
+            if self.data_manager.get_passenger_by_id(passenger_id) is None:
+                self.pop_next(flight_id)
+                continue
+            success, result = booking_system.book_seat_number(flight_id, passenger_id, seat_number)
+            if not success:
+                # No seat after all: the passenger stays at the head of the queue
+                return None
+            self.pop_next(flight_id)
+            return result
+        return None
+
+    def _on_change(self, event, payload):
+        if event == 'booking_status':
+            if payload['Status'] == 'Cancelled' and payload['OldStatus'] != 'Cancelled':
+                self._seat_freed(payload)
+        elif event == 'booking_deleted':
+            if payload['Status'] != 'Cancelled':
+                self._seat_freed(payload)
+        elif event in ('flight_deleted', 'flight_archived'):
+            self.drop_flight(payload['FlightID'])
+        elif event == 'flight_status' and payload['Status'] != 'Scheduled':
+            self.drop_flight(payload['FlightID'])
+
+    def _seat_freed(self, booking):
+        if int(booking['FlightID']) in self._queues:
+            self.promote(booking['FlightID'], int(booking['SeatNumber']))